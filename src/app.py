@@ -42,12 +42,14 @@ from . import themed_dialogs as dlg
 from .filigree_overlay import GoldFiligreeOverlay
 from .i18n import tr
 from .journal import JournalWidget
+from .mistral_pool import api_stats
 from .notifications import NotificationSounds, flash_taskbar
 from .quest_log import QuestLogWidget
 from .session_recap_overlay import SessionRecapOverlay
 from .session_tab import SessionTab
 from .settings import FirstRunWizard, SettingsDialog
 from .shortcuts_overlay import ShortcutsOverlay
+from .transcript_cache import transcript_cache_stats
 from .tts_engine import create_tts_thread
 from .tts_overlay import TTSOverlay
 from .updater import start_update_check, start_update_download
@@ -57,6 +59,7 @@ from .utils import (
     campaign_dir,
     campaign_drive_config,
     format_file_size,
+    journal_dir,
     journal_path,
     list_campaigns,
     load_config,
@@ -579,18 +582,22 @@ class DndLoggerApp(QMainWindow):
         """Route a file save to the sync engine with the right remote name."""
         if not self._sync_engine:
             return
-        basename = os.path.basename(file_path)
-        from .drive_sync import SYNCABLE_FILES
+        from .drive_sync import remote_name_for
 
-        if basename in SYNCABLE_FILES:
-            self._sync_engine.trigger_upload(basename)
+        remote_name = remote_name_for(self._config, file_path)
+        if remote_name:
+            self._sync_engine.trigger_upload(remote_name)
 
     def _on_remote_file_updated(self, remote_name: str):
         """Reload the appropriate editor when a remote file is downloaded."""
+        from .drive_sync import JOURNAL_PREFIX, LEGACY_JOURNAL
+
         if remote_name == "quest_log.html":
             self.quest_log.reload_from_disk()
-        elif remote_name == "journal.html":
+        elif remote_name == LEGACY_JOURNAL:  # seeds a journal without sessions
             self.journal.reload_from_disk()
+        elif remote_name.startswith(JOURNAL_PREFIX):  # journal index or one of its sessions
+            self.journal.reload_from_disk(remote_name[len(JOURNAL_PREFIX) :])
         elif remote_name == "shared_config.json":
             # Reload config and push to child widgets
             self._config = load_config()
@@ -629,6 +636,28 @@ class DndLoggerApp(QMainWindow):
         self._sync_status_label.setText(text)
         self._sync_status_label.setStyleSheet(f"color: {color}; padding: 0 8px;")
 
+    def _update_cache_status(self):
+        """Refresh the transcript cache counters in the status bar, with API call stats as tooltip."""
+        hits, misses = transcript_cache_stats()
+        if hits or misses:
+            self._cache_status_label.setText(tr("app.cache.status", hits=hits, misses=misses))
+        lines = []
+        for kind, c in sorted(api_stats().items()):
+            avg = c["latency_s"] / c["requests"] if c["requests"] else 0.0
+            lines.append(
+                tr(
+                    "app.api_stats.line",
+                    kind=kind,
+                    requests=c["requests"],
+                    retries=c["retries"],
+                    failures=c["failures"],
+                    avg=f"{avg:.1f}",
+                    max=f"{c['max_latency_s']:.1f}",
+                    wait=f"{c['wait_s']:.1f}",
+                )
+            )
+        self._cache_status_label.setToolTip("\n".join(lines))
+
     def _load_icon(self):
         """Set the D20 window/taskbar icon with multiple sizes for crisp display."""
         icon = QIcon()
@@ -950,7 +979,7 @@ class DndLoggerApp(QMainWindow):
         j_path = journal_path(self._config)
         ql_path = quest_log_path(self._config)
 
-        if os.path.exists(j_path):
+        if os.path.exists(j_path) or os.path.isdir(journal_dir(self._config)):
             return  # Already migrated
 
         if not os.path.exists(ql_path):
@@ -1064,6 +1093,15 @@ class DndLoggerApp(QMainWindow):
         self._sync_status_label = QLabel("")
         self.statusBar().addPermanentWidget(self._sync_status_label)
 
+        # Transcript cache hit/miss counters, shown once a transcription has run;
+        # the tooltip breaks down Mistral API calls per kind
+        self._cache_status_label = QLabel("")
+        self._cache_status_label.setStyleSheet("color: #8899aa; padding: 0 8px;")
+        self.statusBar().addPermanentWidget(self._cache_status_label)
+        self.session_tab.transcription_completed.connect(self._update_cache_status)
+        self.session_tab.operation_failed.connect(self._update_cache_status)
+        self.session_tab.summarization_completed.connect(self._update_cache_status)
+
     def _build_menu(self):
         menu_bar = self.menuBar()
         menu_bar.clear()
@@ -1299,7 +1337,7 @@ class DndLoggerApp(QMainWindow):
             _default_quest_log_html(name),
         )
         self.journal.switch_file(
-            journal_path(self._config),
+            journal_dir(self._config),
             _default_journal_html(name),
         )
 
@@ -1354,17 +1392,6 @@ class DndLoggerApp(QMainWindow):
         if not cname:
             return
 
-        journal_html = ""
-        quest_html = ""
-        jp = journal_path(self._config)
-        qp = quest_log_path(self._config)
-        if os.path.exists(jp):
-            with open(jp, "r", encoding="utf-8") as f:
-                journal_html = f.read()
-        if os.path.exists(qp):
-            with open(qp, "r", encoding="utf-8") as f:
-                quest_html = f.read()
-
         # Reuse existing dialog or create a new one
         if hasattr(self, "_assistant_dialog") and self._assistant_dialog is not None:
             self._assistant_dialog.setWindowState(
@@ -1374,7 +1401,7 @@ class DndLoggerApp(QMainWindow):
             self._assistant_dialog.activateWindow()
             return
 
-        self._assistant_dialog = CampaignAssistantDialog(journal_html, quest_html, self._config, self)
+        self._assistant_dialog = CampaignAssistantDialog(self._config, self)
         self._assistant_dialog.setWindowModality(Qt.WindowModality.NonModal)
         self._assistant_dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         self._assistant_dialog.destroyed.connect(lambda: setattr(self, "_assistant_dialog", None))
@@ -1,9 +1,11 @@
 """Audio recorder using sounddevice with streaming architecture."""
 
 import ctypes
+import logging
 import os
 import queue
 import threading
+import time
 from datetime import datetime
 
 import numpy as np
@@ -14,12 +16,77 @@ from PySide6.QtCore import QObject, QTimer, Signal
 from .i18n import tr
 from .utils import ensure_dir, sessions_dir
 
+log = logging.getLogger(__name__)
+
+
+class _CaptureRing:
+    """Preallocated single-producer / single-consumer ring of int16 frames.
+
+    The PortAudio callback is the only writer and the writer thread the
+    only reader.  Each side owns one monotonically increasing index, so no
+    lock is needed: the callback copies a block in and then publishes the
+    new write index; the reader copies out and then publishes the new read
+    index.  A block that does not fit is dropped and counted as an overflow
+    rather than blocking the audio thread.
+    """
+
+    def __init__(self, capacity: int, channels: int):
+        self._buf = np.zeros((capacity, channels), dtype=np.int16)
+        self._capacity = capacity
+        self._write_idx = 0
+        self._read_idx = 0
+        self.overflows = 0
+        self.dropped_frames = 0
+
+    def push(self, block) -> bool:
+        """Copy *block* into the ring. Returns False if it was dropped."""
+        frames = len(block)
+        if frames > self._capacity - (self._write_idx - self._read_idx):
+            self.overflows += 1
+            self.dropped_frames += frames
+            return False
+        start = self._write_idx % self._capacity
+        first = min(frames, self._capacity - start)
+        self._buf[start : start + first] = block[:first]
+        if first < frames:
+            self._buf[: frames - first] = block[first:]
+        self._write_idx += frames
+        return True
+
+    def drain(self):
+        """Return a copy of all unread frames, or None if the ring is empty."""
+        write_idx = self._write_idx
+        frames = write_idx - self._read_idx
+        if frames <= 0:
+            return None
+        start = self._read_idx % self._capacity
+        end = start + frames
+        if end <= self._capacity:
+            data = self._buf[start:end].copy()
+        else:
+            data = np.concatenate((self._buf[start:], self._buf[: end - self._capacity]))
+        self._read_idx = write_idx
+        return data
+
 
 class AudioRecorder(QObject):
-    """Streams mic audio to a WAV file via a writer thread."""
+    """Streams mic audio to a FLAC (or WAV) file via a writer thread.
+
+    The container is chosen by the ``recording_format`` config key.  FLAC
+    (the default) is encoded frame by frame as the writer thread drains
+    audio, so the finished recording can be sliced for transcription
+    without decoding and re-encoding it (see ``flac_index``).
+
+    Two capture modes are available through the ``capture_mode`` config key:
+
+    - ``"ring"`` (default): the PortAudio callback only copies each block
+      into a preallocated ring; the writer thread drains it in batches and
+      computes levels and silence off the audio thread.
+    - ``"queue"``: the original per-block ``queue.Queue`` hand-off.
+    """
 
     recording_started = Signal()
-    recording_stopped = Signal(str)  # path to WAV
+    recording_stopped = Signal(str)  # path to recording file
     recording_paused = Signal()
     recording_resumed = Signal()
     level_update = Signal(float)  # 0.0-1.0 RMS level
@@ -30,6 +97,8 @@ class AudioRecorder(QObject):
     _SENTINEL = None  # signals writer thread to stop
     _SILENCE_THRESHOLD = 0.01  # RMS below this counts as silence
     _SILENCE_BLOCKS = 30  # consecutive silent blocks needed (~1.5s at 50ms/block)
+    _BLOCK_SECONDS = 0.05  # PortAudio block size (50ms)
+    _DRAIN_INTERVAL = 0.1  # seconds between ring drains in the writer thread
 
     # Windows SetThreadExecutionState flags to keep screen awake
     _ES_CONTINUOUS = 0x80000000
@@ -61,6 +130,12 @@ class AudioRecorder(QObject):
 
         self._sf = None
 
+        # Ring-buffer capture state
+        self._ring = None
+        self._writer_stop = threading.Event()
+        self._blocksize = 0
+        self._status_overflows = 0
+
     @property
     def is_recording(self) -> bool:
         """Return True if currently recording."""
@@ -71,9 +146,24 @@ class AudioRecorder(QObject):
         """Return True if recording is paused."""
         return self._is_paused
 
+    @property
+    def overflow_count(self) -> int:
+        """Return the number of input overflows seen during the current recording.
+
+        Counts both PortAudio ``input_overflow`` flags and blocks dropped
+        because the capture ring was full.
+        """
+        dropped = self._ring.overflows if self._ring else 0
+        return self._status_overflows + dropped
+
+    @property
+    def dropped_frames(self) -> int:
+        """Return the number of frames dropped because the capture ring was full."""
+        return self._ring.dropped_frames if self._ring else 0
+
     @property
     def wav_path(self) -> str | None:
-        """Return the path to the current WAV file, or None."""
+        """Return the path to the current recording file (FLAC or WAV), or None."""
         return self._wav_path
 
     def start_recording(self, device=None):
@@ -88,10 +178,15 @@ class AudioRecorder(QObject):
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
             session_folder = os.path.join(sessions_dir(self._config), f"session_{ts}")
             ensure_dir(session_folder)
-            self._wav_path = os.path.join(session_folder, "recording.wav")
-
-            # Open soundfile for writing
-            self._sf = sf.SoundFile(self._wav_path, mode="w", samplerate=sr, channels=ch, subtype="PCM_16")
+            # Open soundfile for writing — FLAC frames are streamed as they are encoded
+            if self._config.get("recording_format", "flac") == "flac":
+                self._wav_path = os.path.join(session_folder, "recording.flac")
+                self._sf = sf.SoundFile(
+                    self._wav_path, mode="w", samplerate=sr, channels=ch, format="FLAC", subtype="PCM_16"
+                )
+            else:
+                self._wav_path = os.path.join(session_folder, "recording.wav")
+                self._sf = sf.SoundFile(self._wav_path, mode="w", samplerate=sr, channels=ch, subtype="PCM_16")
 
             # Clear queue
             while not self._queue.empty():
@@ -109,8 +204,22 @@ class AudioRecorder(QObject):
                 self._pending_audio.clear()
                 self._pending_samples = 0
 
+            # Preallocate the capture ring (ring mode) and reset overflow counters
+            self._blocksize = int(sr * self._BLOCK_SECONDS)
+            self._status_overflows = 0
+            self._writer_stop.clear()
+            if self._config.get("capture_mode", "ring") == "ring":
+                ring_seconds = self._config.get("capture_ring_seconds", 10)
+                self._ring = _CaptureRing(int(sr * ring_seconds), ch)
+                callback = self._ring_callback
+                writer = self._ring_writer_loop
+            else:
+                self._ring = None
+                callback = self._audio_callback
+                writer = self._writer_loop
+
             # Start writer thread
-            self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer_thread = threading.Thread(target=writer, daemon=True)
             self._writer_thread.start()
 
             # Determine device index
@@ -124,8 +233,8 @@ class AudioRecorder(QObject):
                 channels=ch,
                 dtype="int16",
                 device=dev_index,
-                callback=self._audio_callback,
-                blocksize=int(sr * 0.05),  # 50ms blocks
+                callback=callback,
+                blocksize=self._blocksize,  # 50ms blocks
             )
             self._stream.start()
             self._is_recording = True
@@ -166,7 +275,7 @@ class AudioRecorder(QObject):
             self.error_occurred.emit(tr("recorder.error.resume", error=e))
 
     def stop_recording(self) -> str | None:
-        """Stop recording and return path to WAV file."""
+        """Stop recording and return path to the recording file."""
         if not self._is_recording:
             return None
         self._is_recording = False
@@ -183,6 +292,7 @@ class AudioRecorder(QObject):
             self._stream = None
 
         # Signal writer thread to finish
+        self._writer_stop.set()
         self._queue.put(self._SENTINEL)
         if self._writer_thread:
             self._writer_thread.join(timeout=5)
@@ -196,6 +306,13 @@ class AudioRecorder(QObject):
                 pass
             self._sf = None
 
+        if self.overflow_count:
+            log.warning(
+                "Recording finished with %d input overflow(s), %d frame(s) dropped",
+                self.overflow_count,
+                self.dropped_frames,
+            )
+
         self._keep_screen_awake(False)
         path = self._wav_path
         self.recording_stopped.emit(path)
@@ -222,14 +339,22 @@ class AudioRecorder(QObject):
 
     def _audio_callback(self, indata, frames, time_info, status):
         """Called by PortAudio in its own thread — just enqueue data."""
-        if status:
-            pass  # Could log status flags
+        if status and status.input_overflow:
+            self._status_overflows += 1
         self._queue.put(indata.copy())
         # Calculate RMS for VU meter
         rms = np.sqrt(np.mean(indata.astype(np.float32) ** 2)) / 32768.0
         self.level_update.emit(min(rms * 5, 1.0))  # Scale up for visibility
+        self._update_silence(rms)
+
+    def _ring_callback(self, indata, frames, time_info, status):
+        """Called by PortAudio in its own thread — one copy into the ring, nothing else."""
+        if status and status.input_overflow:
+            self._status_overflows += 1
+        self._ring.push(indata)
 
-        # Silence detection
+    def _update_silence(self, rms: float):
+        """Advance silence detection with the RMS of one block."""
         if rms < self._SILENCE_THRESHOLD:
             self._silence_frames += 1
             if self._silence_frames >= self._SILENCE_BLOCKS and not self._silence_emitted:
@@ -253,6 +378,39 @@ class AudioRecorder(QObject):
             except Exception:
                 break
 
+    def _ring_writer_loop(self):
+        """Writer thread (ring mode): drain the ring in batches and write to disk.
+
+        Level metering and silence detection run here on the drained batch,
+        one RMS value per 50ms block, so the audio thread never touches them.
+        """
+        while True:
+            stopping = self._writer_stop.is_set()
+            data = self._ring.drain()
+            if data is not None:
+                try:
+                    self._sf.write(data)
+                    with self._pending_lock:
+                        self._pending_audio.append(data)
+                        self._pending_samples += len(data)
+                except Exception:
+                    break
+                self._analyze_levels(data)
+            if stopping:
+                break
+            time.sleep(self._DRAIN_INTERVAL)
+
+    def _analyze_levels(self, data):
+        """Compute per-block RMS for a drained batch and update meter/silence state."""
+        blocksize = self._blocksize or len(data)
+        power = np.mean(data.astype(np.float32) ** 2, axis=1)
+        starts = np.arange(0, len(power), blocksize)
+        counts = np.diff(np.append(starts, len(power)))
+        block_rms = np.sqrt(np.add.reduceat(power, starts) / counts) / 32768.0
+        for rms in block_rms:
+            self._update_silence(float(rms))
+        self.level_update.emit(min(float(block_rms[-1]) * 5, 1.0))  # Scale up for visibility
+
     def _tick(self):
         """Update duration counter every second."""
         self._elapsed += 1
@@ -272,6 +430,7 @@ class AudioRecorder(QObject):
             except Exception:
                 pass
             self._sf = None
+        self._writer_stop.set()
         self._is_recording = False
         self._is_paused = False
         self._keep_screen_awake(False)
@@ -1,10 +1,12 @@
 """Campaign Assistant — AI-powered Q&A about the campaign using Mistral."""
 
-import re
+import html
+import logging
 import time
 
 from PySide6.QtCore import QObject, QThread, Signal
 from PySide6.QtWidgets import (
+    QCheckBox,
     QDialog,
     QHBoxLayout,
     QLabel,
@@ -14,23 +16,19 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 
+from .campaign_index import SOURCE_JOURNAL, SOURCE_QUEST_LOG, get_campaign_index, html_to_text
 from .filigree_overlay import GoldFiligreeOverlay
 from .i18n import tr
-from .summarizer import _strip_code_fences
+from .mistral_pool import mistral_call
+from .summarizer import _LEADING_FENCE, _strip_code_fences
+from .transcript_segmenter import estimate_tokens
+from .vector_store import SOURCE_TRANSCRIPT, semantic_search
 
+log = logging.getLogger(__name__)
 
-def _strip_html(html: str) -> str:
-    """Strip HTML tags and collapse whitespace to produce plain text."""
-    text = re.sub(r"<br\s*/?>", "\n", html, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", "", text)
-    text = re.sub(r"&nbsp;", " ", text)
-    text = re.sub(r"&mdash;", "—", text)
-    text = re.sub(r"&amp;", "&", text)
-    text = re.sub(r"&lt;", "<", text)
-    text = re.sub(r"&gt;", ">", text)
-    text = re.sub(r"&#\d+;", "", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
+_SNIPPET_CHARS = 500  # characters of each passage shown in search results
+_ANSWER_MAX_TOKENS = 4000
+_PARTIAL_INTERVAL = 0.1  # seconds between streamed answer refreshes
 
 
 def _get_default_system_prompt() -> str:
@@ -43,46 +41,143 @@ def get_default_campaign_assistant() -> str:
     return _get_default_system_prompt()
 
 
-def _call_with_retry(fn, retries=3, base_delay=15):
-    """Call fn() with retry and exponential backoff on 429 rate limit."""
-    for attempt in range(retries):
-        try:
-            return fn()
-        except Exception as e:
-            if "429" in str(e) and attempt < retries - 1:
-                time.sleep(base_delay * (2**attempt))
-                continue
-            raise
+def _format_sections(sections) -> str:
+    return "\n\n".join(s.text for s in sections)
+
+
+def _format_passages(passages) -> str:
+    """Join embedding-store passages, prefixing each with its section or session title."""
+    parts = []
+    for p in passages:
+        title, text = p["title"], p["text"]
+        parts.append(f"{title}\n{text}" if title and not text.startswith(title) else text)
+    return "\n\n".join(parts)
+
+
+def _semantic_passages(
+    config: dict, query: str, k: int, sources: set[str], progress=None
+) -> list[tuple[dict, float]] | None:
+    """Semantic search results, or None when disabled or the embeddings call failed."""
+    if not config.get("semantic_search", True):
+        return None
+    try:
+        return semantic_search(config, query, k, sources, progress)
+    except Exception as e:
+        log.warning("Semantic search unavailable, falling back to keyword search: %s", e)
+        return None
+
+
+def _trim_history(
+    history: list[tuple[str, str]], budget: int, language: str
+) -> tuple[list[tuple[str, str]], list[str]]:
+    """Keep the most recent ``(question, answer)`` turns that fit *budget* tokens.
+
+    Returns the kept turns, oldest first, and the questions of the dropped
+    older turns.
+    """
+    kept = []
+    used = 0
+    for question, answer in reversed(history):
+        cost = estimate_tokens(question, language) + estimate_tokens(answer, language)
+        if used + cost > budget:
+            break
+        kept.append((question, answer))
+        used += cost
+    kept.reverse()
+    dropped = [question for question, _answer in history[: len(history) - len(kept)]]
+    return kept, dropped
 
 
 class AssistantWorker(QObject):
-    """Runs the AI query in a background thread."""
+    """Runs the AI query in a background thread.
+
+    Only the passages that best match the question are sent — closest
+    journal and transcript passages from the embedding store, or best BM25
+    journal sections when semantic search is off or unavailable — plus the
+    quest log, whole if it fits its token budget, otherwise its headings
+    and best matching sections.
+    """
 
+    status = Signal(str)
+    partial = Signal(str)  # answer so far, while streaming
     answer_ready = Signal(str)
+    context_stats = Signal(int, float, int, int)  # passages, retrieval ms, tokens sent, tokens in full documents
     error = Signal(str)
 
-    def __init__(self, question: str, journal_html: str, quest_log_html: str, config: dict):
+    def __init__(self, question: str, config: dict, history: list[tuple[str, str]] | None = None):
         super().__init__()
         self._question = question
-        self._journal_html = journal_html
-        self._quest_log_html = quest_log_html
         self._config = config
+        self._history = history or []  # earlier (question, plain-text answer) turns of the conversation
+        # Follow-ups ("and then?") rarely name what they are about: retrieve with the previous question too
+        self._query = f"{self._history[-1][0]}\n{question}" if self._history else question
+
+    def _build_context(self) -> tuple[str, str]:
+        """Return ``(quest_log_text, journal_text)`` for the question and emit context_stats."""
+        language = self._config.get("language", "en")
+        top_k = max(1, int(self._config.get("assistant_top_k", 6)))
+        quest_budget = int(self._config.get("assistant_quest_log_tokens", 4000))
+
+        start = time.perf_counter()
+        index = get_campaign_index(self._config)
+        journal = index.sections(SOURCE_JOURNAL)
+        quests = index.sections(SOURCE_QUEST_LOG)
+
+        passages = _semantic_passages(
+            self._config,
+            self._query,
+            top_k,
+            {SOURCE_JOURNAL, SOURCE_TRANSCRIPT},
+            lambda count: self.status.emit(tr("assistant.indexing", count=count)),
+        )
+        if passages is not None:
+            hits = [p for p, _score in passages]
+            journal_text = _format_passages(hits)
+        else:
+            hits = [s for s, _score in index.search(self._query, top_k, SOURCE_JOURNAL)]
+            if not hits:
+                hits = journal[-top_k:]  # nothing matched: fall back to the most recent sessions
+            position = {s.digest: i for i, s in enumerate(journal)}
+            hits.sort(key=lambda s: position.get(s.digest, 0))  # keep chronological order
+            journal_text = _format_sections(hits)
+
+        quest_log_text = _format_sections(quests)
+        if estimate_tokens(quest_log_text, language) > quest_budget:
+            # Quest log summary: every heading, then the best matching sections while they fit
+            headings = "\n".join(f"- {s.title}" for s in quests if s.title)
+            picked = []
+            used = estimate_tokens(headings, language)
+            for section, _score in index.search(self._query, len(quests), SOURCE_QUEST_LOG):
+                cost = estimate_tokens(section.text, language)
+                if used + cost <= quest_budget:
+                    picked.append(section)
+                    used += cost
+            quest_log_text = f"{headings}\n\n{_format_sections(picked)}".strip()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        full_tokens = sum(estimate_tokens(s.text, language) for s in journal + quests)
+        sent_tokens = estimate_tokens(journal_text, language) + estimate_tokens(quest_log_text, language)
+        log.info(
+            "Assistant context: %d passages in %.1f ms, ~%d of ~%d tokens",
+            len(hits),
+            elapsed_ms,
+            sent_tokens,
+            full_tokens,
+        )
+        self.context_stats.emit(len(hits), elapsed_ms, sent_tokens, full_tokens)
+        return quest_log_text, journal_text
 
     def run(self):
         """Execute the campaign assistant query."""
         try:
-            from mistralai import Mistral
-
             api_key = self._config.get("api_key", "")
             if not api_key:
                 self.error.emit(tr("assistant.error.no_api_key"))
                 return
 
-            client = Mistral(api_key=api_key)
             model = self._config.get("summary_model", "mistral-large-latest")
 
-            journal_text = _strip_html(self._journal_html)
-            quest_log_text = _strip_html(self._quest_log_html)
+            quest_log_text, journal_text = self._build_context()
 
             system_template = self._config.get("prompt_campaign_assistant") or _get_default_system_prompt()
             system_prompt = system_template.format(
@@ -91,34 +186,110 @@ class AssistantWorker(QObject):
                 journal_text=journal_text,
             )
 
-            response = _call_with_retry(
-                lambda: client.chat.complete(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": self._question},
-                    ],
-                    temperature=0.2,
-                    max_tokens=4000,
+            language = self._config.get("language", "en")
+            budget = int(self._config.get("assistant_history_tokens", 4000))
+            turns, dropped = _trim_history(self._history, budget, language)
+            if dropped:
+                # Cheap summary of turns that no longer fit: just what was asked
+                earlier = "\n".join(f"- {q}" for q in dropped)
+                system_prompt += "\n\n" + tr("prompt.assistant_earlier_questions", questions=earlier)
+            messages = [{"role": "system", "content": system_prompt}]
+            for question, answer in turns:
+                messages.append({"role": "user", "content": question})
+                messages.append({"role": "assistant", "content": answer})
+            messages.append({"role": "user", "content": self._question})
+
+            if self._config.get("assistant_streaming", True):
+                answer = mistral_call(
+                    self._config,
+                    "chat",
+                    lambda client, timeout_ms: self._stream(client, model, messages, timeout_ms),
                 )
-            )
+            else:
+                response = mistral_call(
+                    self._config,
+                    "chat",
+                    lambda client, timeout_ms: client.chat.complete(
+                        model=model,
+                        messages=messages,
+                        temperature=0.2,
+                        max_tokens=_ANSWER_MAX_TOKENS,
+                        timeout_ms=timeout_ms,
+                    ),
+                )
+                answer = response.choices[0].message.content
 
-            answer = response.choices[0].message.content
             answer = _strip_code_fences(answer)
             self.answer_ready.emit(answer)
 
         except Exception as e:
             self.error.emit(tr("assistant.error.generic", error=e))
 
+    def _stream(self, client, model: str, messages: list[dict], timeout_ms: int) -> str:
+        """Stream the answer, emitting the text so far at most every ``_PARTIAL_INTERVAL``."""
+        parts = []
+        last_emit = time.monotonic()
+        for event in client.chat.stream(
+            model=model,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=_ANSWER_MAX_TOKENS,
+            timeout_ms=timeout_ms,
+        ):
+            choices = event.data.choices
+            delta = choices[0].delta.content if choices else None
+            if isinstance(delta, str) and delta:
+                parts.append(delta)
+                now = time.monotonic()
+                if now - last_emit >= _PARTIAL_INTERVAL:
+                    last_emit = now
+                    self.partial.emit(_LEADING_FENCE.sub("", "".join(parts)))
+        return "".join(parts)
+
+
+class SearchWorker(QObject):
+    """Searches the campaign for passages related to a query, without asking the AI."""
+
+    status = Signal(str)
+    results_ready = Signal(list)  # [(source, title, text, score), ...]
+    error = Signal(str)
+
+    def __init__(self, query: str, config: dict):
+        super().__init__()
+        self._query = query
+        self._config = config
+
+    def run(self):
+        """Search the campaign for the query and emit the best passages."""
+        try:
+            top_k = max(1, int(self._config.get("assistant_top_k", 6)))
+            passages = _semantic_passages(
+                self._config,
+                self._query,
+                top_k,
+                {SOURCE_JOURNAL, SOURCE_QUEST_LOG, SOURCE_TRANSCRIPT},
+                lambda count: self.status.emit(tr("assistant.indexing", count=count)),
+            )
+            if passages is not None:
+                results = [(p["source"], p["title"], p["text"], score) for p, score in passages]
+            else:
+                hits = get_campaign_index(self._config).search(self._query, top_k)
+                results = [(s.source, s.title, s.text, score) for s, score in hits]
+            self.results_ready.emit(results)
+        except Exception as e:
+            self.error.emit(tr("assistant.error.generic", error=e))
+
 
 class CampaignAssistantDialog(QDialog):
     """Dialog for asking AI questions about the campaign."""
 
-    def __init__(self, journal_html: str, quest_log_html: str, config: dict, parent=None):
+    def __init__(self, config: dict, parent=None):
         super().__init__(parent)
-        self._journal_html = journal_html
-        self._quest_log_html = quest_log_html
         self._config = config
+        self._context_status = ""
+        self._history = []  # (question, plain-text answer) turns sent back with follow-ups
+        self._turns_html = []  # rendered turns shown in the answer area
+        self._question = ""
         self._thread = None
         self._worker = None
         self.setWindowTitle(tr("assistant.dialog.title"))
@@ -140,8 +311,25 @@ class CampaignAssistantDialog(QDialog):
         self._btn_send.setObjectName("btn_primary")
         self._btn_send.clicked.connect(self._ask)
         input_row.addWidget(self._btn_send)
+
+        self._btn_search = QPushButton(tr("assistant.btn_search"))
+        self._btn_search.setToolTip(tr("assistant.btn_search_tooltip"))
+        self._btn_search.clicked.connect(self._search)
+        input_row.addWidget(self._btn_search)
         layout.addLayout(input_row)
 
+        # Conversation row
+        conversation_row = QHBoxLayout()
+        self._chk_conversation = QCheckBox(tr("assistant.conversation_mode"))
+        self._chk_conversation.setToolTip(tr("assistant.conversation_mode_tooltip"))
+        self._chk_conversation.setChecked(self._config.get("assistant_conversation", True))
+        conversation_row.addWidget(self._chk_conversation)
+        conversation_row.addStretch()
+        self._btn_new = QPushButton(tr("assistant.btn_new_conversation"))
+        self._btn_new.clicked.connect(self._new_conversation)
+        conversation_row.addWidget(self._btn_new)
+        layout.addLayout(conversation_row)
+
         # Status label
         self._status = QLabel("")
         self._status.setStyleSheet("color: #8899aa; font-size: 11px;")
@@ -152,43 +340,124 @@ class CampaignAssistantDialog(QDialog):
         self._answer.setOpenExternalLinks(False)
         layout.addWidget(self._answer, stretch=1)
 
-    def _ask(self):
-        question = self._input.text().strip()
-        if not question:
-            return
-
+    def _check_campaign(self) -> bool:
         from .utils import active_campaign_name
 
         if not active_campaign_name(self._config):
             self._status.setText(tr("assistant.error.no_campaign"))
             self._status.setStyleSheet("color: #ff6b6b; font-size: 11px;")
-            return
-
-        self._btn_send.setEnabled(False)
-        self._input.setEnabled(False)
-        self._status.setText(tr("assistant.thinking"))
-        self._status.setStyleSheet("color: #d4af37; font-size: 11px;")
+            return False
+        return True
+
+    def _set_busy(self, busy: bool, status: str = ""):
+        self._btn_send.setEnabled(not busy)
+        self._btn_search.setEnabled(not busy)
+        self._btn_new.setEnabled(not busy)
+        self._input.setEnabled(not busy)
+        if busy:
+            self._status.setText(status)
+            self._status.setStyleSheet("color: #d4af37; font-size: 11px;")
+
+    def _new_conversation(self):
+        self._history = []
+        self._turns_html = []
         self._answer.clear()
+        self._status.setText("")
+        self._input.setFocus()
 
-        self._worker = AssistantWorker(question, self._journal_html, self._quest_log_html, self._config)
+    def _render_conversation(self, pending_answer: str | None = None):
+        """Show the finished turns, plus the question in progress and its answer so far."""
+        parts = list(self._turns_html)
+        if pending_answer is not None:
+            parts.append(self._turn_html(self._question, pending_answer or "<p>…</p>"))
+        self._answer.setHtml("<hr>".join(parts))
+        bar = self._answer.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
+    @staticmethod
+    def _turn_html(question: str, answer_html: str) -> str:
+        return f'<p style="color:#d4af37;"><strong>{html.escape(question)}</strong></p>{answer_html}'
+
+    def _start_worker(self, worker: QObject, done_signal):
+        self._worker = worker
         self._thread = QThread()
-        self._worker.moveToThread(self._thread)
-        self._thread.started.connect(self._worker.run)
-        self._worker.answer_ready.connect(self._on_answer)
-        self._worker.error.connect(self._on_error)
-        self._worker.answer_ready.connect(self._thread.quit)
-        self._worker.error.connect(self._thread.quit)
+        worker.moveToThread(self._thread)
+        self._thread.started.connect(worker.run)
+        worker.status.connect(self._status.setText)
+        worker.error.connect(self._on_error)
+        done_signal.connect(self._thread.quit)
+        worker.error.connect(self._thread.quit)
         self._thread.start()
 
+    def _ask(self):
+        question = self._input.text().strip()
+        if not question or not self._check_campaign():
+            return
+
+        if not self._chk_conversation.isChecked():
+            self._history = []
+            self._turns_html = []
+        self._set_busy(True, tr("assistant.thinking"))
+        self._context_status = ""
+        self._question = question
+        self._render_conversation("")
+        worker = AssistantWorker(question, self._config, list(self._history))
+        worker.context_stats.connect(self._on_context_stats)
+        worker.partial.connect(self._render_conversation)
+        worker.answer_ready.connect(self._on_answer)
+        self._start_worker(worker, worker.answer_ready)
+
+    def _search(self):
+        query = self._input.text().strip()
+        if not query or not self._check_campaign():
+            return
+
+        self._set_busy(True, tr("assistant.searching"))
+        self._answer.clear()
+        worker = SearchWorker(query, self._config)
+        worker.results_ready.connect(self._on_search_results)
+        self._start_worker(worker, worker.results_ready)
+
+    def _on_context_stats(self, passages: int, elapsed_ms: float, sent_tokens: int, full_tokens: int):
+        saved = 100 - round(100 * sent_tokens / full_tokens) if full_tokens else 0
+        self._context_status = tr(
+            "assistant.context_stats",
+            passages=passages,
+            ms=f"{elapsed_ms:.0f}",
+            sent=sent_tokens,
+            total=full_tokens,
+            saved=max(0, saved),
+        )
+
     def _on_answer(self, answer: str):
-        self._answer.setHtml(answer)
-        self._status.setText("")
-        self._btn_send.setEnabled(True)
-        self._input.setEnabled(True)
+        self._history.append((self._question, html_to_text(answer)))
+        self._turns_html.append(self._turn_html(self._question, answer))
+        self._render_conversation()
+        self._input.clear()
+        self._status.setText(self._context_status)
+        self._status.setStyleSheet("color: #8899aa; font-size: 11px;")
+        self._set_busy(False)
+        self._input.setFocus()
+
+    def _on_search_results(self, results: list):
+        self._set_busy(False)
+        self._status.setText("" if results else tr("assistant.search.no_results"))
+        self._status.setStyleSheet("color: #8899aa; font-size: 11px;")
+        parts = []
+        for source, title, text, score in results:
+            label = tr(f"assistant.source.{source}")
+            heading = f"{label} — {html.escape(title)}" if title else label
+            snippet = html.escape(text[:_SNIPPET_CHARS] + ("…" if len(text) > _SNIPPET_CHARS else ""))
+            parts.append(
+                f'<p><strong>{heading}</strong> <span style="color:#8899aa;">({score:.2f})</span><br>'
+                f"{snippet.replace(chr(10), '<br>')}</p>"
+            )
+        self._answer.setHtml("<hr>".join(parts))
         self._input.setFocus()
 
     def _on_error(self, error: str):
+        if isinstance(self._worker, AssistantWorker):
+            self._render_conversation()  # drop the unanswered question
         self._status.setText(error)
         self._status.setStyleSheet("color: #ff6b6b; font-size: 11px;")
-        self._btn_send.setEnabled(True)
-        self._input.setEnabled(True)
+        self._set_busy(False)
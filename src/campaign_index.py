@@ -0,0 +1,230 @@
+"""Local BM25 index over the campaign journal and quest log.
+
+The journal is split into one section per ``<h2>`` session heading (its
+sharded files are read back as one document, see :mod:`journal_store`) and
+the quest log into one section per heading (``<h1>`` to ``<h3>``).  Each
+section is tokenized once and kept in an inverted index.  The index is
+brought up to date lazily, when it is queried from a worker thread: a file
+whose mtime or size changed is read again and only the sections whose HTML
+changed (by SHA-1) are re-tokenized, so updating the index after appending
+a session costs one section, not the whole journal, and saving never pays
+for it on the UI thread.
+
+The Campaign Assistant uses :meth:`CampaignIndex.search` to send the most
+relevant journal passages instead of the entire journal on every question.
+"""
+
+import hashlib
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+
+from .journal_store import INDEX_NAME, read_journal
+from .utils import active_campaign_dir, journal_dir, quest_log_path
+
+SOURCE_JOURNAL = "journal"
+SOURCE_QUEST_LOG = "quest_log"
+
+# BM25 parameters (standard Okapi defaults).
+_K1 = 1.2
+_B = 0.75
+
+_JOURNAL_SPLIT = re.compile(r"(?=<h2[\s>])", re.IGNORECASE)
+_QUEST_LOG_SPLIT = re.compile(r"(?=<h[1-3][\s>])", re.IGNORECASE)
+_HEADING = re.compile(r"<h[1-3][^>]*>(.*?)</h[1-3]>", re.IGNORECASE | re.DOTALL)
+_BODY = re.compile(r"<body[^>]*>(.*)</body>", re.IGNORECASE | re.DOTALL)
+_HEAD = re.compile(r"<head[^>]*>.*?</head>", re.IGNORECASE | re.DOTALL)
+_WORD = re.compile(r"\w\w+")
+
+
+def html_to_text(html: str) -> str:
+    """Strip HTML tags and collapse whitespace to produce plain text."""
+    text = _HEAD.sub("", html)
+    text = re.sub(r"<br\s*/?>|</p>|</li>|</h\d>", "\n", text, flags=re.IGNORECASE)
+    text = re.sub(r"<[^>]+>", "", text)
+    text = re.sub(r"&nbsp;", " ", text)
+    text = re.sub(r"&mdash;", "—", text)
+    text = re.sub(r"&amp;", "&", text)
+    text = re.sub(r"&lt;", "<", text)
+    text = re.sub(r"&gt;", ">", text)
+    text = re.sub(r"&#\d+;", "", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n\s*\n\s*\n+", "\n\n", text)
+    return text.strip()
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase, accent-folded word tokens of two characters or more."""
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return _WORD.findall(folded)
+
+
+@dataclass
+class Section:
+    """One indexed passage of the journal or quest log."""
+
+    source: str
+    title: str
+    text: str
+    digest: str
+    length: int = 0
+
+
+def _split_parts(html: str, source: str) -> list[tuple[str, str]]:
+    """Split a document into ``(digest, html part)`` pairs, one per section."""
+    body = _BODY.search(html)
+    html = body.group(1) if body else html
+    pattern = _JOURNAL_SPLIT if source == SOURCE_JOURNAL else _QUEST_LOG_SPLIT
+    return [(hashlib.sha1(f"{source}\n{part}".encode("utf-8")).hexdigest(), part) for part in pattern.split(html)]
+
+
+def _make_section(source: str, digest: str, part: str) -> Section | None:
+    text = html_to_text(part)
+    if not text:
+        return None
+    heading = _HEADING.search(part)
+    title = html_to_text(heading.group(1)) if heading and part.lstrip().startswith("<h") else ""
+    return Section(source, title, text, digest)
+
+
+def split_sections(html: str, source: str) -> list[Section]:
+    """Split a journal or quest log HTML document into titled sections."""
+    sections = (_make_section(source, digest, part) for digest, part in _split_parts(html, source))
+    return [s for s in sections if s is not None]
+
+
+class CampaignIndex:
+    """Thread-safe, incrementally updated BM25 index of one campaign's documents."""
+
+    def __init__(self, paths: dict[str, str]):
+        self._paths = paths  # source -> file path (the journal's index, whose stamp covers every session)
+        self._lock = threading.Lock()
+        self._stamps = {}  # source -> (mtime, size) of the indexed file
+        self._order = {}  # source -> [digest, ...] in document order
+        self._sections = {}  # digest -> Section
+        self._postings = {}  # term -> {digest: term frequency}
+        self._total_length = 0
+
+    # ── Updates ───────────────────────────────────────────
+
+    def refresh(self):
+        """Re-index any source file that changed on disk since it was last indexed."""
+        for path in self._paths.values():
+            self.refresh_file(path)
+
+    def refresh_file(self, path: str):
+        """Re-index *path* if it is one of the indexed files and has changed."""
+        source = next((s for s, p in self._paths.items() if os.path.normcase(p) == os.path.normcase(path)), None)
+        if source is None:
+            return
+        try:
+            st = os.stat(path)
+            stamp = (st.st_mtime, st.st_size)
+            if self._stamps.get(source) == stamp:
+                return
+            if source == SOURCE_JOURNAL:
+                html = read_journal(os.path.dirname(path))
+            else:
+                with open(path, encoding="utf-8") as f:
+                    html = f.read()
+        except OSError:
+            stamp, html = None, ""
+        self.update(source, html)
+        self._stamps[source] = stamp
+
+    def update(self, source: str, html: str):
+        """Replace the sections of *source*, re-tokenizing only those that changed."""
+        parts = _split_parts(html, source)
+        with self._lock:
+            known = {d: self._sections[d] for d in self._order.get(source, ())}
+        fresh = {}
+        for digest, part in parts:
+            if digest not in known and digest not in fresh:
+                fresh[digest] = _make_section(source, digest, part)
+        with self._lock:
+            for digest in set(known) - {d for d, _part in parts}:
+                self._remove(digest)
+            for section in fresh.values():
+                if section is not None and section.digest not in self._sections:
+                    self._add(section)
+            self._order[source] = [d for d, _part in parts if d in self._sections]
+
+    def _add(self, section: Section):
+        counts = Counter(tokenize(f"{section.title}\n{section.text}"))
+        section.length = sum(counts.values())
+        self._sections[section.digest] = section
+        self._total_length += section.length
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[section.digest] = tf
+
+    def _remove(self, digest: str):
+        section = self._sections.pop(digest, None)
+        if section is None:
+            return
+        self._total_length -= section.length
+        for term in set(tokenize(f"{section.title}\n{section.text}")):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(digest, None)
+                if not postings:
+                    del self._postings[term]
+
+    # ── Queries ───────────────────────────────────────────
+
+    def sections(self, source: str) -> list[Section]:
+        """All sections of *source*, in document order."""
+        with self._lock:
+            return [self._sections[d] for d in self._order.get(source, ())]
+
+    def search(self, query: str, k: int, source: str | None = None) -> list[tuple[Section, float]]:
+        """Return up to *k* ``(section, score)`` pairs best matching *query*, best first.
+
+        Results are restricted to *source* when given.  Sections that share
+        no term with the query are never returned.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            n = len(self._sections)
+            if not n or not terms:
+                return []
+            avg_length = self._total_length / n or 1.0
+            scores = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for digest, tf in postings.items():
+                    section = self._sections[digest]
+                    if source is not None and section.source != source:
+                        continue
+                    norm = _K1 * (1 - _B + _B * section.length / avg_length)
+                    scores[digest] = scores.get(digest, 0.0) + idf * tf * (_K1 + 1) / (tf + norm)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[: max(0, k)]
+            return [(self._sections[digest], score) for digest, score in ranked]
+
+
+_indexes = {}  # campaign dir -> CampaignIndex
+_indexes_lock = threading.Lock()
+
+
+def get_campaign_index(config: dict) -> CampaignIndex:
+    """Return the index of the active campaign, refreshed from disk.
+
+    Refreshing reads every changed file (the whole journal when any session
+    changed), so call this from a worker thread.
+    """
+    key = os.path.normcase(active_campaign_dir(config))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            journal_index = os.path.join(journal_dir(config), INDEX_NAME)
+            index = CampaignIndex({SOURCE_JOURNAL: journal_index, SOURCE_QUEST_LOG: quest_log_path(config)})
+            _indexes[key] = index
+    index.refresh()
+    return index
@@ -1,8 +1,11 @@
 """Shared diff-highlighting utilities for quest proposals and sync conflicts."""
 
+import bisect
 import difflib
+import re
+from collections import Counter
 
-from PySide6.QtGui import QColor, QTextBlockFormat, QTextCharFormat, QTextCursor
+from PySide6.QtGui import QColor, QTextBlockFormat, QTextCharFormat, QTextCursor, QTextFormat
 from PySide6.QtWidgets import QTextEdit
 
 COLOR_ADDED = QColor("#1a3d1a")
@@ -10,6 +13,17 @@ COLOR_DELETED_BG = QColor("#3d1a1a")
 COLOR_DELETED_TEXT = QColor("#ff8888")
 DELETED_STATE = 1
 
+# In QTextDocument.toRawText(): blocks end at paragraph separators and frame
+# (table) boundaries; a <br> inside a block is a line separator.
+_BLOCK_BREAK = re.compile("[\u2029\ufdd0\ufdd1]")
+_LINE_SEPARATOR = "\u2028"
+
+# Histogram diff: lines occurring more often than this in a region are not
+# used as anchors.  Regions with at most this many line pairs are diffed
+# exactly with difflib, which is fast at that size.
+_MAX_CHAIN = 64
+_DIFFLIB_MAX_CELLS = 40_000
+
 
 def filtered(lines: list[str]) -> tuple[list[str], list[int]]:
     """Normalize lines for comparison and return (filtered, index_map).
@@ -30,74 +44,215 @@ def filtered(lines: list[str]) -> tuple[list[str], list[int]]:
     return out, idx_map
 
 
+def _intern(a: list[str], b: list[str]) -> tuple[list[int], list[int]]:
+    """Map each distinct line to a small integer so comparisons are int compares."""
+    ids: dict[str, int] = {}
+    return [ids.setdefault(x, len(ids)) for x in a], [ids.setdefault(x, len(ids)) for x in b]
+
+
+def _unique_anchors(a: list[int], a_lo: int, a_hi: int, counts: Counter, b: list[int], b_lo: int, b_hi: int):
+    """Patience diff step: the longest in-order chain of lines occurring exactly once on each side.
+
+    *counts* are the line counts of ``a[a_lo:a_hi]``.  Returns ``(i, j)``
+    pairs in increasing order, or an empty list.
+    """
+    b_counts = Counter(b[b_lo:b_hi])
+    where = {a[i]: i for i in range(a_lo, a_hi) if counts[a[i]] == 1}
+    pairs = [(where[b[j]], j) for j in range(b_lo, b_hi) if b_counts[b[j]] == 1 and b[j] in where]
+    # Longest increasing subsequence of the a indices (pairs are in b order)
+    tails, tail_pairs, previous = [], [], [-1] * len(pairs)
+    for k, (i, _j) in enumerate(pairs):
+        pos = bisect.bisect_left(tails, i)
+        if pos:
+            previous[k] = tail_pairs[pos - 1]
+        if pos == len(tails):
+            tails.append(i)
+            tail_pairs.append(k)
+        else:
+            tails[pos] = i
+            tail_pairs[pos] = k
+    chain = []
+    k = tail_pairs[-1] if tail_pairs else -1
+    while k >= 0:
+        chain.append(pairs[k])
+        k = previous[k]
+    chain.reverse()
+    return chain
+
+
+def _difflib_matches(a: list[int], a_lo: int, a_hi: int, b: list[int], b_lo: int, b_hi: int):
+    """Matching ``(i, j)`` pairs of ``a[a_lo:a_hi]`` and ``b[b_lo:b_hi]``, found exactly by difflib."""
+    sm = difflib.SequenceMatcher(None, a[a_lo:a_hi], b[b_lo:b_hi], autojunk=False)
+    return [(a_lo + i + k, b_lo + j + k) for i, j, size in sm.get_matching_blocks() for k in range(size)]
+
+
+def _histogram_matches(a: list[int], b: list[int]) -> list[tuple[int, int]]:
+    """Return matching ``(i, j)`` index pairs of *a* and *b*, in increasing order.
+
+    Common prefixes and suffixes are trimmed first, so unchanged
+    stretches cost a single comparison each, and small regions are
+    finished with difflib.  A large region is cut at once at every line
+    that occurs exactly once on each side and keeps its order (patience
+    diff), and the gaps are diffed in turn.  A region without such lines
+    falls back to histogram diff: anchor on the longest run of equal lines
+    around the least frequent line shared by both sides, nearest the
+    middle of the region on ties, then recurse left and right of it.  A
+    region whose shared lines are all very frequent goes to difflib too.
+    Anchoring one run at a time on all-unique lines made the recursion
+    quadratic when edits are spread evenly.
+    """
+    matches = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        a_lo, a_hi, b_lo, b_hi = stack.pop()
+        while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+            matches.append((a_lo, b_lo))
+            a_lo += 1
+            b_lo += 1
+        while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+            matches.append((a_hi, b_hi))
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+        if (a_hi - a_lo) * (b_hi - b_lo) <= _DIFFLIB_MAX_CELLS:
+            matches.extend(_difflib_matches(a, a_lo, a_hi, b, b_lo, b_hi))
+            continue
+
+        counts = Counter(a[a_lo:a_hi])
+        anchors = _unique_anchors(a, a_lo, a_hi, counts, b, b_lo, b_hi)
+        if anchors:
+            matches.extend(anchors)
+            for (i, j), (next_i, next_j) in zip([(a_lo - 1, b_lo - 1)] + anchors, anchors + [(a_hi, b_hi)]):
+                stack.append((i + 1, next_i, j + 1, next_j))
+            continue
+
+        positions: dict[int, list[int]] = {}
+        for i in range(a_lo, a_hi):
+            if counts[a[i]] <= _MAX_CHAIN:
+                positions.setdefault(a[i], []).append(i)
+
+        middle = a_lo + a_hi
+        best = None  # (count, -length, distance from the middle, s_a, e_a, s_b, e_b)
+        j = b_lo
+        while j < b_hi:
+            candidates = positions.get(b[j])
+            next_j = j + 1
+            if candidates and (best is None or len(candidates) <= best[0]):
+                for i in candidates:
+                    s_a, s_b = i, j
+                    while s_a > a_lo and s_b > b_lo and a[s_a - 1] == b[s_b - 1]:
+                        s_a -= 1
+                        s_b -= 1
+                    e_a, e_b = i + 1, j + 1
+                    while e_a < a_hi and e_b < b_hi and a[e_a] == b[e_b]:
+                        e_a += 1
+                        e_b += 1
+                    key = (len(candidates), -(e_a - s_a), abs(s_a + e_a - middle), s_a, e_a, s_b, e_b)
+                    if best is None or key < best:
+                        best = key
+                    next_j = max(next_j, e_b)
+            j = next_j
+
+        if best is None:
+            # Only very frequent lines in common (e.g. rules and empty paragraphs): no anchor to
+            # cut at, so the region is diffed exactly rather than replaced whole
+            matches.extend(_difflib_matches(a, a_lo, a_hi, b, b_lo, b_hi))
+            continue
+        _count, _neg_len, _distance, s_a, e_a, s_b, e_b = best
+        matches.extend(zip(range(s_a, e_a), range(s_b, e_b)))
+        stack.append((a_lo, s_a, b_lo, s_b))
+        stack.append((e_a, a_hi, e_b, b_hi))
+    matches.sort()
+    return matches
+
+
+def line_opcodes(a: list[str], b: list[str]) -> list[tuple[str, int, int, int, int]]:
+    """Diff two lists of lines; same opcode format as ``SequenceMatcher.get_opcodes()``.
+
+    Lines are interned to integers and aligned with a histogram diff, which
+    stays close to linear on journal-sized inputs where difflib is quadratic.
+    """
+    ia, ib = _intern(a, b)
+    opcodes = []
+    i = j = 0
+    for mi, mj in _histogram_matches(ia, ib) + [(len(a), len(b))]:
+        if mi > i or mj > j:
+            tag = "replace" if mi > i and mj > j else ("delete" if mi > i else "insert")
+            opcodes.append((tag, i, mi, j, mj))
+        if mi < len(a):
+            if opcodes and opcodes[-1][0] == "equal":
+                _tag, i1, _i2, j1, _j2 = opcodes[-1]
+                opcodes[-1] = ("equal", i1, mi + 1, j1, mj + 1)
+            else:
+                opcodes.append(("equal", mi, mi + 1, mj, mj + 1))
+        i, j = mi + 1, mj + 1
+    return opcodes
+
+
 def apply_inline_diff(editor: QTextEdit, current_lines: list[str]) -> None:
     """Compute unified inline diff and apply highlights to the editor.
 
     Green background on added/changed lines; red strikethrough for deleted
     lines inserted inline.  ``current_lines`` are the *old* version's lines
     (plain text, already split by newline).
+
+    The document is walked once, block by block, and all changes are made
+    in a single edit block so that it is laid out once at the end.  The
+    highlights are not recorded in the undo stack.
     """
     doc = editor.document()
-    proposed_lines = editor.toPlainText().split("\n")
 
-    editor.blockSignals(True)
+    # Proposed lines, and the block each one belongs to (a <br> splits a block into several lines).
+    block_count = doc.blockCount()
+    texts = _BLOCK_BREAK.split(doc.toRawText())
+    if len(texts) != block_count:  # unusual frame layout: read the blocks one by one
+        texts = []
+        block = doc.begin()
+        while block.isValid():
+            texts.append(block.text())
+            block = block.next()
+    proposed_lines: list[str] = []
+    line_blocks: list[int] = []
+    for number, text in enumerate(texts):
+        lines = text.split(_LINE_SEPARATOR)
+        proposed_lines.extend(lines)
+        line_blocks.extend([number] * len(lines))
 
+    added: set[int] = set()  # block numbers to highlight
+    insertions: dict[int, list[str]] = {}  # block number -> deleted lines to insert before it
     if not current_lines:
-        # Everything is new
-        for idx in range(doc.blockCount()):
-            block = doc.findBlockByNumber(idx)
-            if block.isValid():
-                cursor = QTextCursor(block)
-                fmt = block.blockFormat()
-                fmt.setBackground(COLOR_ADDED)
-                cursor.setBlockFormat(fmt)
-        editor.moveCursor(QTextCursor.MoveOperation.Start)
-        editor.blockSignals(False)
-        return
-
-    cur_filt, cur_map = filtered(current_lines)
-    pro_filt, pro_map = filtered(proposed_lines)
-
-    matcher = difflib.SequenceMatcher(None, cur_filt, pro_filt, autojunk=False)
-    opcodes = matcher.get_opcodes()
-
-    # Pass 1 — green background on added / changed proposed blocks.
-    for tag, _i1, _i2, j1, j2 in opcodes:
-        if tag in ("insert", "replace"):
-            for k in range(j1, j2):
-                block = doc.findBlockByNumber(pro_map[k])
-                if block.isValid():
-                    cursor = QTextCursor(block)
-                    fmt = block.blockFormat()
-                    fmt.setBackground(COLOR_ADDED)
-                    cursor.setBlockFormat(fmt)
-
-    # Pass 2 — collect where deleted lines should be inserted.
-    insertions: list[tuple[int, list[str]]] = []
-    for tag, i1, i2, j1, _j2 in opcodes:
-        if tag in ("delete", "replace"):
-            del_texts = [current_lines[cur_map[k]] for k in range(i1, i2)]
-            if j1 < len(pro_map):
-                insert_before = pro_map[j1]
-            else:
-                insert_before = len(proposed_lines)
-            insertions.append((insert_before, del_texts))
+        added.update(range(block_count))  # everything is new
+    else:
+        cur_filt, cur_map = filtered(current_lines)
+        pro_filt, pro_map = filtered(proposed_lines)
+        for tag, i1, i2, j1, j2 in line_opcodes(cur_filt, pro_filt):
+            if tag in ("insert", "replace"):
+                added.update(line_blocks[pro_map[k]] for k in range(j1, j2))
+            if tag in ("delete", "replace"):
+                insert_before = line_blocks[pro_map[j1]] if j1 < len(pro_map) else block_count
+                insertions.setdefault(insert_before, []).extend(current_lines[cur_map[k]] for k in range(i1, i2))
 
-    # Pass 3 — insert deleted lines inline, bottom-to-top.
-    original_block_count = doc.blockCount()
     del_blk_fmt = QTextBlockFormat()
     del_blk_fmt.setBackground(COLOR_DELETED_BG)
     del_chr_fmt = QTextCharFormat()
     del_chr_fmt.setForeground(COLOR_DELETED_TEXT)
     del_chr_fmt.setFontStrikeOut(True)
 
-    for proposed_idx, del_lines in reversed(insertions):
-        if proposed_idx < original_block_count:
-            block = doc.findBlockByNumber(proposed_idx)
+    editor.blockSignals(True)
+    undo_enabled = doc.isUndoRedoEnabled()
+    doc.setUndoRedoEnabled(False)
+    cursor = QTextCursor(doc)
+    cursor.beginEditBlock()
+
+    block = doc.begin()
+    for number in range(block_count):
+        del_lines = insertions.get(number)
+        if del_lines:
             target_blk_fmt = block.blockFormat()
-            cursor = QTextCursor(block)
-            cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
+            cursor.setPosition(block.position())
             for line in del_lines:
+                # Split off an empty block above the current one and fill it with the deleted line
                 cursor.insertBlock(target_blk_fmt)
                 cursor.movePosition(QTextCursor.MoveOperation.PreviousBlock)
                 cursor.setBlockFormat(del_blk_fmt)
@@ -105,43 +260,68 @@ def apply_inline_diff(editor: QTextEdit, current_lines: list[str]) -> None:
                 cursor.insertText(line)
                 cursor.block().setUserState(DELETED_STATE)
                 cursor.movePosition(QTextCursor.MoveOperation.NextBlock)
-                cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
-        else:
-            cursor = QTextCursor(doc)
-            cursor.movePosition(QTextCursor.MoveOperation.End)
-            for line in del_lines:
-                cursor.insertBlock(del_blk_fmt, del_chr_fmt)
-                cursor.insertText(line)
-                cursor.block().setUserState(DELETED_STATE)
+            block = cursor.block()
+        if number in added:
+            fmt = block.blockFormat()
+            fmt.setBackground(COLOR_ADDED)
+            cursor.setPosition(block.position())
+            cursor.setBlockFormat(fmt)
+        block = block.next()
+
+    del_lines = insertions.get(block_count)
+    if del_lines:
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        for line in del_lines:
+            cursor.insertBlock(del_blk_fmt, del_chr_fmt)
+            cursor.insertText(line)
+            cursor.block().setUserState(DELETED_STATE)
 
+    cursor.endEditBlock()
+    doc.setUndoRedoEnabled(undo_enabled)
     editor.moveCursor(QTextCursor.MoveOperation.Start)
     editor.blockSignals(False)
 
 
 def extract_html_without_deleted(editor: QTextEdit) -> str:
-    """Return HTML from the editor with deleted-marked lines stripped and highlights cleared."""
-    doc = editor.document()
-    clean = QTextEdit()
-    clean_cursor = clean.textCursor()
-    first = True
+    """Return HTML from the editor with deleted-marked lines stripped and highlights cleared.
 
-    block = doc.begin()
+    Works on a copy of the editor's document, so the editor keeps its highlights.
+    """
+    doc = editor.document().clone()
+    doc.setUndoRedoEnabled(False)
+    cursor = QTextCursor(doc)
+    cursor.beginEditBlock()
+
+    # Bottom-up, so positions of the blocks still to visit do not move.
+    block = doc.lastBlock()
     while block.isValid():
-        if block.userState() != DELETED_STATE:
-            blk_fmt = QTextBlockFormat(block.blockFormat())
-            blk_fmt.clearBackground()
-            if first:
-                clean_cursor.setBlockFormat(blk_fmt)
-                first = False
+        previous = block.previous()
+        if block.userState() == DELETED_STATE:
+            following = block.next()
+            if following.isValid():
+                # Up to the start of the next block, which keeps its own format and state
+                cursor.setPosition(block.position())
+                cursor.setPosition(following.position(), QTextCursor.MoveMode.KeepAnchor)
+                cursor.removeSelectedText()
+            elif previous.isValid():
+                # Last block: remove it with the separator in front of it
+                state = previous.userState()
+                cursor.setPosition(previous.position() + previous.length() - 1)
+                cursor.setPosition(block.position() + block.length() - 1, QTextCursor.MoveMode.KeepAnchor)
+                cursor.removeSelectedText()
+                previous = cursor.block()
+                previous.setUserState(state)
             else:
-                clean_cursor.insertBlock(blk_fmt)
-            src = QTextCursor(block)
-            src.movePosition(
-                QTextCursor.MoveOperation.EndOfBlock,
-                QTextCursor.MoveMode.KeepAnchor,
-            )
-            if src.hasSelection():
-                clean_cursor.insertFragment(src.selection())
-        block = block.next()
+                cursor.select(QTextCursor.SelectionType.Document)
+                cursor.removeSelectedText()
+                cursor.setBlockFormat(QTextBlockFormat())
+                cursor.block().setUserState(-1)
+        elif block.blockFormat().hasProperty(QTextFormat.Property.BackgroundBrush):
+            blk_fmt = block.blockFormat()
+            blk_fmt.clearBackground()
+            cursor.setPosition(block.position())
+            cursor.setBlockFormat(blk_fmt)
+        block = previous
 
-    return clean.toHtml()
+    cursor.endEditBlock()
+    return doc.toHtml()
@@ -11,10 +11,12 @@ import time
 from PySide6.QtCore import QObject, QThread, QTimer, Signal
 
 from .i18n import tr
+from .journal_store import INDEX_NAME, JournalStore, merge_indexes
 from .utils import (
     active_campaign_dir,
     active_campaign_name,
     campaign_drive_config,
+    journal_dir,
     journal_path,
     quest_log_path,
     shared_config_path,
@@ -30,10 +32,27 @@ _APP_FOLDER_NAME = "DnD Logger"
 # Files to sync: local filename → Drive remote name
 SYNCABLE_FILES = {
     "quest_log.html": "quest_log.html",
-    "journal.html": "journal.html",
     "shared_config.json": "shared_config.json",
 }
 
+# Journal files (journal/<name>) are synced one by one as "journal_<name>":
+# the index plus the header and session fragments it lists.
+JOURNAL_PREFIX = "journal_"
+JOURNAL_INDEX = JOURNAL_PREFIX + INDEX_NAME
+# The single-file journal of earlier versions: never uploaded, only fetched to seed a
+# journal without sessions while Drive has no journal index yet.
+LEGACY_JOURNAL = "journal.html"
+
+
+def remote_name_for(cfg: dict, local_path: str) -> str | None:
+    """Return the Drive name of a campaign file, or None if it is not synced."""
+    folder, name = os.path.split(local_path)
+    if os.path.normcase(folder) == os.path.normcase(journal_dir(cfg)):
+        return JOURNAL_PREFIX + name if name == INDEX_NAME or name.endswith(".html") else None
+    if os.path.normcase(folder) == os.path.normcase(active_campaign_dir(cfg)):
+        return SYNCABLE_FILES.get(name)
+    return None
+
 
 class SyncStatus(enum.Enum):
     DISABLED = "disabled"
@@ -148,6 +167,33 @@ class DriveFileManager:
             f.write(content)
         return True
 
+    def list_files(self) -> dict[str, dict]:
+        """Metadata of every file in the campaign folder, keyed by name.
+
+        One request per 1000 files, instead of one per file.
+        """
+        query = f"'{self._folder_id}' in parents and trashed = false"
+        files, page_token = {}, None
+        with self._lock:
+            while True:
+                results = (
+                    self._service.files()
+                    .list(
+                        q=query,
+                        spaces="drive",
+                        fields="nextPageToken, files(id, name, modifiedTime, md5Checksum)",
+                        pageSize=1000,
+                        pageToken=page_token,
+                    )
+                    .execute()
+                )
+                for meta in results.get("files", []):
+                    files.setdefault(meta["name"], meta)
+                    self._file_id_cache.setdefault(meta["name"], meta["id"])
+                page_token = results.get("nextPageToken")
+                if not page_token:
+                    return files
+
     def get_remote_metadata(self, remote_name: str) -> dict | None:
         """Get modifiedTime and md5Checksum without downloading."""
         with self._lock:
@@ -250,13 +296,11 @@ class _PollWorker(QObject):
         self._filenames = filenames
 
     def run(self):
-        """Poll remote metadata for all synced files."""
+        """Poll remote metadata for all synced files with one folder listing."""
         try:
-            results = {}
-            for name in self._filenames:
-                log.debug("Checking remote metadata for: %s", name)
-                results[name] = self._file_mgr.get_remote_metadata(name)
-                log.debug("  -> %s", "found" if results[name] else "not found")
+            remote = self._file_mgr.list_files()
+            results = {name: remote.get(name) for name in self._filenames}
+            log.debug("Remote metadata: %s", {k: ("found" if v else "not found") for k, v in results.items()})
             self.finished.emit(results)
         except Exception as e:
             log.exception("Poll worker error: %s", e)
@@ -307,6 +351,7 @@ class DriveSyncEngine(QObject):
         self._poll_timer = QTimer(self)
         self._poll_timer.timeout.connect(self._poll_remote)
         self._upload_timers: dict[str, QTimer] = {}
+        self._downloading: set[str] = set()  # remote names being downloaded
         self._active_threads: list[tuple[QThread, QObject]] = []  # (thread, worker) prevent GC
 
     @property
@@ -327,8 +372,10 @@ class DriveSyncEngine(QObject):
         """Map a remote filename to its local path."""
         if remote_name == "quest_log.html":
             return quest_log_path(self._config)
-        elif remote_name == "journal.html":
+        elif remote_name == LEGACY_JOURNAL:
             return journal_path(self._config)
+        elif remote_name.startswith(JOURNAL_PREFIX):
+            return os.path.join(journal_dir(self._config), remote_name[len(JOURNAL_PREFIX) :])
         elif remote_name == "shared_config.json":
             return shared_config_path(self._config)
         return os.path.join(active_campaign_dir(self._config), remote_name)
@@ -455,7 +502,7 @@ class DriveSyncEngine(QObject):
             return
 
         log.info("Polling remote files...")
-        filenames = list(SYNCABLE_FILES.values())
+        filenames = self._synced_names()
         thread = QThread()
         worker = _PollWorker(self._file_mgr, filenames)
         worker.moveToThread(thread)
@@ -469,9 +516,39 @@ class DriveSyncEngine(QObject):
         self._active_threads.append(entry)
         thread.start()
 
+    def _synced_names(self) -> list[str]:
+        """Remote names to poll: the fixed files, the journal index, the journal files it lists and the legacy journal.
+
+        Only the index is read: migrating a legacy journal is left to the journal editor.
+        """
+        journal = JournalStore.load(journal_dir(self._config))
+        names = list(SYNCABLE_FILES.values()) + [JOURNAL_INDEX, LEGACY_JOURNAL]
+        return names + [JOURNAL_PREFIX + os.path.basename(path) for path in journal.files()] if journal else names
+
+    def _needs_legacy_journal(self, results: dict) -> bool:
+        """True if the journal should be seeded from the remote legacy journal.
+
+        That is while Drive has no journal index, only an earlier version's
+        ``journal.html``, and the local journal has no session: a fresh
+        install, or the first device to upgrade.
+        """
+        legacy_meta = results.get(LEGACY_JOURNAL)
+        if results.get(JOURNAL_INDEX) is not None or legacy_meta is None:
+            return False
+        journal = JournalStore.load(journal_dir(self._config))
+        if journal is not None and journal.sessions:
+            return False
+        return self._sync_state.get(LEGACY_JOURNAL, {}).get("remote_md5") != legacy_meta.get("md5Checksum")
+
     def _on_poll_done(self, results: dict):
         log.info("Poll done: %s", {k: ("exists" if v else "missing") for k, v in results.items()})
 
+        if self._needs_legacy_journal(results):
+            # Don't upload the empty journal over it; the editor splits the download into fragments.
+            results = {k: v for k, v in results.items() if not k.startswith(JOURNAL_PREFIX)}
+            self._start_download(LEGACY_JOURNAL)
+        results.pop(LEGACY_JOURNAL, None)
+
         for remote_name, remote_meta in results.items():
             if remote_meta is None:
                 # File doesn't exist on Drive yet — upload if local copy exists
@@ -535,6 +612,9 @@ class DriveSyncEngine(QObject):
 
     def _start_download(self, remote_name: str):
         """Download a remote file in a worker thread."""
+        if remote_name in self._downloading:
+            return
+        self._downloading.add(remote_name)
         local_path = self._local_path_for(remote_name)
         self._set_status(SyncStatus.SYNCING)
 
@@ -552,6 +632,7 @@ class DriveSyncEngine(QObject):
         thread.start()
 
     def _on_download_done(self, remote_name: str):
+        self._downloading.discard(remote_name)
         local_path = self._local_path_for(remote_name)
         remote_meta = self._file_mgr.get_remote_metadata(remote_name)
         self._sync_state[remote_name] = {
@@ -564,8 +645,11 @@ class DriveSyncEngine(QObject):
         log.info("Downloaded %s from Drive", remote_name)
 
         self.remote_file_updated.emit(remote_name)
+        if remote_name == JOURNAL_INDEX:
+            QTimer.singleShot(0, self._poll_remote)  # fetch the sessions the new index lists
 
     def _on_download_error(self, remote_name: str, error: str):
+        self._downloading.discard(remote_name)
         log.error("Download failed for %s: %s", remote_name, error)
         self.error_occurred.emit(tr("drive.error.download", filename=remote_name, error=error))
 
@@ -600,6 +684,12 @@ class DriveSyncEngine(QObject):
                 remote_content = f.read()
             os.remove(temp_path)
 
+            if remote_name == JOURNAL_INDEX:
+                # Both sides added or changed sessions: keep all of them, conflicts
+                # within a session surface on that session's own file.
+                self.resolve_conflict(remote_name, merge_indexes(local_content, remote_content))
+                QTimer.singleShot(0, self._poll_remote)
+                return
             self._set_status(SyncStatus.CONFLICT)
             self.conflict_detected.emit(remote_name, local_content, remote_content)
         except Exception as e:
@@ -0,0 +1,389 @@
+"""FLAC seek index and frame-level slicing (no decode / re-encode)."""
+
+import bisect
+import json
+import os
+
+_MAGIC = b"fLaC"
+_SYNC = b"\xff\xf8"  # 14-bit frame sync + reserved bit + fixed-blocksize strategy
+_MAX_HEADER_LEN = 16  # longest possible frame header, CRC-8 included
+_SCAN_BLOCK = 1 << 20  # bytes read per scan step
+_INDEX_SUFFIX = ".seek.json"
+_INDEX_INTERVAL_SECONDS = 1.0  # audio time between two seek index entries
+
+
+def _make_crc8_table() -> list[int]:
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return table
+
+
+def _make_crc16_table() -> list[int]:
+    table = []
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x8005) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+        table.append(crc)
+    return table
+
+
+_CRC8 = _make_crc8_table()
+_CRC16 = _make_crc16_table()
+_zero_shift_tables: list[tuple[list[int], list[int]]] = []
+
+
+def _crc8(buf, start: int, end: int) -> int:
+    crc = 0
+    for i in range(start, end):
+        crc = _CRC8[crc ^ buf[i]]
+    return crc
+
+
+def _crc16(buf) -> int:
+    crc = 0
+    for b in buf:
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC16[(crc >> 8) ^ b]
+    return crc
+
+
+def _crc16_shift(crc: int, length: int) -> int:
+    """Advance a CRC-16 state over *length* zero bytes in O(log length).
+
+    FLAC's CRC-16 has no init or final XOR, so it is linear:
+    ``crc(X + R) == shift(crc(X), len(R)) ^ crc(R)``.  This lets a frame
+    footer be patched after rewriting its header without touching the
+    (much larger) subframe payload.
+    """
+    if not _zero_shift_tables:
+        # Level k maps a state through 2**k zero bytes, split into hi/lo byte tables
+        def one_zero(state):
+            return ((state << 8) & 0xFFFF) ^ _CRC16[state >> 8]
+
+        step = one_zero
+        for _ in range(24):
+            hi = [step(v << 8) for v in range(256)]
+            lo = [step(v) for v in range(256)]
+            _zero_shift_tables.append((hi, lo))
+
+            def step(state, hi=hi, lo=lo):
+                state = hi[state >> 8] ^ lo[state & 0xFF]
+                return hi[state >> 8] ^ lo[state & 0xFF]
+
+    level = 0
+    while length:
+        if length & 1:
+            hi, lo = _zero_shift_tables[level]
+            crc = hi[crc >> 8] ^ lo[crc & 0xFF]
+        length >>= 1
+        level += 1
+    return crc
+
+
+def _utf8_code(value: int) -> bytes:
+    """Encode a frame number with FLAC's UTF-8 style variable-length coding."""
+    if value < 0x80:
+        return bytes([value])
+    for extra, limit, lead in (
+        (1, 0x800, 0xC0),
+        (2, 0x10000, 0xE0),
+        (3, 0x200000, 0xF0),
+        (4, 0x4000000, 0xF8),
+        (5, 0x80000000, 0xFC),
+    ):
+        if value < limit:
+            tail = [0x80 | ((value >> (6 * i)) & 0x3F) for i in range(extra - 1, -1, -1)]
+            return bytes([lead | (value >> (6 * extra))] + tail)
+    raise ValueError(f"Frame number out of range: {value}")
+
+
+def _read_stream_header(f) -> dict | None:
+    """Parse the FLAC signature and metadata blocks.
+
+    Returns a dict with the raw STREAMINFO bytes, decoded stream parameters
+    and the byte offset of the first audio frame, or None if *f* is not a
+    FLAC stream.
+    """
+    if f.read(4) != _MAGIC:
+        return None
+    streaminfo = None
+    while True:
+        header = f.read(4)
+        if len(header) < 4:
+            return None
+        is_last = bool(header[0] & 0x80)
+        block_type = header[0] & 0x7F
+        length = int.from_bytes(header[1:4], "big")
+        body = f.read(length)
+        if len(body) < length:
+            return None
+        if block_type == 0:
+            streaminfo = body
+        if is_last:
+            break
+    if streaminfo is None or len(streaminfo) < 34:
+        return None
+    packed = int.from_bytes(streaminfo[10:18], "big")
+    return {
+        "streaminfo": streaminfo,
+        "audio_offset": f.tell(),
+        "min_blocksize": int.from_bytes(streaminfo[0:2], "big"),
+        "max_blocksize": int.from_bytes(streaminfo[2:4], "big"),
+        "min_framesize": int.from_bytes(streaminfo[4:7], "big"),
+        "sample_rate": packed >> 44,
+        "total_samples": packed & ((1 << 36) - 1),
+    }
+
+
+def _parse_frame_header(buf, j: int) -> tuple[int, int, int] | None:
+    """Validate a fixed-blocksize frame header at buf[j].
+
+    Returns ``(frame_number, number_end, header_len)`` where *number_end* is
+    the offset (relative to *j*) just past the coded frame number and
+    *header_len* includes the trailing CRC-8 byte, or None if invalid.
+    """
+    n = len(buf)
+    if j + 5 > n:
+        return None
+    bs_code = buf[j + 2] >> 4
+    sr_code = buf[j + 2] & 0x0F
+    b3 = buf[j + 3]
+    if bs_code == 0 or sr_code == 0x0F:
+        return None
+    if (b3 >> 4) > 10 or ((b3 >> 1) & 0x07) == 3 or b3 & 0x01:
+        return None
+
+    # UTF-8 style coded frame number
+    k = j + 4
+    first = buf[k]
+    if first < 0x80:
+        value, extra = first, 0
+    elif first & 0xE0 == 0xC0:
+        value, extra = first & 0x1F, 1
+    elif first & 0xF0 == 0xE0:
+        value, extra = first & 0x0F, 2
+    elif first & 0xF8 == 0xF0:
+        value, extra = first & 0x07, 3
+    elif first & 0xFC == 0xF8:
+        value, extra = first & 0x03, 4
+    elif first & 0xFE == 0xFC:
+        value, extra = first & 0x01, 5
+    else:
+        return None
+    if k + 1 + extra > n:
+        return None
+    for b in buf[k + 1 : k + 1 + extra]:
+        if b & 0xC0 != 0x80:
+            return None
+        value = (value << 6) | (b & 0x3F)
+    k += 1 + extra
+    number_end = k - j
+
+    # Optional blocksize / sample rate fields
+    if bs_code == 6:
+        k += 1
+    elif bs_code == 7:
+        k += 2
+    if sr_code == 12:
+        k += 1
+    elif sr_code in (13, 14):
+        k += 2
+    if k >= n or _crc8(buf, j, k) != buf[k]:
+        return None
+    return value, number_end, k + 1 - j
+
+
+def build_seek_index(path: str, interval_seconds: float = _INDEX_INTERVAL_SECONDS) -> dict | None:
+    """Scan the frame headers of a FLAC file and return a sparse seek index.
+
+    The index holds one ``[first_sample, byte_offset]`` entry per
+    *interval_seconds* of audio, aligned to frame boundaries.  Only
+    fixed-blocksize streams (what libFLAC/libsndfile write) are supported;
+    returns None for anything else.
+    """
+    with open(path, "rb") as f:
+        info = _read_stream_header(f)
+        if info is None or info["min_blocksize"] != info["max_blocksize"]:
+            return None
+        blocksize = info["max_blocksize"]
+        step = max(1, int(interval_seconds * info["sample_rate"] / blocksize))
+        skip = max(2, info["min_framesize"])
+
+        entries: list[list[int]] = []
+        expected = 0
+        buf = bytearray()
+        buf_start = info["audio_offset"]
+        i = 0
+        eof = False
+        while True:
+            j = buf.find(_SYNC, i)
+            if not eof and (j < 0 or len(buf) - j < _MAX_HEADER_LEN):
+                keep = j if j >= 0 else max(min(i, len(buf)), len(buf) - 1)
+                del buf[:keep]
+                buf_start += keep
+                i = max(0, i - keep)
+                data = f.read(_SCAN_BLOCK)
+                if not data:
+                    eof = True
+                buf += data
+                continue
+            if j < 0:
+                break
+            header = _parse_frame_header(buf, j)
+            number = header[0] if header else None
+            if number == expected:
+                if number % step == 0:
+                    entries.append([number * blocksize, buf_start + j])
+                expected += 1
+                i = j + skip
+            else:
+                i = j + 1
+
+    if not entries:
+        return None
+    total = info["total_samples"] or expected * blocksize
+    st = os.stat(path)
+    return {
+        "file_size": st.st_size,
+        "mtime": st.st_mtime,
+        "sample_rate": info["sample_rate"],
+        "blocksize": blocksize,
+        "total_samples": total,
+        "entries": entries,
+    }
+
+
+def load_or_build_seek_index(path: str) -> dict | None:
+    """Return the cached seek index for *path*, rebuilding it if stale or missing."""
+    index_path = path + _INDEX_SUFFIX
+    st = os.stat(path)
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("file_size") == st.st_size and index.get("mtime") == st.st_mtime:
+                return index
+        except (json.JSONDecodeError, OSError):
+            pass
+    index = build_seek_index(path)
+    if index is not None:
+        try:
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+        except OSError:
+            pass
+    return index
+
+
+def snap_to_frame(index: dict, sample: int) -> tuple[int, int]:
+    """Return ``(sample, byte_offset)`` of the last index entry at or before *sample*.
+
+    A sample at or past the end of the stream maps to the end of the file.
+    """
+    if sample >= index["total_samples"]:
+        return index["total_samples"], index["file_size"]
+    entries = index["entries"]
+    pos = bisect.bisect_right(entries, [sample, float("inf")]) - 1
+    first_sample, offset = entries[max(pos, 0)]
+    return first_sample, offset
+
+
+def _locate_frame(f, index: dict, sample: int) -> tuple[int, int]:
+    """Return ``(sample, byte_offset)`` of the frame starting at or before *sample*.
+
+    Starts from the nearest seek index entry and walks the few frames up to
+    the next entry, so cuts land on exact frame boundaries rather than on
+    index entries.
+    """
+    entry_sample, offset = snap_to_frame(index, sample)
+    blocksize = index["blocksize"]
+    first_number = entry_sample // blocksize
+    target = sample // blocksize
+    if entry_sample >= index["total_samples"] or target == first_number:
+        return entry_sample, offset
+
+    entries = index["entries"]
+    pos = bisect.bisect_right(entries, [entry_sample, float("inf")])
+    next_offset = entries[pos][1] if pos < len(entries) else index["file_size"]
+    f.seek(offset)
+    region = f.read(next_offset - offset)
+    for rel, (number, _number_end, _header_len) in _iter_frames(region, first_number, 2):
+        if number == target:
+            return number * blocksize, offset + rel
+    return entry_sample, offset
+
+
+def _iter_frames(region, first_number: int, skip: int):
+    """Yield ``(offset, parsed_header)`` for consecutive frames inside *region*."""
+    expected = first_number
+    i = 0
+    while True:
+        j = region.find(_SYNC, i)
+        if j < 0:
+            return
+        header = _parse_frame_header(region, j)
+        if header and header[0] == expected:
+            yield j, header
+            expected += 1
+            i = j + skip
+        else:
+            i = j + 1
+
+
+def write_slice(path: str, index: dict, start_sample: int, end_sample: int, out_path: str) -> tuple[int, int]:
+    """Copy the frames covering [start_sample, end_sample) into a standalone FLAC file.
+
+    Both bounds are snapped down to frame boundaries.  Subframe payloads
+    are copied byte for byte behind a fresh STREAMINFO header; only each
+    frame header is rewritten so numbering restarts at zero (decoders seek
+    by frame number), with the CRC-8 recomputed and the CRC-16 footer
+    patched.  Nothing is decoded or re-encoded.  Returns the actual
+    ``(start, end)`` samples.
+    """
+    with open(path, "rb") as src:
+        info = _read_stream_header(src)
+        if info is None:
+            raise ValueError(f"Not a FLAC file: {path}")
+        start, start_off = _locate_frame(src, index, start_sample)
+        end, end_off = _locate_frame(src, index, end_sample)
+        first_number = start // index["blocksize"]
+        streaminfo = bytearray(info["streaminfo"][:34])
+        # Patch total samples (low 36 bits of bytes 10-17) and clear the MD5
+        packed = int.from_bytes(streaminfo[10:18], "big")
+        packed = (packed & ~((1 << 36) - 1)) | (end - start)
+        streaminfo[10:18] = packed.to_bytes(8, "big")
+        streaminfo[18:34] = bytes(16)
+
+        src.seek(start_off)
+        region = src.read(end_off - start_off)
+
+    skip = max(2, info["min_framesize"])
+    with open(out_path, "wb") as dst:
+        dst.write(_MAGIC)
+        dst.write(bytes([0x80]) + len(streaminfo).to_bytes(3, "big"))
+        dst.write(streaminfo)
+        if first_number == 0:
+            dst.write(region)
+            return start, end
+
+        frames = list(_iter_frames(region, first_number, skip))
+        for idx, (offset, (number, number_end, header_len)) in enumerate(frames):
+            frame_end = frames[idx + 1][0] if idx + 1 < len(frames) else len(region)
+            old_header = region[offset : offset + header_len]
+            new_header = bytearray(old_header[:4])
+            new_header += _utf8_code(number - first_number)
+            new_header += old_header[number_end : header_len - 1]
+            new_header.append(_crc8(new_header, 0, len(new_header)))
+
+            body_len = frame_end - offset - header_len - 2
+            footer = int.from_bytes(region[frame_end - 2 : frame_end], "big")
+            footer ^= _crc16_shift(_crc16(old_header) ^ _crc16(new_header), body_len)
+
+            dst.write(new_header)
+            dst.write(region[offset + header_len : frame_end - 2])
+            dst.write(footer.to_bytes(2, "big"))
+    return start, end
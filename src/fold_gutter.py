@@ -1,5 +1,7 @@
 """FoldGutterWidget — painted gutter with fold triangle indicators."""
 
+import bisect
+
 from PySide6.QtCore import QEvent, QPoint, Qt
 from PySide6.QtGui import QBrush, QColor, QPainter, QPen, QPolygon
 from PySide6.QtWidgets import QTextEdit, QWidget
@@ -9,6 +11,10 @@ from .i18n import tr
 
 GUTTER_WIDTH = 20
 
+# Triangles centred on y = 0, translated to each region's row when painted
+_TRIANGLE_FOLDED = QPolygon([QPoint(6, -5), QPoint(6, 5), QPoint(14, 0)])  # ▶
+_TRIANGLE_EXPANDED = QPolygon([QPoint(5, -4), QPoint(15, -4), QPoint(10, 4)])  # ▼
+
 
 class FoldGutterWidget(QWidget):
     """Narrow gutter drawn in the QTextEdit viewport margin.
@@ -23,6 +29,10 @@ class FoldGutterWidget(QWidget):
         self._editor = editor
         self._fold_mgr = fold_manager
         self._hovered_block: int | None = None
+        # Layout rows of the regions whose start block is visible, ordered by y
+        self._rows_regions: dict | None = None  # regions() dict the rows were built from
+        self._row_tops: list[float] = []
+        self._rows: list[tuple[float, float, int]] = []  # (top, height, start block)
 
         self.setMouseTracking(True)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -31,6 +41,8 @@ class FoldGutterWidget(QWidget):
         self._editor.verticalScrollBar().valueChanged.connect(self.update)
         self._editor.document().documentLayout().documentSizeChanged.connect(self._on_layout_changed)
         self._editor.document().contentsChanged.connect(self.update)
+        self._editor.document().documentLayout().update.connect(self._invalidate_rows)
+        self._fold_mgr.visibility_changed.connect(self._invalidate_rows)
 
         # Track editor resize to reposition gutter
         self._editor.installEventFilter(self)
@@ -53,10 +65,45 @@ class FoldGutterWidget(QWidget):
 
         return QSize(GUTTER_WIDTH, 0)
 
+    # ── Region rows ───────────────────────────────────────
+
+    def _invalidate_rows(self, *_args):
+        self._rows_regions = None
+
+    def _visible_rows(self) -> list[tuple[int, int, int]]:
+        """Return ``(y, height, start block)`` of the regions intersecting the gutter, in viewport pixels.
+
+        Rows are rebuilt only after the regions, fold visibility or layout
+        change; each call then bisects to the scroll offset and touches only
+        the rows on screen.
+        """
+        regions = self._fold_mgr.regions()
+        if regions is not self._rows_regions:
+            doc = self._editor.document()
+            layout = doc.documentLayout()
+            rows = []
+            for start in sorted(regions):
+                block = doc.findBlockByNumber(start)
+                if block.isValid() and block.isVisible():
+                    rect = layout.blockBoundingRect(block)
+                    rows.append((rect.top(), rect.height(), start))
+            self._rows, self._row_tops, self._rows_regions = rows, [row[0] for row in rows], regions
+
+        offset_y = self._editor.verticalScrollBar().value()
+        viewport_bottom = self.height()
+        visible = []
+        for top, height, start in self._rows[max(bisect.bisect_right(self._row_tops, offset_y) - 1, 0) :]:
+            y = int(top - offset_y)
+            if y > viewport_bottom:
+                break
+            if y + int(height) >= 0:
+                visible.append((y, int(height), start))
+        return visible
+
     # ── Painting ──────────────────────────────────────────
 
     def paintEvent(self, event):
-        """Paint fold indicator triangles for each foldable region."""
+        """Paint fold indicator triangles for the regions in view."""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
@@ -64,57 +111,17 @@ class FoldGutterWidget(QWidget):
         painter.fillRect(event.rect(), QColor("#0d0d1e"))
 
         regions = self._fold_mgr.regions()
-        if not regions:
-            painter.end()
-            return
-
-        layout = self._editor.document().documentLayout()
-        offset_y = self._editor.verticalScrollBar().value()
-        viewport_top = 0
-        viewport_bottom = self.height()
-
         gold = QColor("#c9a832")
         frost = QColor("#6ab4d4")
 
-        for start_block, region in regions.items():
-            block = self._editor.document().findBlockByNumber(start_block)
-            if not block.isValid() or not block.isVisible():
-                continue
-
-            block_rect = layout.blockBoundingRect(block)
-            y = int(block_rect.top() - offset_y)
-
-            if y > viewport_bottom or y + int(block_rect.height()) < viewport_top:
-                continue
-
+        for y, height, start_block in self._visible_rows():
             # Center the triangle vertically in the block
-            cy = y + int(block_rect.height()) / 2
-            is_hovered = self._hovered_block == start_block
-            color = frost if is_hovered else gold
-
+            cy = int(y + height / 2)
+            color = frost if self._hovered_block == start_block else gold
             painter.setPen(QPen(color))
             painter.setBrush(QBrush(color))
-
-            if region.is_folded:
-                # Right-pointing triangle ▶
-                tri = QPolygon(
-                    [
-                        QPoint(6, int(cy) - 5),
-                        QPoint(6, int(cy) + 5),
-                        QPoint(14, int(cy)),
-                    ]
-                )
-            else:
-                # Down-pointing triangle ▼
-                tri = QPolygon(
-                    [
-                        QPoint(5, int(cy) - 4),
-                        QPoint(15, int(cy) - 4),
-                        QPoint(10, int(cy) + 4),
-                    ]
-                )
-
-            painter.drawPolygon(tri)
+            triangle = _TRIANGLE_FOLDED if regions[start_block].is_folded else _TRIANGLE_EXPANDED
+            painter.drawPolygon(triangle.translated(0, cy))
 
         painter.end()
 
@@ -165,23 +172,12 @@ class FoldGutterWidget(QWidget):
         return super().event(event)
 
     def _block_at_y(self, y: int) -> int | None:
-        """Return the block number at pixel y in the gutter, or None."""
-        layout = self._editor.document().documentLayout()
-        offset_y = self._editor.verticalScrollBar().value()
-
-        block = self._editor.document().begin()
-        while block.isValid():
-            if not block.isVisible():
-                block = block.next()
-                continue
-            rect = layout.blockBoundingRect(block)
-            block_y = int(rect.top() - offset_y)
-            block_h = int(rect.height())
+        """Return the start block of the fold region at pixel y in the gutter, or None."""
+        for block_y, block_h, start in self._visible_rows():
             if block_y <= y <= block_y + block_h:
-                return block.blockNumber()
+                return start
             if block_y > y:
                 break
-            block = block.next()
         return None
 
     def eventFilter(self, obj, event):
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass
 
-from PySide6.QtCore import QObject
+from PySide6.QtCore import QObject, Signal
 from PySide6.QtGui import QTextDocument
 
 
@@ -26,12 +26,7 @@ class FoldManager(QObject):
         Returns heading level (1-3) or 0 for non-heading blocks.
     """
 
-    # Heading levels that terminate a region at each level
-    _TERMINATORS = {
-        1: {1},
-        2: {1, 2},
-        3: {1, 2, 3},
-    }
+    visibility_changed = Signal()  # blocks were hidden or shown
 
     def __init__(
         self,
@@ -47,19 +42,23 @@ class FoldManager(QObject):
         self._foldable_headings = foldable_heading_levels if foldable_heading_levels is not None else {1, 2, 3}
         self._fold_by_default = fold_by_default
         self._regions: dict[int, FoldRegion] = {}
-        self._dirty = True
-        self._doc.contentsChanged.connect(self._mark_dirty)
+        # Per-block structure, kept in step with the document by _on_contents_change
+        self._levels: list[int] = []  # heading level of each block, 0 for non-headings
+        self._indents: list[int] = []  # list indent of each block, -1 outside lists
+        self._pending: list[tuple[int, int]] = []  # block ranges whose visibility must be re-synced
+        self._applying_visibility = False
+        self._doc.documentLayout()  # contentsChange is only emitted once the document has a layout
+        self._doc.contentsChange.connect(self._on_contents_change)
         self._scan_document()
-
-    def _mark_dirty(self):
-        self._dirty = True
+        self._ensure_fresh()
 
     def _ensure_fresh(self):
-        if self._dirty:
-            self._scan_document()
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self._sync_visibility(pending)
 
     def regions(self) -> dict[int, FoldRegion]:
-        """Return the current fold regions, rescanning the document if needed.
+        """Return the current fold regions.
 
         Returns:
             Mapping of start-block numbers to their FoldRegion objects.
@@ -67,73 +66,121 @@ class FoldManager(QObject):
         self._ensure_fresh()
         return self._regions
 
+    # ── Scanning ──────────────────────────────────────────
+
     def _scan_document(self):
-        """Rebuild fold regions from the document, preserving existing fold state."""
-        old_folded = {start: r.is_folded for start, r in self._regions.items()}
-        new_regions: dict[int, FoldRegion] = {}
+        """Detect every block and rebuild fold regions, preserving existing fold state."""
+        self._levels, self._indents = self._detect_blocks(0, self._doc.blockCount() - 1)
+        self._build_regions({start: r.is_folded for start, r in self._regions.items()})
+        self._pending = [(0, len(self._levels) - 1)]
 
-        # --- Heading regions ---
-        heading_blocks: list[tuple[int, int]] = []  # (block_number, level)
-        block = self._doc.begin()
-        while block.isValid():
-            level = self._detect_heading(block)
-            if level > 0:
-                heading_blocks.append((block.blockNumber(), level))
+    def _detect_blocks(self, first: int, last: int) -> tuple[list[int], list[int]]:
+        """Return the heading levels and list indents of blocks *first* to *last*."""
+        levels, indents = [], []
+        block = self._doc.findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            levels.append(self._detect_heading(block))
+            text_list = block.textList()
+            indents.append(text_list.format().indent() if text_list else -1)
             block = block.next()
+        return levels, indents
+
+    def _on_contents_change(self, pos: int, removed: int, added: int):
+        """Re-detect the blocks touched by an edit; rebuild regions only if the structure changed.
+
+        Typing inside a block leaves headings and lists alone and costs one
+        block.  Edits that add or remove blocks or change a heading or list
+        shift the known fold states past the edit and rebuild the regions
+        from the per-block structure, without walking the document.
+        """
+        if self._applying_visibility:
+            return
+        count = self._doc.blockCount()
+        delta = count - len(self._levels)
+        first = self._doc.findBlock(pos).blockNumber()
+        end_block = self._doc.findBlock(pos + added)
+        last = end_block.blockNumber() if end_block.isValid() else count - 1
+        # Indents change for a whole list at once: re-read the lists around the edit too
+        while first > 0 and self._indents[first - 1] >= 0:
+            first -= 1
+        while last + 1 < count and 0 <= last + 1 - delta < len(self._indents) and self._indents[last + 1 - delta] >= 0:
+            last += 1
+        old_last = last - delta
+        if first < 0 or old_last < first or old_last >= len(self._levels):
+            self._scan_document()  # out of step with the document; start over
+            return
+
+        levels, indents = self._detect_blocks(first, last)
+        if delta == 0 and levels == self._levels[first : last + 1] and indents == self._indents[first : last + 1]:
+            return
+        self._levels[first : old_last + 1] = levels
+        self._indents[first : old_last + 1] = indents
+
+        def shift(n: int) -> int:
+            return n + delta if n > old_last else n
+
+        def shift_range(a: int, b: int) -> tuple[int, int]:
+            if b < first:
+                return a, b
+            if a > old_last:
+                return a + delta, b + delta
+            return min(a, first), max(b + delta, last)  # overlaps the edit: cover all of it
+
+        # Hidden block ranges before (in new numbering) and after: re-sync wherever they differ
+        old_hidden = {shift_range(r.start + 1, r.end) for r in self._regions.values() if r.is_folded}
+        self._build_regions({shift(start): r.is_folded for start, r in self._regions.items()})
+        new_hidden = {(r.start + 1, r.end) for r in self._regions.values() if r.is_folded}
+        pending = [(first, last)] + [shift_range(a, b) for a, b in self._pending]
+        pending.extend(old_hidden ^ new_hidden)
+        self._pending = [(a, min(b, count - 1)) for a, b in pending if a <= b]
+
+    def _build_regions(self, old_folded: dict[int, bool]):
+        """Rebuild fold regions from the per-block structure."""
+        count = len(self._levels)
+        new_regions: dict[int, FoldRegion] = {}
+
+        def add(start: int, end: int, level: int):
+            if end > start:
+                is_folded = old_folded.get(start, self._fold_by_default)
+                new_regions[start] = FoldRegion(start=start, end=end, level=level, is_folded=is_folded)
 
-        for i, (bnum, level) in enumerate(heading_blocks):
-            if level not in self._foldable_headings:
+        # --- Heading regions: a heading ends before the next one of the same or a higher level ---
+        stack: list[tuple[int, int]] = []  # open (block, level), levels strictly increasing
+        for bnum, level in enumerate(self._levels):
+            if not level:
                 continue
-            terminators = self._TERMINATORS[level]
-            end_block = self._doc.blockCount() - 1  # default: end of doc
-            for j in range(i + 1, len(heading_blocks)):
-                next_bnum, next_level = heading_blocks[j]
-                if next_level in terminators:
-                    end_block = next_bnum - 1
-                    break
-            if end_block > bnum:
-                is_folded = old_folded.get(bnum, self._fold_by_default)
-                new_regions[bnum] = FoldRegion(
-                    start=bnum,
-                    end=end_block,
-                    level=level,
-                    is_folded=is_folded,
-                )
-
-        # --- Bullet list parent regions ---
-        block = self._doc.begin()
-        while block.isValid():
-            bnum = block.blockNumber()
-            text_list = block.textList()
-            if text_list and bnum not in new_regions:
-                indent = text_list.format().indent()
-                # Scan forward for children with higher indent
-                child = block.next()
-                last_child = bnum
-                while child.isValid():
-                    cl = child.textList()
-                    if cl and cl.format().indent() > indent:
-                        last_child = child.blockNumber()
-                    else:
-                        break
-                    child = child.next()
-                if last_child > bnum:
-                    is_folded = old_folded.get(bnum, self._fold_by_default)
-                    new_regions[bnum] = FoldRegion(
-                        start=bnum,
-                        end=last_child,
-                        level=10 + indent,
-                        is_folded=is_folded,
-                    )
-            block = block.next()
+            while stack and stack[-1][1] >= level:
+                start, open_level = stack.pop()
+                if open_level in self._foldable_headings:
+                    add(start, bnum - 1, open_level)
+            stack.append((bnum, level))
+        for start, open_level in stack:
+            if open_level in self._foldable_headings:
+                add(start, count - 1, open_level)
 
-        self._regions = new_regions
-        self._dirty = False
+        # --- Bullet list parent regions: an item ends before the next one not indented deeper ---
+        headings = set(new_regions)
+        stack = []  # open (block, indent), indents strictly increasing
+        previous = -2
+        for bnum, indent in enumerate(self._indents):
+            if indent < 0:
+                continue
+            if bnum != previous + 1:  # a non-list block closes every open item
+                while stack:
+                    start, open_indent = stack.pop()
+                    if start not in headings:
+                        add(start, previous, 10 + open_indent)
+            while stack and stack[-1][1] >= indent:
+                start, open_indent = stack.pop()
+                if start not in headings:
+                    add(start, bnum - 1, 10 + open_indent)
+            stack.append((bnum, indent))
+            previous = bnum
+        for start, open_indent in stack:
+            if start not in headings:
+                add(start, previous, 10 + open_indent)
 
-        # Re-apply visibility for any regions that were folded
-        for r in self._regions.values():
-            if r.is_folded:
-                self._set_block_visibility(r.start + 1, r.end, visible=False)
+        self._regions = dict(sorted(new_regions.items()))
 
     def toggle_fold(self, block_num: int):
         """Toggle the fold state for the region starting at block_num."""
@@ -141,50 +188,36 @@ class FoldManager(QObject):
         region = self._regions.get(block_num)
         if region is None:
             return
-        region.is_folded = not region.is_folded
-        self._set_block_visibility(region.start + 1, region.end, visible=not region.is_folded)
+        self._set_folded([region], not region.is_folded)
 
     def fold_at(self, block_num: int):
         """Fold the region at block_num (no-op if already folded)."""
         self._ensure_fresh()
         region = self._regions.get(block_num)
-        if region is None or region.is_folded:
-            return
-        region.is_folded = True
-        self._set_block_visibility(region.start + 1, region.end, visible=False)
+        if region is not None:
+            self._set_folded([region], True)
 
     def unfold_at(self, block_num: int):
         """Unfold the region at block_num (no-op if already unfolded)."""
         self._ensure_fresh()
         region = self._regions.get(block_num)
-        if region is None or not region.is_folded:
-            return
-        region.is_folded = False
-        self._set_block_visibility(region.start + 1, region.end, visible=True)
+        if region is not None:
+            self._set_folded([region], False)
 
     def ensure_visible(self, block_num: int):
         """Unfold any region that hides the given block."""
         self._ensure_fresh()
-        for r in self._regions.values():
-            if r.is_folded and r.start < block_num <= r.end:
-                r.is_folded = False
-                self._set_block_visibility(r.start + 1, r.end, visible=True)
+        self._set_folded([r for r in self._regions.values() if r.start < block_num <= r.end], False)
 
     def fold_all(self):
         """Fold every region in the document."""
         self._ensure_fresh()
-        for r in self._regions.values():
-            if not r.is_folded:
-                r.is_folded = True
-                self._set_block_visibility(r.start + 1, r.end, visible=False)
+        self._set_folded(self._regions.values(), True)
 
     def unfold_all(self):
         """Unfold every region in the document."""
         self._ensure_fresh()
-        for r in self._regions.values():
-            if r.is_folded:
-                r.is_folded = False
-                self._set_block_visibility(r.start + 1, r.end, visible=True)
+        self._set_folded(self._regions.values(), False)
 
     def save_fold_state(self) -> dict[int, bool]:
         """Return current fold states keyed by start block number."""
@@ -194,24 +227,64 @@ class FoldManager(QObject):
     def restore_fold_state(self, state: dict[int, bool]):
         """Restore fold states after a temporary unfold."""
         self._ensure_fresh()
-        for start, was_folded in state.items():
-            region = self._regions.get(start)
-            if region and was_folded and not region.is_folded:
-                region.is_folded = True
-                self._set_block_visibility(region.start + 1, region.end, visible=False)
-
-    def _set_block_visibility(self, first: int, last: int, visible: bool):
-        """Set visibility on a range of blocks and notify the document layout."""
-        block = self._doc.findBlockByNumber(first)
-        while block.isValid() and block.blockNumber() <= last:
-            block.setVisible(visible)
-            block = block.next()
-        # Force layout recalculation.
-        # Disconnect contentsChanged temporarily so markContentsDirty
-        # does not re-dirty the fold state (causing needless re-scans).
-        self._doc.contentsChanged.disconnect(self._mark_dirty)
+        regions = (self._regions.get(start) for start, was_folded in state.items() if was_folded)
+        self._set_folded([r for r in regions if r is not None], True)
+
+    # ── Visibility ────────────────────────────────────────
+
+    def _set_folded(self, regions, folded: bool):
+        """Fold or unfold *regions*, then update the blocks they span in one pass."""
+        changed = [r for r in regions if r.is_folded != folded]
+        for r in changed:
+            r.is_folded = folded
+        self._sync_visibility([(r.start + 1, r.end) for r in changed])
+
+    def _sync_visibility(self, ranges: list[tuple[int, int]]):
+        """Hide the blocks of *ranges* that lie in a folded region and show the others.
+
+        Overlapping ranges are merged and walked once, and the layout is
+        marked dirty once, over the blocks whose visibility changed.
+        """
+        if not ranges:
+            return
+        hidden: list[list[int]] = []  # folded spans merged into disjoint, sorted [first, last] ranges
+        for start, end in sorted((r.start + 1, r.end) for r in self._regions.values() if r.is_folded):
+            if hidden and start <= hidden[-1][1] + 1:
+                hidden[-1][1] = max(hidden[-1][1], end)
+            else:
+                hidden.append([start, end])
+        walk: list[list[int]] = []
+        for first, last in sorted(ranges):
+            if walk and first <= walk[-1][1] + 1:
+                walk[-1][1] = max(walk[-1][1], last)
+            elif first <= last:
+                walk.append([first, last])
+
+        changed_first = changed_last = -1
+        i = 0
+        for first, last in walk:
+            block = self._doc.findBlockByNumber(first)
+            bnum = first
+            while block.isValid() and bnum <= last:
+                while i < len(hidden) and hidden[i][1] < bnum:
+                    i += 1
+                visible = not (i < len(hidden) and hidden[i][0] <= bnum)
+                if block.isVisible() != visible:
+                    block.setVisible(visible)
+                    changed_first = bnum if changed_first < 0 else changed_first
+                    changed_last = bnum
+                block = block.next()
+                bnum += 1
+        if changed_first >= 0:
+            self._mark_layout_dirty(changed_first, changed_last)
+
+    def _mark_layout_dirty(self, first: int, last: int):
+        """Force relayout of blocks *first* to *last* after a visibility change."""
+        # markContentsDirty emits contentsChange; it is not an edit, so ignore it.
+        self._applying_visibility = True
         first_pos = self._doc.findBlockByNumber(first).position()
         last_block = self._doc.findBlockByNumber(last)
         dirty_len = last_block.position() + last_block.length() - first_pos
         self._doc.markContentsDirty(first_pos, dirty_len)
-        self._doc.contentsChanged.connect(self._mark_dirty)
+        self._applying_visibility = False
+        self.visibility_changed.emit()
@@ -80,6 +80,8 @@ STRINGS: dict[str, str] = {
     "app.sync.conflict": "Drive: Konflikt erkannt",
     "app.sync.error": "Drive: Fehler",
     "app.sync.offline": "Drive: offline",
+    "app.cache.status": "Transkript-Cache: {hits} Treffer / {misses} Fehlschläge",
+    "app.api_stats.line": "{kind}: {requests} Anfragen, {retries} Wiederholungen, {failures} fehlgeschlagen — Ø {avg}s, max {max}s, Wartezeit Limit {wait}s",
     # ── app.py — updater ────────────────────────────────────
     "app.update.title": "Update",
     "app.update.available_title": "Update verfuegbar",
@@ -132,6 +134,7 @@ STRINGS: dict[str, str] = {
     "settings.audio.test_title": "Mikrofontest",
     "settings.advanced.auto_update": "Beim Start nach Updates suchen",
     "settings.advanced.chunk_label": "Maximale Abschnittsdauer:",
+    "settings.advanced.parallelism_label": "Parallele Abschnittstranskriptionen:",
     "settings.advanced.bias_label": "D&D-Kontextverstaerkung:",
     "settings.advanced.bias_placeholder": "D&D-Begriffe (einer pro Zeile)...",
     "settings.advanced.themed_cursors": "Thematische Cursor in Editoren verwenden",
@@ -195,6 +198,7 @@ STRINGS: dict[str, str] = {
     "session.status.added_journal": "Zusammenfassung zum Tagebuch hinzugefuegt!",
     "session.status.quest_extracting": "Quests werden extrahiert...",
     "session.status.quest_ready": "Quest-Vorschlaege bereit.",
+    "session.status.quest_no_changes": "Keine Quest-Änderungen in dieser Sitzung.",
     "session.status.quest_updated": "Quests aktualisiert!",
     "session.status.quest_cancelled": "Quest-Aktualisierung abgebrochen.",
     "session.status.imported": "Audio importiert: {name} ({size})",
@@ -220,6 +224,7 @@ STRINGS: dict[str, str] = {
     "session.resummarize.no_sessions": "Keine vergangenen Sitzungen mit Transkripten gefunden.",
     "session.resummarize.replace_journal": "Journaleintrag ersetzen",
     "session.resummarize.btn": "Neu zusammenfassen",
+    "session.resummarize.resumable": "fortsetzbar ({done}/{total} Abschnitte fertig)",
     "session.status.replaced_journal": "Journaleintrag ersetzt.",
     "session.tts.read_selection": "Auswahl vorlesen",
     # ── session_tab.py — PostRecordingDialog ────────────────
@@ -284,6 +289,9 @@ und Geheimnisse, die im Laufe der Kampagne gelueftet werden muessen.</em></p>
 <li><em>Keine Quests abgeschlossen.</em></li>
 </ul>
 """,
+    "quest_log.empty.active": "Noch keine Quests verzeichnet.",
+    "quest_log.empty.clues": "Noch keine Hinweise.",
+    "quest_log.empty.completed": "Keine Quests abgeschlossen.",
     # ── journal.py ──────────────────────────────────────────
     "journal.default_html": """\
 <h1 style="color:#d4af37; text-align:center;">Tagebuch &mdash; {campaign_name}</h1>
@@ -346,9 +354,13 @@ werden hier fuer die Nachwelt festgehalten.</em></p>
     # ── quest_extractor.py ──────────────────────────────────
     "quest_extractor.error.no_api_key": "Mistral API Key nicht konfiguriert.",
     "quest_extractor.error.generic": "Quest-Extraktionsfehler: {error}",
+    "quest_extractor.error.bad_delta": "Das Modell hat keine gültige Quest-Aktualisierung geliefert ({error})",
     "quest_extractor.no_quests": "(Keine Quests verzeichnet)",
     "quest_extractor.dialog_title": "Quest-Aktualisierung",
-    "quest_extractor.dialog_label": "Vorgeschlagene Aenderungen — bei Bedarf bearbeiten:",
+    "quest_extractor.dialog_label": "Von dieser Sitzung geänderte Quests — Änderungen abwählen, die nicht übernommen werden sollen:",
+    "quest_extractor.change.add": "Neu: {name}",
+    "quest_extractor.change.update": "Aktualisiert: {name}",
+    "quest_extractor.change.complete": "Abgeschlossen: {name}",
     # ── AI Prompts ──────────────────────────────────────────
     "prompt.summary_system": """\
 Du bist ein epischer Chronist der Forgotten Realms, spezialisiert auf die \
@@ -547,68 +559,22 @@ Text:
 Du bist ein Assistent, der auf die Quest-Verfolgung fuer eine Dungeons & Dragons-\
 Kampagne ({campaign_name}) spezialisiert ist.
 
-Erstelle aus der untenstehenden Sitzungszusammenfassung und dem aktuellen Quest-Log-Stand \
-das VOLLSTAENDIGE neu zusammengestellte Quest Log, angereichert mit den neuen \
-Sitzungsinformationen. Das Quest Log soll ein lebendiges Dokument sein, das \
-den aktuellen Stand ALLER Quests widerspiegelt.
-
-ABSOLUTE REGEL — NUR HTML ZURUECKGEBEN:
-- Gib NUR das rohe HTML des Quest Logs zurueck, NICHTS anderes.
-- VERBOTEN: keine Einleitung ("Hier ist das Quest Log..."), kein Fazit, \
-  keine Anmerkungen, keine Kommentare, kein ```, kein ---.
-- Das Dokument beginnt mit <h1> und endet mit </ul>.
-
-Exakte HTML-Struktur, die erzeugt werden muss (alle 3 Abschnitte MUESSEN vorhanden sein):
-
-<h1 style="color:#d4af37; text-align:center;">Quest Log &mdash; {campaign_name}</h1>
-<hr>
-<p><em>Dieses Register verfolgt aktive Quests, entdeckte Hinweise
-und Geheimnisse, die im Laufe der Kampagne gelueftet werden muessen.</em></p>
-<hr>
-<h2 style="color:#6ab4d4;">{section_active_quests}</h2>
-<ul>
-<li><strong>Quest-Name</strong> — Allgemeine Beschreibung der Quest.
-  <ul>
-  <li><em>{quest_origin}:</em> Wer die Quest gegeben hat, wo und wann.</li>
-  <li><em>{quest_objective}:</em> Was erreicht werden muss.</li>
-  <li><em>{quest_progress}:</em> Was bisher getan wurde.</li>
-  <li><em>{quest_next_step}:</em> Was noch zu tun bleibt.</li>
-  <li><em>{quest_npcs}:</em> An dieser Quest beteiligte Charaktere.</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_clues}</h2>
-<ul>
-<li><strong>Geheimnis</strong> — Was bekannt ist, was noch zu entdecken bleibt.
-  <ul>
-  <li>Entdecktes Detail oder Hinweis...</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_completed_quests}</h2>
-<ul>
-<li><strong>Quest-Name</strong> — Loesung und Konsequenzen.
-  <ul>
-  <li><em>{quest_giver}:</em> Wer die Quest gegeben hat und Belohnung.</li>
-  <li><em>{quest_resolution}:</em> Wie die Quest geloest wurde.</li>
-  </ul>
-</li>
-</ul>
+Liste aus der untenstehenden Sitzungszusammenfassung und dem aktuellen Quest-Log-Stand \
+NUR die Aenderungen am Quest Log auf, die diese Sitzung bringt: neue Quests und \
+Geheimnisse, Fortschritt bestehender Quests, neue NPCs und Hinweise, \
+abgeschlossene Quests und geloeste Geheimnisse.
 
 Regeln:
 - Schreibe auf {language_name}, in knappem und SACHLICHEM Stil. Keine Spekulation (kein \
   "koennte", "scheint", "deutet darauf hin"). Schreibe nur, was bekannt ist.
 - Behalte D&D-Begriffe auf Englisch (Hit Points, Saving Throw usw.).
 - Eigennamen bleiben unveraendert.
-- Verwende verschachtelte Aufzaehlungslisten fuer Details.
-- Verschiebe abgeschlossene Quests von "Aktive Quests" zu "Abgeschlossene Quests".
-- BEWAHRE ALLE bestehenden Quest-Log-Informationen. Verliere KEIN \
-  Detail (Questgeber, Belohnung, NPCs, Fortschritt) bestehender Quests. \
-  Bereichere mit neuen Informationen OHNE alte Informationen zu loeschen.
-- Fuege neu entdeckte Quests zu "Aktive Quests" hinzu.
-- Fuege neue Hinweise zu "Hinweise und Geheimnisse" hinzu. Entferne einen Hinweis, \
-  wenn das Geheimnis geloest ist (erwaehne die Loesung in der zugehoerigen Quest).
-- Das Quest Log soll ein detailliertes Nachschlagewerk sein, nicht nur eine Liste.
+- Wiederhole nichts, was das Quest Log bereits enthaelt: nur was diese \
+  Sitzung hinzufuegt oder aendert.
+- Schliesse eine Quest nur ab, wenn die Zusammenfassung sagt, dass sie geloest \
+  wurde, und gib ihre Loesung an.
+- Wenn ein Geheimnis geloest ist, schliesse es ab und erwaehne die Antwort in der \
+  zugehoerigen Quest.
 
 Aktueller Quest-Log-Stand:
 ---
@@ -641,10 +607,22 @@ Sitzungszusammenfassung:
     "assistant.dialog.title": "Kampagne befragen",
     "assistant.placeholder": "Stellen Sie eine Frage zu Ihrer Kampagne...",
     "assistant.btn_ask": "Fragen",
+    "assistant.btn_search": "Suchen",
+    "assistant.btn_search_tooltip": "Die Journal-, Questlog- und Transkriptabschnitte finden, die Ihrer Anfrage am nächsten sind, ohne die KI zu fragen",
+    "assistant.conversation_mode": "Gesprächsmodus",
+    "assistant.conversation_mode_tooltip": "Folgefragen werden zusammen mit den vorherigen Fragen und Antworten gestellt",
+    "assistant.btn_new_conversation": "Neues Gespräch",
     "assistant.thinking": "Nachdenken...",
+    "assistant.searching": "Suche läuft...",
+    "assistant.indexing": "{count} neue Abschnitte werden indiziert...",
     "assistant.error.no_api_key": "Bitte konfigurieren Sie Ihren Mistral API Key in den Einstellungen.",
     "assistant.error.generic": "Fehler: {error}",
     "assistant.error.no_campaign": "Keine aktive Kampagne ausgewaehlt.",
+    "assistant.context_stats": "{passages} Abschnitte in {ms} ms gefunden — ~{sent} von ~{total} Tokens gesendet ({saved} % gespart)",
+    "assistant.search.no_results": "Keine passenden Abschnitte.",
+    "assistant.source.journal": "Journal",
+    "assistant.source.quest_log": "Questlog",
+    "assistant.source.transcript": "Transkript",
     # ── shortcuts_overlay.py ─────────────────────────────
     "app.menu.shortcuts": "Tastenkürzel...",
     "shortcuts.title": "Tastenkürzel",
@@ -669,6 +647,7 @@ Sitzungszusammenfassung:
     "shortcuts.tts_pause": "Pause / Fortsetzen",
     "shortcuts.ask_campaign": "Kampagne befragen",
     "shortcuts.tts_stop": "Stopp",
+    "prompt.assistant_earlier_questions": "Früher in diesem Gespräch hat der SL außerdem gefragt:\n{questions}",
     "prompt.campaign_assistant": """\
 Du bist ein D&D-Kampagnenassistent. Beantworte die Frage des Spielleiters \
 ausschliesslich auf Grundlage des unten bereitgestellten Kampagnenjournals \
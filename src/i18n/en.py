@@ -80,6 +80,8 @@ STRINGS: dict[str, str] = {
     "app.sync.conflict": "Drive: conflict detected",
     "app.sync.error": "Drive: error",
     "app.sync.offline": "Drive: offline",
+    "app.cache.status": "Transcript cache: {hits} hits / {misses} misses",
+    "app.api_stats.line": "{kind}: {requests} requests, {retries} retries, {failures} failed — avg {avg}s, max {max}s, rate-limit wait {wait}s",
     # ── app.py — updater ────────────────────────────────────
     "app.update.title": "Update",
     "app.update.available_title": "Update available",
@@ -132,6 +134,7 @@ STRINGS: dict[str, str] = {
     "settings.audio.test_title": "Microphone Test",
     "settings.advanced.auto_update": "Check for updates at startup",
     "settings.advanced.chunk_label": "Max chunk duration:",
+    "settings.advanced.parallelism_label": "Parallel chunk transcriptions:",
     "settings.advanced.bias_label": "D&D context bias:",
     "settings.advanced.bias_placeholder": "D&D terms (one per line)...",
     "settings.advanced.themed_cursors": "Use themed cursors in editors",
@@ -195,6 +198,7 @@ STRINGS: dict[str, str] = {
     "session.status.added_journal": "Summary added to Journal!",
     "session.status.quest_extracting": "Extracting quests...",
     "session.status.quest_ready": "Quest proposals ready.",
+    "session.status.quest_no_changes": "No quest changes in this session.",
     "session.status.quest_updated": "Quests updated!",
     "session.status.quest_cancelled": "Quest update cancelled.",
     "session.status.imported": "Audio imported: {name} ({size})",
@@ -220,6 +224,7 @@ STRINGS: dict[str, str] = {
     "session.resummarize.no_sessions": "No past sessions with transcripts found.",
     "session.resummarize.replace_journal": "Replace journal entry",
     "session.resummarize.btn": "Re-summarize",
+    "session.resummarize.resumable": "resumable ({done}/{total} chunks done)",
     "session.status.replaced_journal": "Journal entry replaced.",
     "session.tts.read_selection": "Read selection",
     # ── session_tab.py — PostRecordingDialog ────────────────
@@ -284,6 +289,9 @@ and mysteries to unravel throughout the campaign.</em></p>
 <li><em>No quests completed.</em></li>
 </ul>
 """,
+    "quest_log.empty.active": "No quests recorded yet.",
+    "quest_log.empty.clues": "No clues yet.",
+    "quest_log.empty.completed": "No quests completed.",
     # ── journal.py ──────────────────────────────────────────
     "journal.default_html": """\
 <h1 style="color:#d4af37; text-align:center;">Journal &mdash; {campaign_name}</h1>
@@ -346,9 +354,13 @@ will be recorded here for posterity.</em></p>
     # ── quest_extractor.py ──────────────────────────────────
     "quest_extractor.error.no_api_key": "Mistral API key not configured.",
     "quest_extractor.error.generic": "Quest extraction error: {error}",
+    "quest_extractor.error.bad_delta": "The model did not return a valid quest update ({error})",
     "quest_extractor.no_quests": "(No quests recorded)",
     "quest_extractor.dialog_title": "Quest update",
-    "quest_extractor.dialog_label": "Proposed changes — edit if needed:",
+    "quest_extractor.dialog_label": "Quests changed by this session — uncheck any change you do not want:",
+    "quest_extractor.change.add": "New: {name}",
+    "quest_extractor.change.update": "Updated: {name}",
+    "quest_extractor.change.complete": "Completed: {name}",
     # ── updater.py ─────────────────────────────────────────
     "updater.error.no_installer": "No installer found in this release.",
     "updater.error.network": "Network error: {reason}",
@@ -560,68 +572,22 @@ Text:
 You are an assistant specialized in quest tracking for a Dungeons & Dragons \
 campaign ({campaign_name}).
 
-From the session summary below and the current quest log state, \
-generate the COMPLETE recompiled quest log enriched with the new \
-session information. The quest log should be a living document that \
-reflects the current state of ALL quests.
-
-ABSOLUTE RULE — RETURN ONLY HTML:
-- Return ONLY the raw HTML of the quest log, NOTHING else.
-- FORBIDDEN: no introduction ("Here is the quest log..."), no conclusion, \
-  no notes, no comments, no ```, no ---.
-- The document starts with <h1> and ends with </ul>.
-
-Exact HTML structure to produce (all 3 sections MUST be present):
-
-<h1 style="color:#d4af37; text-align:center;">Quest Log &mdash; {campaign_name}</h1>
-<hr>
-<p><em>This register tracks active quests, discovered clues,
-and mysteries to unravel throughout the campaign.</em></p>
-<hr>
-<h2 style="color:#6ab4d4;">{section_active_quests}</h2>
-<ul>
-<li><strong>Quest name</strong> — General description of the quest.
-  <ul>
-  <li><em>{quest_origin}:</em> Who gave the quest, where, and when.</li>
-  <li><em>{quest_objective}:</em> What must be accomplished.</li>
-  <li><em>{quest_progress}:</em> What has been done so far.</li>
-  <li><em>{quest_next_step}:</em> What remains to be done.</li>
-  <li><em>{quest_npcs}:</em> Characters involved in this quest.</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_clues}</h2>
-<ul>
-<li><strong>Mystery</strong> — What is known, what remains to discover.
-  <ul>
-  <li>Detail or clue discovered...</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_completed_quests}</h2>
-<ul>
-<li><strong>Quest name</strong> — Resolution and consequences.
-  <ul>
-  <li><em>{quest_giver}:</em> Who gave the quest and reward.</li>
-  <li><em>{quest_resolution}:</em> How the quest was resolved.</li>
-  </ul>
-</li>
-</ul>
+From the session summary below and the current quest log state, list ONLY \
+the quest log changes brought by this session: new quests and mysteries, \
+progress on existing ones, new NPCs and clues, quests completed and \
+mysteries resolved.
 
 Rules:
 - Write in {language_name}, concise and FACTUAL style. No speculation (no \
   "could", "seems", "suggests"). Write only what is known.
 - Keep D&D terms in English (Hit Points, Saving Throw, etc.).
 - Proper nouns remain as-is.
-- Use nested bullet lists for details.
-- Move resolved quests from "Active Quests" to "Completed Quests".
-- PRESERVE ALL existing quest log information. Do not LOSE ANY \
-  detail (quest giver, reward, NPCs, progress) from existing quests. \
-  Enrich with new information WITHOUT deleting old information.
-- Add newly discovered quests to "Active Quests".
-- Add new clues to "Clues and Mysteries". Remove a clue \
-  when the mystery is resolved (mention the resolution in the related quest).
-- The quest log should be a detailed reference tool, not just a list.
+- Do not repeat what the quest log already records: only what this \
+  session adds or changes.
+- Complete a quest only when the summary says it was resolved, and give \
+  its resolution.
+- When a mystery is solved, complete it and mention the answer in the \
+  related quest.
 
 Current quest log state:
 ---
@@ -654,10 +620,22 @@ Session summary:
     "assistant.dialog.title": "Ask about your campaign",
     "assistant.placeholder": "Ask a question about your campaign...",
     "assistant.btn_ask": "Ask",
+    "assistant.btn_search": "Search",
+    "assistant.btn_search_tooltip": "Find the journal, quest log and transcript passages closest to your query, without asking the AI",
+    "assistant.conversation_mode": "Conversation mode",
+    "assistant.conversation_mode_tooltip": "Follow-up questions are asked with the previous questions and answers",
+    "assistant.btn_new_conversation": "New conversation",
     "assistant.thinking": "Thinking...",
+    "assistant.searching": "Searching...",
+    "assistant.indexing": "Indexing {count} new passages...",
     "assistant.error.no_api_key": "Please configure your Mistral API key in Settings.",
     "assistant.error.generic": "Error: {error}",
     "assistant.error.no_campaign": "No active campaign selected.",
+    "assistant.context_stats": "{passages} passages retrieved in {ms} ms — ~{sent} of ~{total} tokens sent ({saved}% saved)",
+    "assistant.search.no_results": "No matching passages.",
+    "assistant.source.journal": "Journal",
+    "assistant.source.quest_log": "Quest log",
+    "assistant.source.transcript": "Transcript",
     # ── shortcuts_overlay.py ─────────────────────────────
     "app.menu.shortcuts": "Keyboard Shortcuts...",
     "shortcuts.title": "Keyboard Shortcuts",
@@ -682,6 +660,7 @@ Session summary:
     "shortcuts.tts_pause": "Pause / Resume",
     "shortcuts.ask_campaign": "Ask about campaign",
     "shortcuts.tts_stop": "Stop",
+    "prompt.assistant_earlier_questions": "Earlier in this conversation the DM also asked:\n{questions}",
     "prompt.campaign_assistant": """\
 You are a D&D campaign assistant. Answer the DM's question based ONLY on the \
 campaign journal and quest log provided below. Be specific — cite session dates \
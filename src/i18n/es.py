@@ -80,6 +80,8 @@ STRINGS: dict[str, str] = {
     "app.sync.conflict": "Drive: conflicto detectado",
     "app.sync.error": "Drive: error",
     "app.sync.offline": "Drive: sin conexión",
+    "app.cache.status": "Caché de transcripción: {hits} aciertos / {misses} fallos",
+    "app.api_stats.line": "{kind}: {requests} peticiones, {retries} reintentos, {failures} fallidas — media {avg}s, máx {max}s, espera por límite {wait}s",
     # ── app.py — updater ────────────────────────────────────
     "app.update.title": "Actualización",
     "app.update.available_title": "Actualización disponible",
@@ -132,6 +134,7 @@ STRINGS: dict[str, str] = {
     "settings.audio.test_title": "Prueba de micrófono",
     "settings.advanced.auto_update": "Buscar actualizaciones al iniciar",
     "settings.advanced.chunk_label": "Duración máxima por chunk:",
+    "settings.advanced.parallelism_label": "Transcripciones de chunks en paralelo:",
     "settings.advanced.bias_label": "Sesgo de contexto D&D:",
     "settings.advanced.bias_placeholder": "Términos D&D (uno por línea)...",
     "settings.advanced.themed_cursors": "Usar cursores temáticos en los editores",
@@ -195,6 +198,7 @@ STRINGS: dict[str, str] = {
     "session.status.added_journal": "¡Resumen añadido al Diario!",
     "session.status.quest_extracting": "Extrayendo quests...",
     "session.status.quest_ready": "Propuestas de quests listas.",
+    "session.status.quest_no_changes": "No hay cambios de quests en esta sesión.",
     "session.status.quest_updated": "¡Quests actualizadas!",
     "session.status.quest_cancelled": "Actualización de quests cancelada.",
     "session.status.imported": "Audio importado: {name} ({size})",
@@ -220,6 +224,7 @@ STRINGS: dict[str, str] = {
     "session.resummarize.no_sessions": "No se encontraron sesiones anteriores con transcripciones.",
     "session.resummarize.replace_journal": "Reemplazar entrada del diario",
     "session.resummarize.btn": "Re-resumir",
+    "session.resummarize.resumable": "reanudable ({done}/{total} chunks hechos)",
     "session.status.replaced_journal": "Entrada del diario reemplazada.",
     "session.tts.read_selection": "Leer selección",
     # ── session_tab.py — PostRecordingDialog ────────────────
@@ -284,6 +289,9 @@ y misterios por resolver a lo largo de la campaña.</em></p>
 <li><em>No hay quests completadas.</em></li>
 </ul>
 """,
+    "quest_log.empty.active": "No hay quests registradas por el momento.",
+    "quest_log.empty.clues": "No hay pistas por el momento.",
+    "quest_log.empty.completed": "No hay quests completadas.",
     # ── journal.py ──────────────────────────────────────────
     "journal.default_html": """\
 <h1 style="color:#d4af37; text-align:center;">Diario &mdash; {campaign_name}</h1>
@@ -346,9 +354,13 @@ quedarán registrados aquí para la posteridad.</em></p>
     # ── quest_extractor.py ──────────────────────────────────
     "quest_extractor.error.no_api_key": "Clave API de Mistral no configurada.",
     "quest_extractor.error.generic": "Error de extracción de quests: {error}",
+    "quest_extractor.error.bad_delta": "El modelo no devolvió una actualización de quests válida ({error})",
     "quest_extractor.no_quests": "(No hay quests registradas)",
     "quest_extractor.dialog_title": "Actualización de quests",
-    "quest_extractor.dialog_label": "Cambios propuestos — edita si es necesario:",
+    "quest_extractor.dialog_label": "Quests modificadas en esta sesión — desmarca los cambios que no quieras:",
+    "quest_extractor.change.add": "Nueva: {name}",
+    "quest_extractor.change.update": "Actualizada: {name}",
+    "quest_extractor.change.complete": "Completada: {name}",
     # ── AI Prompts ──────────────────────────────────────────
     "prompt.summary_system": """\
 Eres un cronista épico de los Forgotten Realms, especializado en narrar \
@@ -549,67 +561,21 @@ Eres un asistente especializado en el seguimiento de quests para una campaña \
 de Dungeons & Dragons ({campaign_name}).
 
 A partir del resumen de sesión a continuación y del estado actual del quest log, \
-genera el quest log COMPLETO recompilado y enriquecido con la nueva \
-información de la sesión. El quest log debe ser un documento vivo que \
-refleje el estado actual de TODAS las quests.
-
-REGLA ABSOLUTA — DEVUELVE ÚNICAMENTE EL HTML:
-- Devuelve ÚNICAMENTE el HTML puro del quest log, NADA más.
-- PROHIBIDO: no introducción ("Aquí está el quest log..."), no conclusión, \
-  no notas, no comentarios, no ```, no ---.
-- El documento comienza con <h1> y termina con </ul>.
-
-Estructura HTML exacta a producir (las 3 secciones DEBEN estar presentes):
-
-<h1 style="color:#d4af37; text-align:center;">Quest Log &mdash; {campaign_name}</h1>
-<hr>
-<p><em>Este registro recoge las quests activas, pistas descubiertas
-y misterios por resolver a lo largo de la campaña.</em></p>
-<hr>
-<h2 style="color:#6ab4d4;">{section_active_quests}</h2>
-<ul>
-<li><strong>Nombre de la quest</strong> — Descripción general de la quest.
-  <ul>
-  <li><em>{quest_origin}:</em> Quién dio la quest, dónde y cuándo.</li>
-  <li><em>{quest_objective}:</em> Qué debe cumplirse.</li>
-  <li><em>{quest_progress}:</em> Qué se ha hecho hasta ahora.</li>
-  <li><em>{quest_next_step}:</em> Qué queda por hacer.</li>
-  <li><em>{quest_npcs}:</em> Personajes involucrados en esta quest.</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_clues}</h2>
-<ul>
-<li><strong>Misterio</strong> — Lo que se sabe, lo que queda por descubrir.
-  <ul>
-  <li>Detalle o pista descubierta...</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_completed_quests}</h2>
-<ul>
-<li><strong>Nombre de la quest</strong> — Resolución y consecuencias.
-  <ul>
-  <li><em>{quest_giver}:</em> Quién dio la quest y recompensa.</li>
-  <li><em>{quest_resolution}:</em> Cómo se resolvió la quest.</li>
-  </ul>
-</li>
-</ul>
+enumera ÚNICAMENTE los cambios del quest log que aporta esta sesión: nuevas \
+quests y misterios, progreso de las quests existentes, nuevos NPCs y pistas, \
+quests completadas y misterios resueltos.
 
 Reglas:
 - Escribe en español, estilo conciso y FACTUAL. Sin especulación (no \
   "podría", "parece", "sugiere"). Escribe únicamente lo que se sabe.
 - Conserva los términos D&D en inglés (Hit Points, Saving Throw, etc.).
 - Los nombres propios se mantienen tal cual.
-- Usa listas con viñetas anidadas para los detalles.
-- Mueve las quests resueltas de "Quests Activas" a "Quests Completadas".
-- PRESERVA TODA la información existente del quest log. No pierdas NINGÚN \
-  detalle (quien la dio, recompensa, NPCs, progreso) de las quests existentes. \
-  Enriquece con nueva información SIN eliminar la antigua.
-- Añade las nuevas quests descubiertas en "Quests Activas".
-- Añade nuevas pistas en "Pistas y Misterios". Elimina una pista \
-  cuando el misterio se resuelva (menciona la resolución en la quest correspondiente).
-- El quest log debe ser una herramienta de referencia detallada, no solo una lista.
+- No repitas lo que el quest log ya contiene: solo lo que esta sesión \
+  añade o cambia.
+- Completa una quest solo cuando el resumen diga que se resolvió, e indica \
+  su resolución.
+- Cuando se resuelva un misterio, complétalo y menciona la respuesta en la \
+  quest correspondiente.
 
 Estado actual del quest log:
 ---
@@ -642,10 +608,22 @@ Resumen de la sesión:
     "assistant.dialog.title": "Preguntar sobre tu campaña",
     "assistant.placeholder": "Haz una pregunta sobre tu campaña...",
     "assistant.btn_ask": "Preguntar",
+    "assistant.btn_search": "Buscar",
+    "assistant.btn_search_tooltip": "Encontrar los pasajes del diario, el registro de misiones y las transcripciones más cercanos a tu consulta, sin preguntar a la IA",
+    "assistant.conversation_mode": "Modo conversación",
+    "assistant.conversation_mode_tooltip": "Las preguntas de seguimiento se envían con las preguntas y respuestas anteriores",
+    "assistant.btn_new_conversation": "Nueva conversación",
     "assistant.thinking": "Pensando...",
+    "assistant.searching": "Buscando...",
+    "assistant.indexing": "Indexando {count} pasajes nuevos...",
     "assistant.error.no_api_key": "Configura tu clave API de Mistral en Configuración.",
     "assistant.error.generic": "Error: {error}",
     "assistant.error.no_campaign": "No hay campaña activa seleccionada.",
+    "assistant.context_stats": "{passages} pasajes recuperados en {ms} ms — ~{sent} de ~{total} tokens enviados ({saved} % ahorrado)",
+    "assistant.search.no_results": "No hay pasajes coincidentes.",
+    "assistant.source.journal": "Diario",
+    "assistant.source.quest_log": "Registro de misiones",
+    "assistant.source.transcript": "Transcripción",
     # ── shortcuts_overlay.py ─────────────────────────────
     "app.menu.shortcuts": "Atajos de teclado...",
     "shortcuts.title": "Atajos de teclado",
@@ -670,6 +648,7 @@ Resumen de la sesión:
     "shortcuts.tts_pause": "Pausa / Reanudar",
     "shortcuts.ask_campaign": "Preguntar sobre la campaña",
     "shortcuts.tts_stop": "Detener",
+    "prompt.assistant_earlier_questions": "Antes en esta conversación, el DM también preguntó:\n{questions}",
     "prompt.campaign_assistant": """\
 Eres un asistente de campaña de D&D. Responde a la pregunta del DM basándote \
 ÚNICAMENTE en el diario de campaña y el quest log proporcionados a continuación. \
@@ -80,6 +80,8 @@ STRINGS: dict[str, str] = {
     "app.sync.conflict": "Drive: conflit détecté",
     "app.sync.error": "Drive: erreur",
     "app.sync.offline": "Drive: hors ligne",
+    "app.cache.status": "Cache de transcription: {hits} succès / {misses} échecs",
+    "app.api_stats.line": "{kind}: {requests} requêtes, {retries} relances, {failures} échecs — moy. {avg}s, max {max}s, attente limite {wait}s",
     # ── app.py — updater ────────────────────────────────────
     "app.update.title": "Mise à jour",
     "app.update.available_title": "Mise à jour disponible",
@@ -132,6 +134,7 @@ STRINGS: dict[str, str] = {
     "settings.audio.test_title": "Test Microphone",
     "settings.advanced.auto_update": "Vérifier les mises à jour au démarrage",
     "settings.advanced.chunk_label": "Durée max par chunk:",
+    "settings.advanced.parallelism_label": "Transcriptions de chunks en parallèle:",
     "settings.advanced.bias_label": "Biais de contexte D&D:",
     "settings.advanced.bias_placeholder": "Termes D&D (un par ligne)...",
     "settings.advanced.themed_cursors": "Utiliser des curseurs thématiques dans les éditeurs",
@@ -195,6 +198,7 @@ STRINGS: dict[str, str] = {
     "session.status.added_journal": "Resumé ajouté au Journal !",
     "session.status.quest_extracting": "Extraction des quêtes en cours...",
     "session.status.quest_ready": "Propositions de quêtes prêtes.",
+    "session.status.quest_no_changes": "Aucun changement de quêtes dans cette session.",
     "session.status.quest_updated": "Quêtes mises a jour !",
     "session.status.quest_cancelled": "Mise a jour des quêtes annulée.",
     "session.status.imported": "Audio importé: {name} ({size})",
@@ -220,6 +224,7 @@ STRINGS: dict[str, str] = {
     "session.resummarize.no_sessions": "Aucune session passée avec transcription trouvée.",
     "session.resummarize.replace_journal": "Remplacer l'entrée du journal",
     "session.resummarize.btn": "Re-résumer",
+    "session.resummarize.resumable": "reprenable ({done}/{total} chunks terminés)",
     "session.status.replaced_journal": "Entrée du journal remplacée.",
     "session.tts.read_selection": "Lire la sélection",
     # ── session_tab.py — PostRecordingDialog ────────────────
@@ -284,6 +289,9 @@ et mystères à élucider au cours de la campagne.</em></p>
 <li><em>Aucune quête terminée.</em></li>
 </ul>
 """,
+    "quest_log.empty.active": "Aucune quête enregistrée pour le moment.",
+    "quest_log.empty.clues": "Aucun indice pour le moment.",
+    "quest_log.empty.completed": "Aucune quête terminée.",
     # ── journal.py ──────────────────────────────────────────
     "journal.default_html": """\
 <h1 style="color:#d4af37; text-align:center;">Journal &mdash; {campaign_name}</h1>
@@ -346,9 +354,13 @@ seront consignés ici pour la postérité.</em></p>
     # ── quest_extractor.py ──────────────────────────────────
     "quest_extractor.error.no_api_key": "Clé API Mistral non configurée.",
     "quest_extractor.error.generic": "Erreur d'extraction de quêtes: {error}",
+    "quest_extractor.error.bad_delta": "Le modèle n'a pas renvoyé de mise à jour de quêtes valide ({error})",
     "quest_extractor.no_quests": "(Aucune quête enregistrée)",
     "quest_extractor.dialog_title": "Mise à jour des quêtes",
-    "quest_extractor.dialog_label": "Changements proposés — modifiez si nécessaire:",
+    "quest_extractor.dialog_label": "Quêtes modifiées par cette session — décochez les changements à ignorer:",
+    "quest_extractor.change.add": "Nouvelle: {name}",
+    "quest_extractor.change.update": "Mise à jour: {name}",
+    "quest_extractor.change.complete": "Terminée: {name}",
     # ── updater.py ─────────────────────────────────────────
     "updater.error.no_installer": "Aucun installateur trouvé dans cette release.",
     "updater.error.network": "Erreur réseau : {reason}",
@@ -562,67 +574,21 @@ Tu es un assistant spécialisé dans le suivi de quêtes pour une campagne \
 Dungeons & Dragons ({campaign_name}).
 
 À partir du résumé de session ci-dessous et de l'état actuel du quest log, \
-génère le quest log COMPLET recompilé et enrichi avec les nouvelles \
-informations de la session. Le quest log doit être un document vivant qui \
-reflète l'état actuel de TOUTES les quêtes.
-
-RÈGLE ABSOLUE — RETOURNE UNIQUEMENT LE HTML:
-- Retourne UNIQUEMENT le HTML brut du quest log, RIEN d'autre.
-- INTERDIT: pas d'introduction ("Voici le quest log..."), pas de conclusion, \
-  pas de notes, pas de commentaires, pas de ```, pas de ---.
-- Le document commence par <h1> et finit par </ul>.
-
-Structure HTML exacte à produire (les 3 sections DOIVENT être présentes):
-
-<h1 style="color:#d4af37; text-align:center;">Quest Log &mdash; {campaign_name}</h1>
-<hr>
-<p><em>Ce registre recense les quêtes actives, indices découverts
-et mystères à élucider au cours de la campagne.</em></p>
-<hr>
-<h2 style="color:#6ab4d4;">Quêtes Actives</h2>
-<ul>
-<li><strong>Nom de la quête</strong> — Description générale de la quête.
-  <ul>
-  <li><em>Origine:</em> Qui a donné la quête, où et quand.</li>
-  <li><em>Objectif:</em> Ce qui doit être accompli.</li>
-  <li><em>Progression:</em> Ce qui a été fait jusqu'ici.</li>
-  <li><em>Prochaine étape:</em> Ce qu'il reste à faire.</li>
-  <li><em>PNJ impliqués:</em> Personnages liés à cette quête.</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">Indices et Mystères</h2>
-<ul>
-<li><strong>Mystère</strong> — Ce qu'on sait, ce qui reste à découvrir.
-  <ul>
-  <li>Détail ou indice découvert...</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">Quêtes Terminées</h2>
-<ul>
-<li><strong>Nom de la quête</strong> — Résolution et conséquences.
-  <ul>
-  <li><em>Mandataire:</em> Qui a donné la quête et récompense.</li>
-  <li><em>Résolution:</em> Comment la quête a été résolue.</li>
-  </ul>
-</li>
-</ul>
+liste UNIQUEMENT les changements du quest log apportés par cette session: \
+nouvelles quêtes et nouveaux mystères, progression des quêtes existantes, \
+nouveaux PNJ et indices, quêtes terminées et mystères résolus.
 
 Règles:
 - Écris en français, style concis et FACTUEL. Pas de spéculation (pas de \
   "pourrait", "semble", "suggère"). Écris uniquement ce qui est connu.
 - Conserve les termes D&D en anglais (Hit Points, Saving Throw, etc.).
 - Les noms propres restent tels quels.
-- Utilise des listes à puces imbriquées pour les détails.
-- Déplace les quêtes résolues de "Quêtes Actives" vers "Quêtes Terminées".
-- PRÉSERVE TOUTES les informations existantes du quest log. Ne perds AUCUN \
-  détail (mandataire, récompense, PNJ, progression) des quêtes existantes. \
-  Enrichis avec les nouvelles informations SANS supprimer les anciennes.
-- Ajoute les nouvelles quêtes découvertes dans "Quêtes Actives".
-- Ajoute les nouveaux indices dans "Indices et Mystères". Retire un indice \
-  quand le mystère est résolu (mentionne la résolution dans la quête concernée).
-- Le quest log doit être un outil de référence détaillé, pas juste une liste.
+- Ne répète pas ce que le quest log contient déjà: uniquement ce que cette \
+  session ajoute ou modifie.
+- Ne termine une quête que si le résumé indique qu'elle a été résolue, et \
+  donne sa résolution.
+- Quand un mystère est élucidé, termine-le et mentionne la réponse dans la \
+  quête concernée.
 
 État actuel du quest log:
 ---
@@ -655,10 +621,22 @@ Résumé de la session:
     "assistant.dialog.title": "Interroger votre campagne",
     "assistant.placeholder": "Posez une question sur votre campagne...",
     "assistant.btn_ask": "Demander",
+    "assistant.btn_search": "Rechercher",
+    "assistant.btn_search_tooltip": "Trouver les passages du journal, du registre des quêtes et des transcriptions les plus proches de votre requête, sans interroger l'IA",
+    "assistant.conversation_mode": "Mode conversation",
+    "assistant.conversation_mode_tooltip": "Les questions de suivi sont posées avec les questions et réponses précédentes",
+    "assistant.btn_new_conversation": "Nouvelle conversation",
     "assistant.thinking": "Réflexion en cours...",
+    "assistant.searching": "Recherche en cours...",
+    "assistant.indexing": "Indexation de {count} nouveaux passages...",
     "assistant.error.no_api_key": "Veuillez configurer votre clé API Mistral dans les Paramètres.",
     "assistant.error.generic": "Erreur: {error}",
     "assistant.error.no_campaign": "Aucune campagne active sélectionnée.",
+    "assistant.context_stats": "{passages} passages retrouvés en {ms} ms — ~{sent} jetons envoyés sur ~{total} ({saved} % économisés)",
+    "assistant.search.no_results": "Aucun passage correspondant.",
+    "assistant.source.journal": "Journal",
+    "assistant.source.quest_log": "Registre des quêtes",
+    "assistant.source.transcript": "Transcription",
     # ── shortcuts_overlay.py ─────────────────────────────
     "app.menu.shortcuts": "Raccourcis clavier...",
     "shortcuts.title": "Raccourcis clavier",
@@ -683,6 +661,7 @@ Résumé de la session:
     "shortcuts.tts_pause": "Pause / Reprendre",
     "shortcuts.ask_campaign": "Interroger la campagne",
     "shortcuts.tts_stop": "Arrêter",
+    "prompt.assistant_earlier_questions": "Plus tôt dans cette conversation, le MJ a aussi demandé:\n{questions}",
     "prompt.campaign_assistant": """\
 Tu es un assistant de campagne D&D. Réponds à la question du MJ en te basant \
 UNIQUEMENT sur le journal de campagne et le quest log fournis ci-dessous. Sois \
@@ -80,6 +80,8 @@ STRINGS: dict[str, str] = {
     "app.sync.conflict": "Drive: conflitto rilevato",
     "app.sync.error": "Drive: errore",
     "app.sync.offline": "Drive: offline",
+    "app.cache.status": "Cache trascrizioni: {hits} successi / {misses} mancati",
+    "app.api_stats.line": "{kind}: {requests} richieste, {retries} tentativi, {failures} fallite — media {avg}s, max {max}s, attesa limite {wait}s",
     # ── app.py — updater ────────────────────────────────────
     "app.update.title": "Aggiornamento",
     "app.update.available_title": "Aggiornamento disponibile",
@@ -132,6 +134,7 @@ STRINGS: dict[str, str] = {
     "settings.audio.test_title": "Test Microfono",
     "settings.advanced.auto_update": "Controlla aggiornamenti all'avvio",
     "settings.advanced.chunk_label": "Durata massima per chunk:",
+    "settings.advanced.parallelism_label": "Trascrizioni di chunk in parallelo:",
     "settings.advanced.bias_label": "Bias di contesto D&D:",
     "settings.advanced.bias_placeholder": "Termini D&D (uno per riga)...",
     "settings.advanced.themed_cursors": "Usa cursori tematici negli editor",
@@ -195,6 +198,7 @@ STRINGS: dict[str, str] = {
     "session.status.added_journal": "Riepilogo aggiunto al Diario!",
     "session.status.quest_extracting": "Estrazione delle quest in corso...",
     "session.status.quest_ready": "Proposte di quest pronte.",
+    "session.status.quest_no_changes": "Nessuna modifica alle quest in questa sessione.",
     "session.status.quest_updated": "Quest aggiornate!",
     "session.status.quest_cancelled": "Aggiornamento delle quest annullato.",
     "session.status.imported": "Audio importato: {name} ({size})",
@@ -220,6 +224,7 @@ STRINGS: dict[str, str] = {
     "session.resummarize.no_sessions": "Nessuna sessione passata con trascrizioni trovata.",
     "session.resummarize.replace_journal": "Sostituisci voce del diario",
     "session.resummarize.btn": "Ri-riassumere",
+    "session.resummarize.resumable": "riprendibile ({done}/{total} chunk completati)",
     "session.status.replaced_journal": "Voce del diario sostituita.",
     "session.tts.read_selection": "Leggi la selezione",
     # ── session_tab.py — PostRecordingDialog ────────────────
@@ -284,6 +289,9 @@ e dei misteri da svelare nel corso della campagna.</em></p>
 <li><em>Nessuna quest completata.</em></li>
 </ul>
 """,
+    "quest_log.empty.active": "Nessuna quest registrata al momento.",
+    "quest_log.empty.clues": "Nessun indizio al momento.",
+    "quest_log.empty.completed": "Nessuna quest completata.",
     # ── journal.py ──────────────────────────────────────────
     "journal.default_html": """\
 <h1 style="color:#d4af37; text-align:center;">Diario &mdash; {campaign_name}</h1>
@@ -346,9 +354,13 @@ saranno registrati qui per i posteri.</em></p>
     # ── quest_extractor.py ──────────────────────────────────
     "quest_extractor.error.no_api_key": "Chiave API Mistral non configurata.",
     "quest_extractor.error.generic": "Errore di estrazione delle quest: {error}",
+    "quest_extractor.error.bad_delta": "Il modello non ha restituito un aggiornamento delle quest valido ({error})",
     "quest_extractor.no_quests": "(Nessuna quest registrata)",
     "quest_extractor.dialog_title": "Aggiornamento delle quest",
-    "quest_extractor.dialog_label": "Modifiche proposte — modifica se necessario:",
+    "quest_extractor.dialog_label": "Quest modificate da questa sessione — deseleziona le modifiche che non vuoi:",
+    "quest_extractor.change.add": "Nuova: {name}",
+    "quest_extractor.change.update": "Aggiornata: {name}",
+    "quest_extractor.change.complete": "Completata: {name}",
     # ── AI Prompts ──────────────────────────────────────────
     "prompt.summary_system": """\
 Sei un cronista epico dei Forgotten Realms, specializzato nella narrazione \
@@ -549,67 +561,21 @@ Sei un assistente specializzato nel tracciamento delle quest per una campagna \
 Dungeons & Dragons ({campaign_name}).
 
 A partire dal riepilogo di sessione sottostante e dallo stato attuale del quest log, \
-genera il quest log COMPLETO ricompilato e arricchito con le nuove \
-informazioni della sessione. Il quest log deve essere un documento vivo che \
-rifletta lo stato attuale di TUTTE le quest.
-
-REGOLA ASSOLUTA — RESTITUISCI SOLO HTML:
-- Restituisci SOLO il HTML puro del quest log, NIENT'ALTRO.
-- VIETATO: nessuna introduzione ("Ecco il quest log..."), nessuna conclusione, \
-  nessuna nota, nessun commento, niente ```, niente ---.
-- Il documento inizia con <h1> e finisce con </ul>.
-
-Struttura HTML esatta da produrre (tutte e 3 le sezioni DEVONO essere presenti):
-
-<h1 style="color:#d4af37; text-align:center;">Quest Log &mdash; {campaign_name}</h1>
-<hr>
-<p><em>Questo registro tiene traccia delle quest attive, degli indizi scoperti
-e dei misteri da svelare nel corso della campagna.</em></p>
-<hr>
-<h2 style="color:#6ab4d4;">{section_active_quests}</h2>
-<ul>
-<li><strong>Nome della quest</strong> — Descrizione generale della quest.
-  <ul>
-  <li><em>{quest_origin}:</em> Chi ha assegnato la quest, dove e quando.</li>
-  <li><em>{quest_objective}:</em> Cosa deve essere compiuto.</li>
-  <li><em>{quest_progress}:</em> Cosa e stato fatto finora.</li>
-  <li><em>{quest_next_step}:</em> Cosa resta da fare.</li>
-  <li><em>{quest_npcs}:</em> Personaggi coinvolti in questa quest.</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_clues}</h2>
-<ul>
-<li><strong>Mistero</strong> — Cosa si sa, cosa resta da scoprire.
-  <ul>
-  <li>Dettaglio o indizio scoperto...</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_completed_quests}</h2>
-<ul>
-<li><strong>Nome della quest</strong> — Risoluzione e conseguenze.
-  <ul>
-  <li><em>{quest_giver}:</em> Chi ha assegnato la quest e ricompensa.</li>
-  <li><em>{quest_resolution}:</em> Come la quest e stata risolta.</li>
-  </ul>
-</li>
-</ul>
+elenca SOLO le modifiche al quest log portate da questa sessione: nuove quest e \
+nuovi misteri, progressi delle quest esistenti, nuovi PNG e indizi, quest \
+completate e misteri risolti.
 
 Regole:
 - Scrivi in {language_name}, stile conciso e FATTUALE. Nessuna speculazione (niente \
   "potrebbe", "sembra", "suggerisce"). Scrivi solo cio che e noto.
 - Mantieni i termini D&D in inglese (Hit Points, Saving Throw, ecc.).
 - I nomi propri rimangono invariati.
-- Usa elenchi puntati annidati per i dettagli.
-- Sposta le quest risolte da "Quest Attive" a "Quest Completate".
-- PRESERVA TUTTE le informazioni esistenti del quest log. Non PERDERE NESSUN \
-  dettaglio (committente, ricompensa, PNG, progressi) dalle quest esistenti. \
-  Arricchisci con le nuove informazioni SENZA cancellare le vecchie.
-- Aggiungi le quest appena scoperte in "Quest Attive".
-- Aggiungi i nuovi indizi in "Indizi e Misteri". Rimuovi un indizio \
-  quando il mistero e risolto (menziona la risoluzione nella quest interessata).
-- Il quest log deve essere uno strumento di riferimento dettagliato, non solo un elenco.
+- Non ripetere cio che il quest log contiene gia: solo cio che questa \
+  sessione aggiunge o cambia.
+- Completa una quest solo quando il riepilogo dice che e stata risolta, e \
+  indicane la risoluzione.
+- Quando un mistero e risolto, completalo e menziona la risposta nella \
+  quest interessata.
 
 Stato attuale del quest log:
 ---
@@ -642,10 +608,22 @@ Riepilogo della sessione:
     "assistant.dialog.title": "Chiedi sulla tua campagna",
     "assistant.placeholder": "Fai una domanda sulla tua campagna...",
     "assistant.btn_ask": "Chiedi",
+    "assistant.btn_search": "Cerca",
+    "assistant.btn_search_tooltip": "Trova i passaggi del diario, del registro delle missioni e delle trascrizioni più vicini alla tua richiesta, senza interrogare l'IA",
+    "assistant.conversation_mode": "Modalità conversazione",
+    "assistant.conversation_mode_tooltip": "Le domande successive vengono poste insieme alle domande e risposte precedenti",
+    "assistant.btn_new_conversation": "Nuova conversazione",
     "assistant.thinking": "Sto pensando...",
+    "assistant.searching": "Ricerca in corso...",
+    "assistant.indexing": "Indicizzazione di {count} nuovi passaggi...",
     "assistant.error.no_api_key": "Configura la tua chiave API Mistral nelle Impostazioni.",
     "assistant.error.generic": "Errore: {error}",
     "assistant.error.no_campaign": "Nessuna campagna attiva selezionata.",
+    "assistant.context_stats": "{passages} passaggi recuperati in {ms} ms — ~{sent} di ~{total} token inviati ({saved}% risparmiati)",
+    "assistant.search.no_results": "Nessun passaggio corrispondente.",
+    "assistant.source.journal": "Diario",
+    "assistant.source.quest_log": "Registro missioni",
+    "assistant.source.transcript": "Trascrizione",
     # ── shortcuts_overlay.py ─────────────────────────────
     "app.menu.shortcuts": "Scorciatoie da tastiera...",
     "shortcuts.title": "Scorciatoie da tastiera",
@@ -670,6 +648,7 @@ Riepilogo della sessione:
     "shortcuts.tts_pause": "Pausa / Riprendi",
     "shortcuts.ask_campaign": "Chiedi sulla campagna",
     "shortcuts.tts_stop": "Ferma",
+    "prompt.assistant_earlier_questions": "In precedenza in questa conversazione il DM ha anche chiesto:\n{questions}",
     "prompt.campaign_assistant": """\
 Sei un assistente di campagna D&D. Rispondi alla domanda del DM basandoti \
 ESCLUSIVAMENTE sul diario di campagna e sul quest log forniti di seguito. \
@@ -80,6 +80,8 @@ STRINGS: dict[str, str] = {
     "app.sync.conflict": "Drive: conflict gedetecteerd",
     "app.sync.error": "Drive: fout",
     "app.sync.offline": "Drive: offline",
+    "app.cache.status": "Transcriptcache: {hits} treffers / {misses} missers",
+    "app.api_stats.line": "{kind}: {requests} verzoeken, {retries} herhalingen, {failures} mislukt — gem. {avg}s, max {max}s, wachttijd limiet {wait}s",
     # ── app.py — updater ────────────────────────────────────
     "app.update.title": "Update",
     "app.update.available_title": "Update beschikbaar",
@@ -132,6 +134,7 @@ STRINGS: dict[str, str] = {
     "settings.audio.test_title": "Microfoontest",
     "settings.advanced.auto_update": "Bij opstarten controleren op updates",
     "settings.advanced.chunk_label": "Maximale fragmentduur:",
+    "settings.advanced.parallelism_label": "Parallelle fragmenttranscripties:",
     "settings.advanced.bias_label": "D&D-contextbias:",
     "settings.advanced.bias_placeholder": "D&D-termen (één per regel)...",
     "settings.advanced.themed_cursors": "Thematische cursors gebruiken in editors",
@@ -195,6 +198,7 @@ STRINGS: dict[str, str] = {
     "session.status.added_journal": "Samenvatting toegevoegd aan Dagboek!",
     "session.status.quest_extracting": "Quests extraheren...",
     "session.status.quest_ready": "Questvoorstellen gereed.",
+    "session.status.quest_no_changes": "Geen questwijzigingen in deze sessie.",
     "session.status.quest_updated": "Quests bijgewerkt!",
     "session.status.quest_cancelled": "Quest-update geannuleerd.",
     "session.status.imported": "Audio geïmporteerd: {name} ({size})",
@@ -220,6 +224,7 @@ STRINGS: dict[str, str] = {
     "session.resummarize.no_sessions": "Geen eerdere sessies met transcripties gevonden.",
     "session.resummarize.replace_journal": "Dagboekvermelding vervangen",
     "session.resummarize.btn": "Opnieuw samenvatten",
+    "session.resummarize.resumable": "hervatbaar ({done}/{total} fragmenten klaar)",
     "session.status.replaced_journal": "Dagboekvermelding vervangen.",
     "session.tts.read_selection": "Selectie voorlezen",
     # ── session_tab.py — PostRecordingDialog ────────────────
@@ -284,6 +289,9 @@ en mysteries bij die gedurende de campagne ontrafeld moeten worden.</em></p>
 <li><em>Geen quests voltooid.</em></li>
 </ul>
 """,
+    "quest_log.empty.active": "Nog geen quests geregistreerd.",
+    "quest_log.empty.clues": "Nog geen aanwijzingen.",
+    "quest_log.empty.completed": "Geen quests voltooid.",
     # ── journal.py ──────────────────────────────────────────
     "journal.default_html": """\
 <h1 style="color:#d4af37; text-align:center;">Dagboek &mdash; {campaign_name}</h1>
@@ -346,9 +354,13 @@ worden hier voor het nageslacht vastgelegd.</em></p>
     # ── quest_extractor.py ──────────────────────────────────
     "quest_extractor.error.no_api_key": "Mistral API-sleutel niet geconfigureerd.",
     "quest_extractor.error.generic": "Quest-extractiefout: {error}",
+    "quest_extractor.error.bad_delta": "Het model gaf geen geldige questupdate terug ({error})",
     "quest_extractor.no_quests": "(Geen quests geregistreerd)",
     "quest_extractor.dialog_title": "Quest-update",
-    "quest_extractor.dialog_label": "Voorgestelde wijzigingen — bewerk indien nodig:",
+    "quest_extractor.dialog_label": "Quests gewijzigd door deze sessie — vink wijzigingen uit die je niet wilt:",
+    "quest_extractor.change.add": "Nieuw: {name}",
+    "quest_extractor.change.update": "Bijgewerkt: {name}",
+    "quest_extractor.change.complete": "Voltooid: {name}",
     # ── AI Prompts ──────────────────────────────────────────
     "prompt.summary_system": """\
 Je bent een epische kroniekschrijver van de Forgotten Realms, gespecialiseerd \
@@ -549,69 +561,22 @@ Tekst:
 Je bent een assistent gespecialiseerd in het bijhouden van quests voor een \
 Dungeons & Dragons-campagne ({campaign_name}).
 
-Genereer op basis van de onderstaande sessiesamenvatting en de huidige staat \
-van de quest log het VOLLEDIGE opnieuw samengestelde quest log verrijkt met \
-de nieuwe sessie-informatie. De quest log moet een levend document zijn dat \
-de huidige staat van ALLE quests weerspiegelt.
-
-ABSOLUTE REGEL — GEEF ALLEEN HTML TERUG:
-- Geef ALLEEN de ruwe HTML van de quest log terug, NIETS anders.
-- VERBODEN: geen inleiding ("Hier is de quest log..."), geen conclusie, \
-  geen notities, geen commentaar, geen ```, geen ---.
-- Het document begint met <h1> en eindigt met </ul>.
-
-Exacte HTML-structuur om te produceren (alle 3 secties MOETEN aanwezig zijn):
-
-<h1 style="color:#d4af37; text-align:center;">Quest Log &mdash; {campaign_name}</h1>
-<hr>
-<p><em>Dit register houdt actieve quests, ontdekte aanwijzingen
-en mysteries bij die gedurende de campagne ontrafeld moeten worden.</em></p>
-<hr>
-<h2 style="color:#6ab4d4;">{section_active_quests}</h2>
-<ul>
-<li><strong>Questnaam</strong> — Algemene beschrijving van de quest.
-  <ul>
-  <li><em>{quest_origin}:</em> Wie de quest gaf, waar en wanneer.</li>
-  <li><em>{quest_objective}:</em> Wat er bereikt moet worden.</li>
-  <li><em>{quest_progress}:</em> Wat er tot nu toe gedaan is.</li>
-  <li><em>{quest_next_step}:</em> Wat er nog gedaan moet worden.</li>
-  <li><em>{quest_npcs}:</em> Personages betrokken bij deze quest.</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_clues}</h2>
-<ul>
-<li><strong>Mysterie</strong> — Wat bekend is, wat nog ontdekt moet worden.
-  <ul>
-  <li>Ontdekt detail of aanwijzing...</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_completed_quests}</h2>
-<ul>
-<li><strong>Questnaam</strong> — Afloop en gevolgen.
-  <ul>
-  <li><em>{quest_giver}:</em> Wie de quest gaf en de beloning.</li>
-  <li><em>{quest_resolution}:</em> Hoe de quest is afgerond.</li>
-  </ul>
-</li>
-</ul>
+Geef op basis van de onderstaande sessiesamenvatting en de huidige staat \
+van de quest log ALLEEN de wijzigingen aan de quest log die deze sessie \
+brengt: nieuwe quests en mysteries, voortgang van bestaande quests, nieuwe \
+NPC's en aanwijzingen, voltooide quests en opgeloste mysteries.
 
 Regels:
 - Schrijf in het {language_name}, beknopt en FEITELIJK. Geen speculatie (geen \
   "zou kunnen", "lijkt", "suggereert"). Schrijf alleen wat bekend is.
 - Houd D&D-termen in het Engels (Hit Points, Saving Throw, enz.).
 - Eigennamen blijven ongewijzigd.
-- Gebruik geneste opsommingslijsten voor details.
-- Verplaats afgeronde quests van "Actieve Quests" naar "Voltooide Quests".
-- BEWAAR ALLE bestaande quest log-informatie. VERLIES GEEN ENKEL \
-  detail (questgever, beloning, NPC's, voortgang) van bestaande quests. \
-  Verrijk met nieuwe informatie ZONDER oude informatie te verwijderen.
-- Voeg nieuw ontdekte quests toe aan "Actieve Quests".
-- Voeg nieuwe aanwijzingen toe aan "Aanwijzingen en Mysteries". Verwijder \
-  een aanwijzing wanneer het mysterie is opgelost (vermeld de oplossing \
-  bij de gerelateerde quest).
-- De quest log moet een gedetailleerd naslagwerk zijn, niet slechts een lijst.
+- Herhaal niet wat de quest log al bevat: alleen wat deze sessie \
+  toevoegt of wijzigt.
+- Voltooi een quest alleen als de samenvatting zegt dat hij is opgelost, en \
+  vermeld de oplossing.
+- Als een mysterie is opgelost, voltooi het en vermeld het antwoord bij de \
+  gerelateerde quest.
 
 Huidige staat van de quest log:
 ---
@@ -644,10 +609,22 @@ Sessiesamenvatting:
     "assistant.dialog.title": "Vraag over uw campagne",
     "assistant.placeholder": "Stel een vraag over uw campagne...",
     "assistant.btn_ask": "Vraag",
+    "assistant.btn_search": "Zoeken",
+    "assistant.btn_search_tooltip": "Vind de passages uit het journaal, het questlogboek en de transcripties die het dichtst bij je vraag liggen, zonder de AI te raadplegen",
+    "assistant.conversation_mode": "Gespreksmodus",
+    "assistant.conversation_mode_tooltip": "Vervolgvragen worden gesteld samen met de vorige vragen en antwoorden",
+    "assistant.btn_new_conversation": "Nieuw gesprek",
     "assistant.thinking": "Nadenken...",
+    "assistant.searching": "Zoeken...",
+    "assistant.indexing": "{count} nieuwe passages indexeren...",
     "assistant.error.no_api_key": "Configureer uw Mistral API-sleutel in Instellingen.",
     "assistant.error.generic": "Fout: {error}",
     "assistant.error.no_campaign": "Geen actieve campagne geselecteerd.",
+    "assistant.context_stats": "{passages} passages gevonden in {ms} ms — ~{sent} van ~{total} tokens verzonden ({saved}% bespaard)",
+    "assistant.search.no_results": "Geen overeenkomende passages.",
+    "assistant.source.journal": "Journaal",
+    "assistant.source.quest_log": "Questlogboek",
+    "assistant.source.transcript": "Transcriptie",
     # ── shortcuts_overlay.py ─────────────────────────────
     "app.menu.shortcuts": "Sneltoetsen...",
     "shortcuts.title": "Sneltoetsen",
@@ -672,6 +649,7 @@ Sessiesamenvatting:
     "shortcuts.tts_pause": "Pauze / Hervatten",
     "shortcuts.ask_campaign": "Vraag over campagne",
     "shortcuts.tts_stop": "Stop",
+    "prompt.assistant_earlier_questions": "Eerder in dit gesprek vroeg de DM ook:\n{questions}",
     "prompt.campaign_assistant": """\
 Je bent een D&D-campagne-assistent. Beantwoord de vraag van de DM uitsluitend \
 op basis van het campagnedagboek en quest log hieronder. Wees specifiek — noem \
@@ -80,6 +80,8 @@ STRINGS: dict[str, str] = {
     "app.sync.conflict": "Drive: conflito detetado",
     "app.sync.error": "Drive: erro",
     "app.sync.offline": "Drive: offline",
+    "app.cache.status": "Cache de transcrição: {hits} acertos / {misses} falhas",
+    "app.api_stats.line": "{kind}: {requests} pedidos, {retries} repetições, {failures} falhas — média {avg}s, máx {max}s, espera por limite {wait}s",
     # ── app.py — updater ────────────────────────────────────
     "app.update.title": "Atualização",
     "app.update.available_title": "Atualização disponível",
@@ -132,6 +134,7 @@ STRINGS: dict[str, str] = {
     "settings.audio.test_title": "Teste de microfone",
     "settings.advanced.auto_update": "Verificar atualizações ao iniciar",
     "settings.advanced.chunk_label": "Duração máxima do segmento:",
+    "settings.advanced.parallelism_label": "Transcrições de segmentos em paralelo:",
     "settings.advanced.bias_label": "Contexto D&D (bias):",
     "settings.advanced.bias_placeholder": "Termos D&D (um por linha)...",
     "settings.advanced.themed_cursors": "Usar cursores temáticos nos editores",
@@ -195,6 +198,7 @@ STRINGS: dict[str, str] = {
     "session.status.added_journal": "Resumo adicionado ao Diário!",
     "session.status.quest_extracting": "A extrair quests...",
     "session.status.quest_ready": "Propostas de quests prontas.",
+    "session.status.quest_no_changes": "Sem alterações de quests nesta sessão.",
     "session.status.quest_updated": "Quests atualizadas!",
     "session.status.quest_cancelled": "Atualização de quests cancelada.",
     "session.status.imported": "Áudio importado: {name} ({size})",
@@ -220,6 +224,7 @@ STRINGS: dict[str, str] = {
     "session.resummarize.no_sessions": "Nenhuma sessão anterior com transcrições encontrada.",
     "session.resummarize.replace_journal": "Substituir entrada do diário",
     "session.resummarize.btn": "Re-resumir",
+    "session.resummarize.resumable": "retomável ({done}/{total} segmentos concluídos)",
     "session.status.replaced_journal": "Entrada do diário substituída.",
     "session.tts.read_selection": "Ler seleção",
     # ── session_tab.py — PostRecordingDialog ────────────────
@@ -284,6 +289,9 @@ e mistérios a desvendar ao longo da campanha.</em></p>
 <li><em>Nenhuma quest concluída.</em></li>
 </ul>
 """,
+    "quest_log.empty.active": "Nenhuma quest registada ainda.",
+    "quest_log.empty.clues": "Nenhuma pista ainda.",
+    "quest_log.empty.completed": "Nenhuma quest concluída.",
     # ── journal.py ──────────────────────────────────────────
     "journal.default_html": """\
 <h1 style="color:#d4af37; text-align:center;">Diário &mdash; {campaign_name}</h1>
@@ -346,9 +354,13 @@ serão aqui registados para a posteridade.</em></p>
     # ── quest_extractor.py ──────────────────────────────────
     "quest_extractor.error.no_api_key": "Chave API Mistral não configurada.",
     "quest_extractor.error.generic": "Erro de extração de quests: {error}",
+    "quest_extractor.error.bad_delta": "O modelo não devolveu uma atualização de quests válida ({error})",
     "quest_extractor.no_quests": "(Nenhuma quest registada)",
     "quest_extractor.dialog_title": "Atualização de quests",
-    "quest_extractor.dialog_label": "Alterações propostas — edite se necessário:",
+    "quest_extractor.dialog_label": "Quests alteradas por esta sessão — desmarca as alterações que não queres:",
+    "quest_extractor.change.add": "Nova: {name}",
+    "quest_extractor.change.update": "Atualizada: {name}",
+    "quest_extractor.change.complete": "Concluída: {name}",
     # ── AI Prompts ──────────────────────────────────────────
     "prompt.summary_system": """\
 És um cronista épico dos Forgotten Realms, especializado em narrar \
@@ -548,67 +560,21 @@ Texto:
 de Dungeons & Dragons ({campaign_name}).
 
 A partir do resumo da sessão abaixo e do estado atual do quest log, \
-gera o quest log COMPLETO recompilado e enriquecido com as novas \
-informações da sessão. O quest log deve ser um documento vivo que \
-reflete o estado atual de TODAS as quests.
-
-REGRA ABSOLUTA — DEVOLVE APENAS HTML:
-- Devolve APENAS o HTML bruto do quest log, NADA mais.
-- PROIBIDO: sem introdução ("Aqui está o quest log..."), sem conclusão, \
-  sem notas, sem comentários, sem ```, sem ---.
-- O documento começa com <h1> e termina com </ul>.
-
-Estrutura HTML exata a produzir (as 3 secções DEVEM estar presentes):
-
-<h1 style="color:#d4af37; text-align:center;">Quest Log &mdash; {campaign_name}</h1>
-<hr>
-<p><em>Este registo acompanha as quests ativas, pistas descobertas
-e mistérios a desvendar ao longo da campanha.</em></p>
-<hr>
-<h2 style="color:#6ab4d4;">{section_active_quests}</h2>
-<ul>
-<li><strong>Nome da quest</strong> — Descrição geral da quest.
-  <ul>
-  <li><em>{quest_origin}:</em> Quem deu a quest, onde e quando.</li>
-  <li><em>{quest_objective}:</em> O que deve ser realizado.</li>
-  <li><em>{quest_progress}:</em> O que foi feito até agora.</li>
-  <li><em>{quest_next_step}:</em> O que falta fazer.</li>
-  <li><em>{quest_npcs}:</em> Personagens envolvidos nesta quest.</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_clues}</h2>
-<ul>
-<li><strong>Mistério</strong> — O que se sabe, o que falta descobrir.
-  <ul>
-  <li>Detalhe ou pista descoberta...</li>
-  </ul>
-</li>
-</ul>
-<h2 style="color:#6ab4d4;">{section_completed_quests}</h2>
-<ul>
-<li><strong>Nome da quest</strong> — Resolução e consequências.
-  <ul>
-  <li><em>{quest_giver}:</em> Quem deu a quest e recompensa.</li>
-  <li><em>{quest_resolution}:</em> Como a quest foi resolvida.</li>
-  </ul>
-</li>
-</ul>
+lista APENAS as alterações ao quest log trazidas por esta sessão: novas \
+quests e mistérios, progresso das quests existentes, novos NPCs e pistas, \
+quests concluídas e mistérios resolvidos.
 
 Regras:
 - Escreve em {language_name}, estilo conciso e FACTUAL. Sem especulação (sem \
   "poderia", "parece", "sugere"). Escreve apenas o que é conhecido.
 - Mantém os termos de D&D em inglês (Hit Points, Saving Throw, etc.).
 - Os nomes próprios permanecem tal como são.
-- Usa listas com marcadores aninhados para detalhes.
-- Move quests resolvidas de "Quests Ativas" para "Quests Concluídas".
-- PRESERVA TODAS as informações existentes no quest log. Não PERCAS NENHUM \
-  detalhe (quest giver, recompensa, NPCs, progresso) das quests existentes. \
-  Enriquece com novas informações SEM apagar informações antigas.
-- Adiciona quests recém-descobertas às "Quests Ativas".
-- Adiciona novas pistas às "Pistas e Mistérios". Remove uma pista \
-  quando o mistério é resolvido (menciona a resolução na quest relacionada).
-- O quest log deve ser uma ferramenta de referência detalhada, não apenas uma lista.
+- Não repitas o que o quest log já contém: apenas o que esta sessão \
+  acrescenta ou altera.
+- Conclui uma quest apenas quando o resumo disser que foi resolvida, e \
+  indica a sua resolução.
+- Quando um mistério for resolvido, conclui-o e menciona a resposta na \
+  quest relacionada.
 
 Estado atual do quest log:
 ---
@@ -641,10 +607,22 @@ Resumo da sessão:
     "assistant.dialog.title": "Perguntar sobre a sua campanha",
     "assistant.placeholder": "Faça uma pergunta sobre a sua campanha...",
     "assistant.btn_ask": "Perguntar",
+    "assistant.btn_search": "Pesquisar",
+    "assistant.btn_search_tooltip": "Encontrar as passagens do diário, do registo de missões e das transcrições mais próximas da sua pesquisa, sem perguntar à IA",
+    "assistant.conversation_mode": "Modo conversa",
+    "assistant.conversation_mode_tooltip": "As perguntas de seguimento são feitas com as perguntas e respostas anteriores",
+    "assistant.btn_new_conversation": "Nova conversa",
     "assistant.thinking": "A pensar...",
+    "assistant.searching": "A pesquisar...",
+    "assistant.indexing": "A indexar {count} novas passagens...",
     "assistant.error.no_api_key": "Configure a sua chave API Mistral nas Definições.",
     "assistant.error.generic": "Erro: {error}",
     "assistant.error.no_campaign": "Nenhuma campanha ativa selecionada.",
+    "assistant.context_stats": "{passages} passagens recuperadas em {ms} ms — ~{sent} de ~{total} tokens enviados ({saved}% poupados)",
+    "assistant.search.no_results": "Nenhuma passagem correspondente.",
+    "assistant.source.journal": "Diário",
+    "assistant.source.quest_log": "Registo de missões",
+    "assistant.source.transcript": "Transcrição",
     # ── shortcuts_overlay.py ─────────────────────────────
     "app.menu.shortcuts": "Atalhos de teclado...",
     "shortcuts.title": "Atalhos de teclado",
@@ -669,6 +647,7 @@ Resumo da sessão:
     "shortcuts.tts_pause": "Pausa / Retomar",
     "shortcuts.ask_campaign": "Perguntar sobre a campanha",
     "shortcuts.tts_stop": "Parar",
+    "prompt.assistant_earlier_questions": "Anteriormente nesta conversa, o DM também perguntou:\n{questions}",
     "prompt.campaign_assistant": """\
 És um assistente de campanha de D&D. Responde à pergunta do DM baseando-te \
 APENAS no diário de campanha e no quest log fornecidos abaixo. Sê específico — \
@@ -1,13 +1,24 @@
-"""Journal — chronicle of epic session summaries."""
+"""Journal — chronicle of epic session summaries.
+
+The journal is stored one session per file (see :mod:`journal_store`).  The
+editor holds the header and the newest ``journal_page_sessions`` sessions;
+older ones are paged in when the user scrolls to the top or searches for
+text they contain, and a save only writes the sessions that changed.
+"""
 
 import re
 from datetime import datetime
 
-from PySide6.QtGui import QTextCursor
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QTextBlock, QTextCursor
 
 from .i18n import tr
+from .journal_store import JournalStore, split_sections
 from .rich_editor import RichTextEditorWidget
-from .utils import active_campaign_name, journal_path
+from .utils import active_campaign_name, ensure_dir, journal_dir
+
+_TRAILING_RULES = re.compile(r"(?:<hr[^>]*>\s*)+$", re.IGNORECASE)
+_RELOAD_DELAY_MS = 1000  # downloads of one sync poll land within this of each other
 
 
 def _default_journal_html(campaign_name: str) -> str:
@@ -15,20 +26,176 @@ def _default_journal_html(campaign_name: str) -> str:
     return tr("journal.default_html", campaign_name=campaign_name)
 
 
+def _is_session_heading(block: QTextBlock) -> bool:
+    """True for the blocks ``toHtml()`` writes as a top-level ``<h2>``."""
+    return block.blockFormat().headingLevel() == 2 and block.textList() is None
+
+
 class JournalWidget(RichTextEditorWidget):
     """Rich-text journal for epic session summaries."""
 
     def __init__(self, config: dict, parent=None):
         self._config = config
+        self._store = None
+        self._first = 0  # store index of the oldest session loaded in the editor
+        self._loaded_ids = []  # shard ids of the loaded sessions; a heading's userState indexes this
+        self._page_scheduled = False
+        self._pending_reload = set()  # journal files downloaded since the last reload
         cname = active_campaign_name(config)
         super().__init__(
-            file_path=journal_path(config),
+            file_path=journal_dir(config),
             default_html=_default_journal_html(cname),
             editor_object_name="journal_editor",
             foldable_heading_levels={2},
             fold_by_default=True,
             parent=parent,
         )
+        self.editor.verticalScrollBar().actionTriggered.connect(self._on_scroll_action)
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(_RELOAD_DELAY_MS)
+        self._reload_timer.timeout.connect(self._reload_pending)
+
+    def _page_size(self) -> int:
+        return max(1, int(self._config.get("journal_page_sessions", 20)))
+
+    # ── Loading ───────────────────────────────────────────
+
+    def _load(self):
+        ensure_dir(self._path)
+        self._store = JournalStore.open(self._path)
+        self._first = self._store.first_available(max(0, len(self._store.sessions) - self._page_size()))
+        self._show_window()
+
+    def _show_window(self):
+        """Load the header and the sessions from ``self._first`` on into the editor."""
+        if self._store.is_empty():
+            self.editor.setHtml(self._default_html)
+        else:
+            self.editor.setHtml(self._strip_inline_fonts(self._store.window_html(self._first)))
+        self._loaded_ids = [s["id"] for s in self._store.sessions[self._first :]]
+        self._tag_headings()
+
+    def _tag_headings(self):
+        """Tag each session heading with the position of its shard in ``_loaded_ids``."""
+        n = 0
+        block = self.editor.document().begin()
+        while block.isValid():
+            if _is_session_heading(block):
+                block.setUserState(n if n < len(self._loaded_ids) else -1)
+                n += 1
+            block = block.next()
+
+    def _heading_ids(self) -> list[str | None]:
+        """Shard id of each session heading in the editor, None for new or duplicated headings."""
+        ids, seen = [], set()
+        block = self.editor.document().begin()
+        while block.isValid():
+            if _is_session_heading(block):
+                state = block.userState()
+                shard_id = self._loaded_ids[state] if 0 <= state < len(self._loaded_ids) else None
+                ids.append(None if shard_id in seen else shard_id)
+                seen.add(shard_id)
+            block = block.next()
+        return ids
+
+    def _on_scroll_action(self, _action: int):
+        vbar = self.editor.verticalScrollBar()
+        if self._first > 0 and vbar.sliderPosition() <= vbar.minimum() and not self._page_scheduled:
+            self._page_scheduled = True
+            QTimer.singleShot(0, self._load_older)
+
+    def _load_older(self, until: int | None = None):
+        """Page older sessions into the editor: one page, or down to session *until*.
+
+        Pending edits are saved first, then the window is rebuilt with the
+        scroll position (from the bottom) and the expanded sessions kept.
+        """
+        self._page_scheduled = False
+        target = max(0, self._first - self._page_size()) if until is None else min(until, self._first)
+        target = self._store.first_available(target)
+        if target >= self._first:
+            return
+        self.save()
+        doc = self.editor.document()
+        vbar = self.editor.verticalScrollBar()
+        from_bottom = vbar.maximum() - vbar.value()
+        old_blocks = doc.blockCount()
+        header_blocks = next((b for b in range(old_blocks) if _is_session_heading(doc.findBlockByNumber(b))), 0)
+        expanded = [start for start, folded in self._fold_mgr.save_fold_state().items() if not folded]
+
+        self._first = target
+        self.editor.blockSignals(True)
+        self._show_window()
+        self.editor.blockSignals(False)
+        shift = doc.blockCount() - old_blocks
+        self._fold_mgr.fold_all()
+        for start in expanded:
+            self._fold_mgr.unfold_at(start + shift if start >= header_blocks else start)
+        self._fold_gutter.update()
+        vbar.setValue(vbar.maximum() - from_bottom)
+
+    def _on_search_changed(self, text: str):
+        if text and self._first > 0:
+            oldest = self._store.find_oldest(text, self._first)
+            if oldest is not None:
+                self._load_older(oldest)
+        super()._on_search_changed(text)
+
+    def reload_from_disk(self, file_name: str | None = None):
+        """Reload the editor after a remote sync downloaded the journal file *file_name* (None: any).
+
+        The downloads of one sync poll are reloaded together, and not at all
+        when they only touch sessions older than the loaded ones.
+        """
+        self._pending_reload.add(file_name)
+        self._reload_timer.start()
+
+    def _reload_pending(self):
+        """Rebuild the window from disk, keeping the scroll position and the expanded sessions."""
+        names, self._pending_reload = self._pending_reload, set()
+        if names <= {f"{s['id']}.html" for s in self._store.sessions[: self._first]}:
+            return
+        self._join_save_thread()
+        doc = self.editor.document()
+        expanded = set()
+        for start, folded in self._fold_mgr.save_fold_state().items():
+            state = doc.findBlockByNumber(start).userState()
+            if not folded and 0 <= state < len(self._loaded_ids):
+                expanded.add(self._loaded_ids[state])
+        loaded = max(len(self._store.sessions) - self._first, self._page_size())
+        self._store = JournalStore.open(self._path)
+        self._first = self._store.first_available(max(0, len(self._store.sessions) - loaded))
+        vbar = self.editor.verticalScrollBar()
+        scroll_pos = vbar.value()
+        self.editor.blockSignals(True)
+        self._show_window()
+        self.editor.blockSignals(False)
+        self._fold_mgr.fold_all()
+        for start in self._fold_mgr.save_fold_state():
+            state = doc.findBlockByNumber(start).userState()
+            if 0 <= state < len(self._loaded_ids) and self._loaded_ids[state] in expanded:
+                self._fold_mgr.unfold_at(start)
+        self._fold_gutter.update()
+        vbar.setValue(scroll_pos)
+
+    # ── Saving ────────────────────────────────────────────
+
+    def _snapshot(self) -> list[tuple[str, str | None]]:
+        """Writes for the header and the loaded sessions that changed, plus the index."""
+        header, sections = split_sections(self.editor.toHtml())
+        ids = self._heading_ids()
+        if len(ids) != len(sections):  # a session heading inside a table: cut by position
+            ids = (self._loaded_ids + [None] * len(sections))[: len(sections)]
+        writes = self._store.plan(header, list(zip(ids, sections)), self._loaded_ids)
+        self._loaded_ids = [s["id"] for s in self._store.sessions[self._first :]]
+        self._tag_headings()
+        return writes
+
+    def _save_failed(self):
+        self._store.forget_digests()
+
+    # ── Sessions ──────────────────────────────────────────
 
     def append_summary(self, summary_html: str):
         """Append a dated summary section at the end of the journal."""
@@ -41,38 +208,28 @@ class JournalWidget(RichTextEditorWidget):
         self.save()
 
     def get_session_headings(self) -> list[str]:
-        """Return the text of all <h2> session headings in the journal."""
-        html = self.editor.toHtml()
-        return re.findall(r"<h2[^>]*>.*?(Session[^<]+)<", html, re.DOTALL | re.IGNORECASE)
+        """Return the text of all <h2> session headings in the journal, loaded or not."""
+        self.save()
+        matches = (re.search(r"Session.*", s["title"], re.IGNORECASE) for s in self._store.sessions)
+        return [m.group(0) for m in matches if m]
 
     def replace_section(self, heading_text: str, summary_html: str):
-        """Replace the journal section whose <h2> contains heading_text."""
-        html = self.editor.toHtml()
-
-        # Step 1: Find the <h2> tag that contains the heading text (may be wrapped in <span>)
-        escaped = re.escape(heading_text)
-        h2_pattern = re.compile(r"<h2[^>]*>(?:(?!</h2>).)*?" + escaped + r"(?:(?!</h2>).)*?</h2>", re.DOTALL)
-        h2_match = h2_pattern.search(html)
-        if not h2_match:
-            return False
+        """Replace the journal section whose <h2> contains heading_text.
 
-        # Step 2: Find the preceding <hr> if any (belongs to this section)
-        section_start = h2_match.start()
-        before = html[:section_start]
-        hr_match = re.search(r"<hr[^>]*/?\s*>\s*$", before, re.DOTALL)
-        if hr_match:
-            section_start = hr_match.start()
-
-        # Step 3: Find the end of this section (next <hr> before <h2>, or </body>)
-        after_h2 = html[h2_match.end() :]
-        end_pattern = re.compile(r"<hr[^>]*/?\s*>\s*(?=<h2[^>]*>)|(?=</body>)", re.DOTALL)
-        end_match = end_pattern.search(after_h2)
-        section_end = h2_match.end() + end_match.start() if end_match else len(html)
-
-        # Step 4: Build replacement
-        heading_tag = f'<hr><h2 style="color:#d4af37;">{heading_text}</h2>'
-        replacement = f"{heading_tag}{summary_html}"
-        new_html = html[:section_start] + replacement + html[section_end:]
-        self.editor.setHtml(new_html)
+        Only that session's file is rewritten; the editor is reloaded if the
+        session is among the loaded ones.
+        """
         self.save()
+        sessions = self._store.sessions
+        index = next((i for i, s in enumerate(sessions) if heading_text in s["title"]), None)
+        if index is None:
+            return False
+        shard_id = sessions[index]["id"]
+        trailing = _TRAILING_RULES.search(self._store.read(shard_id))  # the rule before the next session
+        fragment = f'<h2 style="color:#d4af37;">{heading_text}</h2>{summary_html}'
+        self._write_now(self._store.replace(shard_id, fragment + (trailing.group(0) if trailing else "")))
+        if index >= self._first:
+            self._show_window()
+            self._fold_mgr.fold_all()
+            self._fold_gutter.update()
         return True
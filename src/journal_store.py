@@ -0,0 +1,269 @@
+"""Sharded journal storage.
+
+The journal of a campaign is kept in a ``journal/`` directory instead of a
+single ``journal.html``: ``header.html`` holds what comes before the first
+session heading and every ``<h2>`` session section is a fragment of its
+own, ``<id>.html``.  ``index.json`` lists the sessions in document order
+with their heading text and the SHA-1 of their fragment, so the index
+changes whenever any fragment does.
+
+Fragments are slices of the body of the editor's ``toHtml()`` cut in front
+of each ``<h2``; joined back in order they give the journal body again.
+The journal editor loads only the newest sessions and pages older ones in
+on demand, and a save writes only the fragments whose digest changed, so
+neither startup nor Drive sync has to move the whole campaign history.
+
+A ``journal.html`` from earlier versions is split into fragments when the
+journal is opened without any session (the first time, or after sync
+fetched one from Drive) and kept as ``journal.html.pre_shard.bak``.
+"""
+
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+
+log = logging.getLogger(__name__)
+
+INDEX_NAME = "index.json"
+HEADER_NAME = "header.html"
+_VERSION = 1
+
+# The head Qt writes with toHtml(); its white-space rule keeps fragments stable across save and load.
+_DOCUMENT = (
+    '<html><head><meta name="qrichtext" content="1" /><style type="text/css">\n'
+    "p, li {{ white-space: pre-wrap; }}\nhr {{ height: 1px; border-width: 0; }}\n"
+    "</style></head><body>{}</body></html>"
+)
+_SECTION_SPLIT = re.compile(r"(?=<h2[\s>])", re.IGNORECASE)
+_BODY = re.compile(r"<body[^>]*>(.*)</body>", re.IGNORECASE | re.DOTALL)
+_HEADING = re.compile(r"<h2[^>]*>(.*?)</h2>", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]+>")
+_USER_STATE = re.compile(r" -qt-user-state:-?\d+;")  # the editor's shard tags, not content
+
+
+def _digest(fragment: str) -> str:
+    return hashlib.sha1(fragment.encode("utf-8")).hexdigest()
+
+
+def _plain_text(fragment: str) -> str:
+    return html.unescape(_TAG.sub("", fragment))
+
+
+def _title(fragment: str) -> str:
+    heading = _HEADING.search(fragment)
+    return " ".join(_plain_text(heading.group(1)).split()) if heading else ""
+
+
+def split_sections(document_html: str) -> tuple[str, list[str]]:
+    """Split a journal HTML document into its header and one fragment per ``<h2>`` section."""
+    body = _BODY.search(document_html)
+    body_html = _USER_STATE.sub("", body.group(1) if body else document_html)
+    header, *sections = _SECTION_SPLIT.split(body_html)
+    return header, sections
+
+
+def _new_id(fragment: str, taken) -> str:
+    """A short id derived from the fragment, so two clients splitting the same journal agree."""
+    base = _digest(fragment)[:12]
+    shard_id, n = base, 2
+    while shard_id in taken:
+        shard_id, n = f"{base}-{n}", n + 1
+    return shard_id
+
+
+class JournalStore:
+    """Index and fragments of one campaign's journal directory."""
+
+    def __init__(self, directory: str, data: dict | None = None):
+        self._dir = directory
+        self._data = data or {"version": _VERSION, "header": "", "sessions": []}
+        self._texts = {}  # shard id -> (digest, plain text), for searching unloaded sessions
+
+    @classmethod
+    def load(cls, directory: str) -> "JournalStore | None":
+        """Read the index of the journal in *directory*, or None if it has none; never writes."""
+        for path in (os.path.join(directory, INDEX_NAME), os.path.join(directory, INDEX_NAME + ".bak")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                log.error("Unreadable journal index %s: %s", path, e)
+                continue
+            if data.get("version") == _VERSION and isinstance(data.get("sessions"), list):
+                return cls(directory, data)
+        return None
+
+    @classmethod
+    def open(cls, directory: str) -> "JournalStore":
+        """Read the journal in *directory*, splitting a legacy single-file journal into it if it has no sessions."""
+        store = cls.load(directory)
+        if store is None or (not store.sessions and os.path.exists(directory + ".html")):
+            store = cls(directory)
+            store._migrate(directory + ".html")
+        return store
+
+    def _migrate(self, legacy_path: str):
+        try:
+            with open(legacy_path, encoding="utf-8") as f:
+                document_html = f.read()
+        except OSError:
+            return  # new campaign: the journal starts empty
+        header, sections = split_sections(document_html)
+        os.makedirs(self._dir, exist_ok=True)
+        for path, content in self.plan(header, [(None, s) for s in sections], []):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        os.replace(legacy_path, legacy_path + ".pre_shard.bak")
+        log.info("Split %s into %d journal sections", legacy_path, len(sections))
+
+    # ── Reading ───────────────────────────────────────────
+
+    @property
+    def directory(self) -> str:
+        """Folder holding the journal fragments."""
+        return self._dir
+
+    @property
+    def index_path(self) -> str:
+        """Path of the session index file."""
+        return os.path.join(self._dir, INDEX_NAME)
+
+    @property
+    def sessions(self) -> list[dict]:
+        """``{"id", "title", "digest"}`` of every session, oldest first."""
+        return self._data["sessions"]
+
+    def is_empty(self) -> bool:
+        """True when the journal has neither a header nor any session."""
+        return not self._data["header"] and not self.sessions
+
+    def path(self, shard_id: str) -> str:
+        """Path of the fragment for *shard_id*."""
+        return os.path.join(self._dir, f"{shard_id}.html")
+
+    def files(self) -> list[str]:
+        """Paths of the header and session fragments, in document order."""
+        paths = [os.path.join(self._dir, HEADER_NAME)] if self._data["header"] else []
+        return paths + [self.path(s["id"]) for s in self.sessions]
+
+    def _read(self, path: str) -> str:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except OSError as e:
+            log.warning("Missing journal fragment %s: %s", path, e)
+            return ""
+
+    def read(self, shard_id: str) -> str:
+        """HTML of the fragment for *shard_id*, or "" if it is missing."""
+        return self._read(self.path(shard_id))
+
+    def first_available(self, first: int) -> int:
+        """*first*, moved past any later session whose fragment is missing (e.g. not synced yet).
+
+        A window must not span a missing fragment: saving it would drop that
+        session from the index.
+        """
+        for i in range(len(self.sessions) - 1, first - 1, -1):
+            if not os.path.exists(self.path(self.sessions[i]["id"])):
+                return i + 1
+        return first
+
+    def window_html(self, first: int = 0) -> str:
+        """The header and the sessions from index *first* on, as one HTML document."""
+        parts = [self._read(os.path.join(self._dir, HEADER_NAME))] if self._data["header"] else []
+        parts.extend(self.read(s["id"]) for s in self.sessions[first:])
+        return _DOCUMENT.format("".join(parts))
+
+    def find_oldest(self, text: str, before: int) -> int | None:
+        """Index of the oldest session before *before* whose text contains *text* (case-insensitive)."""
+        needle = text.casefold()
+        for i, session in enumerate(self.sessions[:before]):
+            cached = self._texts.get(session["id"])
+            if cached is None or cached[0] != session["digest"]:
+                cached = (session["digest"], _plain_text(self.read(session["id"])).casefold())
+                self._texts[session["id"]] = cached
+            if needle in cached[1]:
+                return i
+        return None
+
+    # ── Writing ───────────────────────────────────────────
+
+    def plan(self, header: str, sections: list[tuple[str | None, str]], loaded: list[str]) -> list:
+        """Update the index for a new header and loaded *sections*; return the files to write.
+
+        *sections* are ``(shard id or None, fragment)`` pairs in document order
+        and replace the sessions listed in *loaded*, the newest ones; older
+        sessions are kept as they are.  Returns ``(path, content)`` pairs, with
+        ``None`` content for fragments to delete, and the index last.
+        """
+        kept = self.sessions[: len(self.sessions) - len(loaded)]
+        previous = {s["id"]: s for s in self.sessions[len(kept) :]}
+        taken = {s["id"] for s in kept}
+        writes, sessions = [], list(kept)
+        header_path = os.path.join(self._dir, HEADER_NAME)
+        if _digest(header) != self._data["header"] and (header.strip() or os.path.exists(header_path)):
+            writes.append((header_path, header))
+        for shard_id, fragment in sections:
+            if shard_id is None or shard_id in taken:
+                shard_id = _new_id(fragment, taken | previous.keys())
+            taken.add(shard_id)
+            digest = _digest(fragment)
+            old = previous.get(shard_id)
+            if old is None or old["digest"] != digest:
+                writes.append((self.path(shard_id), fragment))
+            sessions.append({"id": shard_id, "title": _title(fragment), "digest": digest})
+        writes.extend((self.path(shard_id), None) for shard_id in previous.keys() - taken)
+
+        data = {"version": _VERSION, "header": _digest(header) if header.strip() else "", "sessions": sessions}
+        if data != self._data or writes:
+            self._data = data
+            writes.append((self.index_path, self._index_json()))
+        return writes
+
+    def replace(self, shard_id: str, fragment: str) -> list:
+        """Replace the fragment of one session; return the files to write."""
+        for session in self.sessions:
+            if session["id"] == shard_id:
+                session["title"] = _title(fragment)
+                session["digest"] = _digest(fragment)
+        return [(self.path(shard_id), fragment), (self.index_path, self._index_json())]
+
+    def _index_json(self) -> str:
+        return json.dumps(self._data, ensure_ascii=False, indent=1)
+
+    def forget_digests(self):
+        """Make the next plan() rewrite every fragment (after a failed write)."""
+        self._data["header"] = "-" if self._data["header"] else ""
+        for session in self.sessions:
+            session["digest"] = ""
+
+
+def read_journal(directory: str) -> str:
+    """The whole journal in *directory* as one HTML document."""
+    return JournalStore.open(directory).window_html()
+
+
+def merge_indexes(local: str, remote: str) -> str:
+    """Merge two versions of a journal index, keeping the sessions of both.
+
+    The remote order wins; sessions only known locally follow the session
+    they followed locally.  Used when both sides changed since the last sync.
+    """
+    local_data, remote_data = json.loads(local), json.loads(remote)
+    merged = list(remote_data.get("sessions", []))
+    ids = [s["id"] for s in merged]
+    previous = None
+    for session in local_data.get("sessions", []):
+        if session["id"] not in ids:
+            at = ids.index(previous) + 1 if previous in ids else 0
+            merged.insert(at, session)
+            ids.insert(at, session["id"])
+        previous = session["id"]
+    remote_data["sessions"] = merged
+    return json.dumps(remote_data, ensure_ascii=False, indent=1)
@@ -0,0 +1,205 @@
+"""Process-wide Mistral client pool with rate limiting, retries and counters.
+
+Every AI worker goes through :func:`mistral_call` instead of building its own
+``Mistral`` client: clients are cached per API key so HTTP connections are
+reused, a shared token bucket keeps the whole app under the configured
+request rate, and failures are retried in one place:
+
+- 429: the whole bucket is paused for ``Retry-After`` (or 15s, 30s, 60s...),
+  so every worker backs off together.
+- 5xx and network errors: exponential backoff with full jitter.
+- anything else (401, 400...): raised immediately.
+
+Per-kind request/latency counters are kept so the time spent in each stage
+of the pipeline can be inspected with :func:`api_stats`.
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+_RATE_LIMIT_BASE_DELAY = 15  # seconds; doubled per attempt when no Retry-After
+_RETRY_BASE_DELAY = 2  # seconds; jittered backoff base for 5xx/network errors
+_MAX_RETRY_DELAY = 120  # seconds; cap for any single backoff
+_DEFAULT_RETRIES = 4
+
+# Per-call timeouts by kind of request (ms). Transcription uploads long audio.
+_TIMEOUTS_MS = {
+    "transcription": 15 * 60_000,
+    "chat": 5 * 60_000,
+    "embeddings": 60_000,
+}
+_DEFAULT_TIMEOUT_MS = 2 * 60_000
+
+
+class _TokenBucket:
+    """Thread-safe token bucket; ``hold()`` pauses it for everyone."""
+
+    def __init__(self, per_minute: float, burst: int):
+        self.per_minute = per_minute
+        self.burst = burst
+        self._rate = per_minute / 60.0
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._hold_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking as needed. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._hold_until:
+                    delay = self._hold_until - now
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self._rate)
+                    self._stamp = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self._rate
+            time.sleep(delay)
+            waited += delay
+
+    def hold(self, seconds: float):
+        """Block every acquire() for at least *seconds* from now."""
+        with self._lock:
+            self._hold_until = max(self._hold_until, time.monotonic() + seconds)
+
+
+def _status_code(exc: Exception) -> int | None:
+    """HTTP status of an SDK error, if any."""
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status
+    if "429" in str(exc):
+        return 429
+    return None
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Seconds requested by a ``Retry-After`` header on the error's response, if any."""
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "raw_response", None), "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_network_error(exc: Exception) -> bool:
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(exc, httpx.TransportError)
+
+
+class MistralPool:
+    """Shared Mistral clients, rate limiter and call statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}  # api_key -> Mistral
+        self._bucket = None
+        self._stats = {}  # kind -> counters
+
+    def client(self, api_key: str):
+        """Return the shared client for *api_key*, creating it on first use."""
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                from mistralai import Mistral
+
+                client = Mistral(api_key=api_key, timeout_ms=_DEFAULT_TIMEOUT_MS)
+                self._clients[api_key] = client
+            return client
+
+    def _get_bucket(self, config: dict) -> _TokenBucket:
+        per_minute = float(config.get("api_requests_per_minute", 60))
+        burst = max(1, int(config.get("api_burst", 5)))
+        with self._lock:
+            if self._bucket is None or (self._bucket.per_minute, self._bucket.burst) != (per_minute, burst):
+                self._bucket = _TokenBucket(per_minute, burst)
+            return self._bucket
+
+    def _record(self, kind: str, field: str, amount: float = 1):
+        with self._lock:
+            counters = self._stats.setdefault(
+                kind,
+                {"requests": 0, "retries": 0, "failures": 0, "latency_s": 0.0, "max_latency_s": 0.0, "wait_s": 0.0},
+            )
+            counters[field] += amount
+            if field == "latency_s":
+                counters["max_latency_s"] = max(counters["max_latency_s"], amount)
+
+    def call(self, config: dict, kind: str, fn, retries: int = _DEFAULT_RETRIES):
+        """Run ``fn(client, timeout_ms)`` under the rate limiter, retrying transient failures.
+
+        *kind* ("transcription", "chat", "embeddings"...) picks the per-call
+        timeout and the counters the call is accounted under.
+        """
+        client = self.client(config.get("api_key", ""))
+        bucket = self._get_bucket(config)
+        timeout_ms = _TIMEOUTS_MS.get(kind, _DEFAULT_TIMEOUT_MS)
+
+        for attempt in range(max(1, retries)):
+            self._record(kind, "wait_s", bucket.acquire())
+            self._record(kind, "requests")
+            start = time.monotonic()
+            try:
+                result = fn(client, timeout_ms)
+                self._record(kind, "latency_s", time.monotonic() - start)
+                return result
+            except Exception as e:
+                self._record(kind, "latency_s", time.monotonic() - start)
+                status = _status_code(e)
+                last_attempt = attempt >= retries - 1
+                if status == 429 and not last_attempt:
+                    delay = _retry_after(e)
+                    if delay is None:
+                        delay = _RATE_LIMIT_BASE_DELAY * (2**attempt)
+                    delay = min(delay, _MAX_RETRY_DELAY)
+                    log.info("Mistral %s rate limited, pausing all requests for %.0fs", kind, delay)
+                    bucket.hold(delay)
+                elif ((status is not None and status >= 500) or _is_network_error(e)) and not last_attempt:
+                    delay = random.uniform(0, min(_MAX_RETRY_DELAY, _RETRY_BASE_DELAY * (2**attempt)))
+                    log.info("Mistral %s call failed (%s), retrying in %.1fs", kind, e, delay)
+                    time.sleep(delay)
+                else:
+                    self._record(kind, "failures")
+                    raise
+                self._record(kind, "retries")
+
+    def stats(self) -> dict:
+        """Return a copy of the per-kind counters."""
+        with self._lock:
+            return {kind: dict(counters) for kind, counters in self._stats.items()}
+
+
+_pool = MistralPool()
+
+
+def mistral_call(config: dict, kind: str, fn, retries: int = _DEFAULT_RETRIES):
+    """Run ``fn(client, timeout_ms)`` through the shared pool (see :meth:`MistralPool.call`)."""
+    return _pool.call(config, kind, fn, retries)
+
+
+def api_stats() -> dict:
+    """Per-kind counters: requests, retries, failures, latency_s, max_latency_s, wait_s."""
+    return _pool.stats()
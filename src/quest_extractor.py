@@ -1,13 +1,59 @@
-"""AI quest extraction from session summaries via Mistral API."""
-
-import re
-
-from PySide6.QtCore import QObject, QThread, Signal
-from PySide6.QtWidgets import QDialog, QDialogButtonBox, QLabel, QTextEdit, QVBoxLayout
-
-from .diff_utils import apply_inline_diff, extract_html_without_deleted
+"""AI quest extraction from session summaries via Mistral API.
+
+The quest log is read back into records locally (:func:`read_quest_log`),
+the model returns a JSON delta against them, and the accepted changes are
+patched into the quest log item by item, so quests the delta does not
+touch keep their text and formatting.
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+from PySide6.QtCore import QObject, QThread, Qt, Signal
+from PySide6.QtGui import QTextBlockFormat, QTextCharFormat, QTextCursor, QTextDocument, QTextDocumentFragment
+from PySide6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
+    QTextEdit,
+    QVBoxLayout,
+)
+
+from .diff_utils import apply_inline_diff
 from .i18n import tr
+from .mistral_pool import mistral_call
+from .quest_store import (
+    KIND_MYSTERY,
+    OP_ADD,
+    OP_COMPLETE,
+    SECTIONS,
+    STATUS_COMPLETED,
+    QuestChange,
+    QuestStore,
+    parse_delta,
+    parse_record,
+    render_record,
+)
 from .summarizer import _resolve_prompt
+from .utils import quest_store_path
+
+log = logging.getLogger(__name__)
+
+# Machine format of the answer, sent as the system message whatever the
+# (user-editable) extraction prompt says.
+_DELTA_FORMAT = """Answer with a single JSON object {"changes": [...]} listing ONLY what this session changed. Each change is one of:
+{"op": "add", "kind": "quest" | "mystery", "name": "...", "description": "...", "origin": "...", "objective": "...", "progress": ["..."], "next_step": "...", "npcs": ["..."], "clues": ["..."]}
+{"op": "update", "id": "<id>", ...only the fields that changed...}
+{"op": "complete", "id": "<id>", "resolution": "...", "giver": "..."}
+Rules:
+- Quests already recorded are listed as JSON lines with an "id": refer to them by that id.
+- "progress", "npcs" and "clues" entries are APPENDED to what is recorded: send only new entries.
+- Other fields replace the recorded value: send them only when they changed.
+- "complete" on a quest moves it to the completed quests; on a mystery it marks the mystery as resolved.
+- If the current quest log is given as plain text instead of JSON lines, its quests have no id: only "add" the quests and mysteries this session introduces.
+- Return {"changes": []} if nothing changed."""
 
 
 def _get_extraction_prompt() -> str:
@@ -21,120 +67,330 @@ def get_default_quest_extraction() -> str:
     return _get_extraction_prompt()
 
 
-def _strip_model_artifacts(text: str) -> str:
-    """Remove code fences and markdown formatting the model sometimes adds."""
-    text = text.strip()
-    text = re.sub(r"^```html\s*\n?", "", text)
-    text = re.sub(r"\n?```\s*$", "", text)
-    text = re.sub(r"\n---\n", "\n", text)
-    text = re.sub(r"\n---$", "", text)
-    text = re.sub(r"^---\n", "", text)
-    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
-    text = re.sub(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)", r"<em>\1</em>", text)
-    return text.strip()
+# ── Reading and patching the quest log ──────────────────
+
+
+@dataclass
+class _QuestItem:
+    """One top-level list item under a quest log section, and the blocks it spans."""
+
+    kind: str
+    status: str
+    first: int
+    last: int
+    title: str
+    details: list[str] = field(default_factory=list)
+    record: dict | None = None  # None for the section's "nothing yet" placeholder
+
+
+def _scan(document: QTextDocument) -> tuple[list[_QuestItem], dict[tuple[str, str], int]]:
+    """Top-level items of the known quest log sections, and the block of each section heading.
+
+    Items under other headings are not read (and never touched when patching).
+    """
+    titles = {tr(title_key).casefold(): (kind, status) for title_key, kind, status, _empty in SECTIONS}
+    items, headings = [], {}
+    section = top = item = None
+    block = document.begin()
+    while block.isValid():
+        text_list = block.textList()
+        if text_list is None:
+            item = None
+            if block.blockFormat().headingLevel():
+                section, top = titles.get(block.text().strip().casefold()), None
+                if section is not None:
+                    headings[section] = block.blockNumber()
+        elif section is not None:
+            indent = text_list.format().indent()
+            if top is None or indent <= top:
+                top = indent
+                item = _QuestItem(*section, block.blockNumber(), block.blockNumber(), block.text().strip())
+                items.append(item)
+            elif item is not None:
+                item.details.append(block.text())
+                item.last = block.blockNumber()
+        block = block.next()
+
+    placeholders = {(kind, status): tr(empty_key) for _title, kind, status, empty_key in SECTIONS}
+    for item in items:
+        if item.title != placeholders[(item.kind, item.status)]:
+            item.record = parse_record(item.kind, item.status, item.title, item.details)
+    return items, headings
+
+
+def read_quest_log(document: QTextDocument) -> list[dict]:
+    """Read the quests and mysteries of a quest log back into records (without ids)."""
+    items, _headings = _scan(document)
+    return [item.record for item in items if item.record is not None]
+
+
+def _remove_blocks(document: QTextDocument, first: int, last: int):
+    cursor = QTextCursor(document)
+    end = document.findBlockByNumber(last)
+    if end.next().isValid():
+        # Up to the start of the next block, which keeps its own format
+        cursor.setPosition(document.findBlockByNumber(first).position())
+        cursor.setPosition(end.next().position(), QTextCursor.MoveMode.KeepAnchor)
+    else:
+        # Last blocks of the document: remove them with the separator in front of them
+        previous = document.findBlockByNumber(first).previous()
+        cursor.setPosition(previous.position() + previous.length() - 1)
+        cursor.setPosition(end.position() + end.length() - 1, QTextCursor.MoveMode.KeepAnchor)
+    cursor.removeSelectedText()
+
+
+def _insert_after(document: QTextDocument, number: int, html: str):
+    """Insert *html* as new blocks after block *number*."""
+    block = document.findBlockByNumber(number)
+    cursor = QTextCursor(block)
+    cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock)
+    cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+    cursor.insertFragment(QTextDocumentFragment.fromHtml(html))
+    spacer = block.next()
+    if not spacer.text() and spacer.textList() is None and spacer.next().isValid():
+        # A list starts a block of its own: drop the empty one left in front of it
+        cursor.setPosition(block.position() + block.length() - 1)
+        cursor.setPosition(spacer.position(), QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+
+
+def _section_end(document: QTextDocument, kind: str, status: str) -> int:
+    """Block after which a new item of the *kind*/*status* section goes, adding the section if missing."""
+    items, headings = _scan(document)
+    placeholders = [i for i in items if (i.kind, i.status) == (kind, status) and i.record is None]
+    for item in reversed(placeholders):
+        _remove_blocks(document, item.first, item.last)
+    if placeholders:
+        items, headings = _scan(document)
+    listed = [i for i in items if (i.kind, i.status) == (kind, status)]
+    if listed:
+        return listed[-1].last
+    if (kind, status) not in headings:
+        title_key = next(key for key, k, s, _empty in SECTIONS if (k, s) == (kind, status))
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        heading = QTextBlockFormat()
+        heading.setHeadingLevel(2)  # a one-block fragment only brings its character format
+        cursor.insertBlock(heading, QTextCharFormat())
+        cursor.insertHtml(f'<h2 style="color:#6ab4d4;">{tr(title_key)}</h2>')
+        return document.blockCount() - 1
+    return headings[(kind, status)]
+
+
+def _find_item(document: QTextDocument, record: dict) -> _QuestItem | None:
+    """The item *record* was read from: same section, same name."""
+    items, _headings = _scan(document)
+    name = record["name"].casefold()
+    for item in items:
+        if item.record is not None and (item.kind, item.status) == (record["kind"], record["status"]):
+            if item.record["name"].casefold() == name:
+                return item
+    return None
+
+
+def patch_quest_log(document: QTextDocument, changes: list[QuestChange]):
+    """Apply *changes* to the quest log *document*, item by item.
+
+    A changed quest's item is replaced by its new rendering in place, or
+    moved to the end of the completed quests (a resolved mystery is
+    dropped); new quests and mysteries are appended to their section.
+    Every other block is left as it is.
+    """
+    for change in changes:
+        after = change.after
+        target = (after["kind"], after["status"])
+        listed = not (after["kind"] == KIND_MYSTERY and after["status"] == STATUS_COMPLETED)
+        html = f"<ul>{render_record(after)}</ul>"
+        old = _find_item(document, change.before) if change.before is not None else None
+        if old is not None:
+            _remove_blocks(document, old.first, old.last)
+            if listed and (old.kind, old.status) == target:
+                _insert_after(document, old.first - 1, html)
+                continue
+        if listed:
+            _insert_after(document, _section_end(document, *target), html)
+
+    # Sections left empty get their placeholder back
+    for _title, kind, status, empty_key in SECTIONS:
+        items, headings = _scan(document)
+        if (kind, status) in headings and not any((i.kind, i.status) == (kind, status) for i in items):
+            _insert_after(document, headings[(kind, status)], f"<ul><li><em>{tr(empty_key)}</em></li></ul>")
+
+
+# ── Extraction ──────────────────────────────────────────
 
 
 class QuestExtractorWorker(QObject):
-    """Extracts quest updates from a session summary via Mistral API."""
+    """Extracts quest changes from a session summary via Mistral API.
+
+    The model sees the compact quest records, reconciled first with the
+    quest log as it reads now when it was edited since they were saved, and
+    returns a JSON delta; the worker previews it against the records
+    without saving anything.
+    """
 
-    completed = Signal(str)  # quest update HTML
+    completed = Signal(object, list)  # QuestStore, [QuestChange]
     error = Signal(str)
 
-    def __init__(self, summary_html: str, current_quests: str, config: dict, campaign_name: str = ""):
+    def __init__(
+        self, summary_html: str, current_quests: str, quest_items: list[dict], config: dict, campaign_name: str = ""
+    ):
         super().__init__()
         self._summary = summary_html
-        self._current_quests = current_quests
+        self._current_quests = current_quests  # quest log plain text
+        self._quest_items = quest_items  # the quest log read back into records, see read_quest_log()
         self._config = config
         self._campaign_name = campaign_name
 
     def run(self):
-        """Call Mistral API to extract quest updates from the session summary."""
+        """Call Mistral API to extract quest changes from the session summary."""
         try:
-            from mistralai import Mistral
-
             api_key = self._config.get("api_key", "")
             if not api_key:
                 self.error.emit(tr("quest_extractor.error.no_api_key"))
                 return
 
-            client = Mistral(api_key=api_key)
             model = self._config.get("summary_model", "mistral-large-latest")
 
+            store = QuestStore.load(quest_store_path(self._config))
+            if not store.in_sync(self._current_quests):
+                # No records yet, or the quest log was edited since they were saved
+                store.reconcile(self._quest_items, self._current_quests)
+            # A quest log not in the usual layout has no records: the model gets its text
+            current = store.prompt_listing() or self._current_quests.strip() or tr("quest_extractor.no_quests")
+
             extraction_template = self._config.get("prompt_quest_extraction") or _get_extraction_prompt()
             prompt = extraction_template.format(
                 campaign_name=self._campaign_name or "D&D",
-                current_quests=self._current_quests or tr("quest_extractor.no_quests"),
+                current_quests=current,
                 summary=self._summary,
             )
 
-            response = client.chat.complete(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=16000,
+            response = mistral_call(
+                self._config,
+                "chat",
+                lambda client, timeout_ms: client.chat.complete(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": _DELTA_FORMAT},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.1,
+                    max_tokens=4000,
+                    response_format={"type": "json_object"},
+                    timeout_ms=timeout_ms,
+                ),
             )
 
-            result = _strip_model_artifacts(response.choices[0].message.content)
-            self.completed.emit(result)
+            try:
+                ops = parse_delta(response.choices[0].message.content)
+            except ValueError as e:
+                self.error.emit(tr("quest_extractor.error.bad_delta", error=e))
+                return
+            changes = store.preview(ops)
+            log.info("Quest delta: %d operations, %d quests changed", len(ops), len(changes))
+            self.completed.emit(store, changes)
 
         except Exception as e:
             self.error.emit(tr("quest_extractor.error.generic", error=e))
 
 
 class QuestProposalDialog(QDialog):
-    """Editable unified-diff preview of AI-proposed quest updates.
-
-    Shows a single view with deleted lines inline (red + strikethrough) and
-    added/changed lines highlighted green.  The user can edit freely; on
-    accept the deleted-marked lines are stripped and the remaining rich-text
-    HTML is returned.
+    """Preview of the quests an extraction changes.
+
+    Only the changed quests are shown, each under the name of its change,
+    in their new form: lines that are new are highlighted green and lines
+    that disappear are shown inline in red strikethrough.  Each change can
+    be unchecked to leave it out (the preview follows).  On accept the
+    checked changes are patched into the current quest log item by item
+    (see :func:`patch_quest_log`), so the rest of it is kept as it is.
     """
 
-    def __init__(self, proposed_html: str, current_html: str, parent=None):
+    def __init__(self, current_html: str, changes: list[QuestChange], parent=None):
         super().__init__(parent)
         self.setWindowTitle(tr("quest_extractor.dialog_title"))
         self.setMinimumSize(700, 500)
-
-        # Render current HTML through the same Qt pipeline used for proposed,
-        # so line splitting is consistent for diffing.
-        self._current_lines: list[str] = []
-        if current_html:
-            tmp = QTextEdit()
-            tmp.setHtml(current_html)
-            self._current_lines = tmp.toPlainText().split("\n")
+        self._changes = changes
+        self._current_html = current_html
 
         layout = QVBoxLayout(self)
 
         label = QLabel(tr("quest_extractor.dialog_label"))
         label.setObjectName("subheading")
+        label.setWordWrap(True)
         layout.addWidget(label)
 
         self.editor = QTextEdit()
-        self.editor.setHtml(proposed_html)
-        self.editor.setAcceptRichText(True)
+        self.editor.setReadOnly(True)
         layout.addWidget(self.editor, stretch=1)
 
+        self._list = QListWidget()
+        self._list.setMaximumHeight(140)
+        self._labels = []
+        for change in changes:
+            key = {OP_ADD: "quest_extractor.change.add", OP_COMPLETE: "quest_extractor.change.complete"}.get(
+                change.op, "quest_extractor.change.update"
+            )
+            self._labels.append(tr(key, name=change.after["name"]))
+            item = QListWidgetItem(self._labels[-1])
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            self._list.addItem(item)
+        self._list.itemChanged.connect(self._show_preview)
+        layout.addWidget(self._list)
+
         buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
 
-        apply_inline_diff(self.editor, self._current_lines)
+        self._show_preview()
+
+    def _show_preview(self, _item=None):
+        """Show the checked changes: each quest as it will read, diffed against how it reads now."""
+        before, after = [], []
+        for i, change in enumerate(self._changes):
+            if self._list.item(i).checkState() != Qt.CheckState.Checked:
+                continue
+            heading = f'<h3 style="color:#6ab4d4;">{self._labels[i]}</h3>'
+            before.append(heading + (f"<ul>{render_record(change.before)}</ul>" if change.before else ""))
+            resolved = change.after["kind"] == KIND_MYSTERY and change.after["status"] == STATUS_COMPLETED
+            after.append(heading + ("" if resolved else f"<ul>{render_record(change.after)}</ul>"))
+        old = QTextDocument()
+        old.setHtml("".join(before))
+        self.editor.setHtml("".join(after))
+        apply_inline_diff(self.editor, old.toPlainText().split("\n") if before else [])
+
+    def get_changes(self) -> list[QuestChange]:
+        """Return the changes left checked."""
+        return [
+            change
+            for i, change in enumerate(self._changes)
+            if self._list.item(i).checkState() == Qt.CheckState.Checked
+        ]
 
     def get_html(self) -> str:
-        """Return quest HTML with deleted-marked lines stripped and highlights cleared."""
-        return extract_html_without_deleted(self.editor)
+        """Return the current quest log HTML with the checked changes patched in."""
+        document = QTextDocument()
+        document.setHtml(self._current_html)
+        patch_quest_log(document, self.get_changes())
+        return document.toHtml()
 
 
 def start_quest_extraction(
     summary_html: str,
     current_quests: str,
+    quest_items: list[dict],
     config: dict,
     campaign_name: str = "",
 ) -> tuple[QThread, QuestExtractorWorker]:
-    """Create a quest extraction worker in a new thread."""
+    """Create a quest extraction worker in a new thread.
+
+    *current_quests* is the quest log's plain text and *quest_items* what
+    :func:`read_quest_log` reads from it.
+    """
     thread = QThread()
-    worker = QuestExtractorWorker(summary_html, current_quests, config, campaign_name=campaign_name)
+    worker = QuestExtractorWorker(summary_html, current_quests, quest_items, config, campaign_name=campaign_name)
     worker.moveToThread(thread)
     thread.started.connect(worker.run)
     worker.completed.connect(thread.quit)
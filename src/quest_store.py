@@ -0,0 +1,316 @@
+"""Structured quest records behind the quest log.
+
+Quests and open mysteries are kept as records in ``quest_log.json`` next to
+``quest_log.html``.  Quest extraction asks the model only for a delta —
+``add``, ``update`` and ``complete`` operations — which is previewed,
+applied to the records, and only the items it changed are rendered back
+into the quest log (see :func:`render_record`).
+
+A record holds ``id``, ``kind`` (quest or mystery), ``status`` (active or
+completed) and the text fields of the quest log layout.  ``update`` replaces
+the scalar fields it carries and appends to the list fields (progress,
+NPCs, clues), so the model never has to repeat what is already recorded.
+
+The records only describe the quest log as it was last saved; the
+SHA-256 of its plain text is stored alongside so that hand edits (or a
+quest log synced from another machine) are detected, and the records are
+then read back from the quest log's items (see :func:`parse_record`) on
+the next extraction, without asking the model.
+"""
+
+import copy
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+
+from .i18n import tr
+
+log = logging.getLogger(__name__)
+
+_VERSION = 1
+
+KIND_QUEST = "quest"
+KIND_MYSTERY = "mystery"
+STATUS_ACTIVE = "active"
+STATUS_COMPLETED = "completed"
+
+OP_ADD = "add"
+OP_UPDATE = "update"
+OP_COMPLETE = "complete"
+
+_SCALAR_FIELDS = ("name", "description", "origin", "objective", "next_step", "giver", "resolution")
+_LIST_FIELDS = ("progress", "npcs", "clues")
+
+# Quest log sections: heading, the records listed under it, placeholder when it is empty.
+SECTIONS = (
+    ("prompt.section.active_quests", KIND_QUEST, STATUS_ACTIVE, "quest_log.empty.active"),
+    ("prompt.section.clues", KIND_MYSTERY, STATUS_ACTIVE, "quest_log.empty.clues"),
+    ("prompt.section.completed_quests", KIND_QUEST, STATUS_COMPLETED, "quest_log.empty.completed"),
+)
+# Labels of the detail lines of a quest item.
+_DETAIL_KEYS = {
+    "origin": "prompt.quest.origin",
+    "objective": "prompt.quest.objective",
+    "progress": "prompt.quest.progress",
+    "next_step": "prompt.quest.next_step",
+    "npcs": "prompt.quest.npcs",
+    "giver": "prompt.quest.giver",
+    "resolution": "prompt.quest.resolution",
+}
+
+_CODE_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+@dataclass
+class QuestChange:
+    """One previewed operation: the record before (None for an add) and after it."""
+
+    op: str
+    before: dict | None
+    after: dict
+
+
+def _normalize_text(text: str) -> str:
+    lines = (" ".join(line.replace("\xa0", " ").split()) for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.sha256(_normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"\W+", "-", name.lower()).strip("-_")[:40] or "quest"
+
+
+def _new_id(name: str, taken: set[str]) -> str:
+    base = _slug(name)
+    qid, n = base, 2
+    while qid in taken:
+        qid, n = f"{base}-{n}", n + 1
+    return qid
+
+
+def _blank_record(kind: str, status: str) -> dict:
+    record = {"id": "", "kind": kind, "status": status}
+    for field in _SCALAR_FIELDS:
+        record[field] = ""
+    for field in _LIST_FIELDS:
+        record[field] = []
+    return record
+
+
+def parse_record(kind: str, status: str, title: str, details: list[str]) -> dict:
+    """Read one quest log item back into a record (without id): the fields :func:`render_record` writes.
+
+    *title* is the item's first line (name, then description after a dash)
+    and *details* its nested lines: labelled fields for a quest, one per
+    progress entry, and clues for a mystery.  Unlabelled lines of a quest
+    count as progress.
+    """
+    record = _blank_record(kind, status)
+    name, _dash, description = title.partition(" — ")
+    record["name"] = name.strip()
+    record["description"] = description.strip()
+    labels = {tr(key).casefold(): field for field, key in _DETAIL_KEYS.items()}
+    for line in (d.strip() for d in details):
+        if not line:
+            continue
+        if kind == KIND_MYSTERY:
+            record["clues"].append(line)
+            continue
+        label, colon, value = line.partition(":")
+        field = labels.get(label.strip().casefold()) if colon else None
+        if field is None:
+            record["progress"].append(line)
+        elif field == "npcs":
+            record["npcs"].extend(n.strip() for n in value.split(",") if n.strip())
+        elif field == "progress":
+            record["progress"].append(value.strip())
+        else:
+            record[field] = value.strip()
+    return record
+
+
+def parse_delta(text: str) -> list[dict]:
+    """Parse the model's JSON delta into a list of operations.
+
+    Accepts ``{"changes": [...]}`` or a bare list.  Operations with an
+    unknown ``op`` are dropped.  Raises ValueError if *text* is not JSON.
+    """
+    data = json.loads(_CODE_FENCE.sub("", text))
+    ops = data.get("changes", []) if isinstance(data, dict) else data
+    if not isinstance(ops, list):
+        raise ValueError("quest delta is not a list of changes")
+    return [op for op in ops if isinstance(op, dict) and op.get("op") in (OP_ADD, OP_UPDATE, OP_COMPLETE)]
+
+
+class QuestStore:
+    """Quest records of one campaign, persisted as a JSON sidecar."""
+
+    def __init__(self, path: str, data: dict | None = None):
+        self._path = path
+        self._data = data or {"version": _VERSION, "synced_digest": "", "records": []}
+
+    @classmethod
+    def load(cls, path: str) -> "QuestStore":
+        """Read the records at *path*; an empty store if missing or unreadable."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if data.get("version") != _VERSION or not isinstance(data.get("records"), list):
+            return cls(path)
+        return cls(path, data)
+
+    @property
+    def records(self) -> list[dict]:
+        """Quest and mystery records, in quest log order."""
+        return self._data["records"]
+
+    def in_sync(self, quest_log_text: str) -> bool:
+        """True if the records describe *quest_log_text* (the quest log's plain text)."""
+        return bool(self.records) and self._data.get("synced_digest") == _text_digest(quest_log_text)
+
+    def mark_synced(self, quest_log_text: str):
+        """Record that the quest log now reads *quest_log_text*."""
+        self._data["synced_digest"] = _text_digest(quest_log_text)
+
+    def reconcile(self, items: list[dict], quest_log_text: str):
+        """Replace the records with *items*, the quest log as it reads now (see :func:`parse_record`).
+
+        An item keeps the id of the record of the same kind and name, so
+        the model can keep referring to it; other items get a new id.
+        """
+        known = {(r["kind"], r["name"].casefold()): r["id"] for r in self.records}
+        records, taken = [], set(known.values())
+        for item in items:
+            qid = known.pop((item["kind"], item["name"].casefold()), None) or _new_id(item["name"], taken)
+            taken.add(qid)
+            records.append(dict(item, id=qid))
+        self._data["records"] = records
+        self.mark_synced(quest_log_text)
+
+    def prompt_listing(self) -> str:
+        """Compact one-line-per-record listing sent to the model instead of the quest log."""
+        lines = []
+        for r in self.records:
+            if r["status"] == STATUS_COMPLETED:
+                if r["kind"] == KIND_QUEST:  # resolved mysteries are no longer listed
+                    brief = {"id": r["id"], "status": r["status"], "name": r["name"]}
+                    lines.append(json.dumps(brief, ensure_ascii=False))
+                continue
+            brief = {"id": r["id"], "kind": r["kind"], "status": r["status"], "name": r["name"]}
+            for field in ("objective", "progress", "next_step", "npcs", "clues"):
+                if r.get(field):
+                    brief[field] = r[field]
+            lines.append(json.dumps(brief, ensure_ascii=False))
+        return "\n".join(lines)
+
+    # ── Deltas ────────────────────────────────────────────
+
+    def preview(self, ops: list[dict]) -> list[QuestChange]:
+        """Work out the effect of *ops* without modifying the store.
+
+        Adds get a fresh id; updates and completions of unknown ids are
+        skipped.  Several operations on the same record fold into one change.
+        """
+        by_id = {r["id"]: r for r in self.records}
+        changes = {}  # id -> QuestChange, in first-touched order
+        for op in ops:
+            kind = op["op"]
+            if kind == OP_ADD:
+                record = self._new_record(op, set(by_id) | set(changes))
+                changes[record["id"]] = QuestChange(OP_ADD, None, record)
+                continue
+            qid = op.get("id")
+            change = changes.get(qid)
+            if change is None:
+                if qid not in by_id:
+                    log.info("Quest delta refers to unknown id %r, skipped", qid)
+                    continue
+                change = changes[qid] = QuestChange(kind, by_id[qid], copy.deepcopy(by_id[qid]))
+            elif change.op != OP_ADD:
+                change.op = OP_COMPLETE if OP_COMPLETE in (change.op, kind) else OP_UPDATE
+            _merge(change.after, op)
+            if kind == OP_COMPLETE:
+                change.after["status"] = STATUS_COMPLETED
+        return [c for c in changes.values() if c.before != c.after]
+
+    @staticmethod
+    def _new_record(op: dict, taken: set[str]) -> dict:
+        record = _blank_record(KIND_MYSTERY if op.get("kind") == KIND_MYSTERY else KIND_QUEST, STATUS_ACTIVE)
+        _merge(record, op)
+        if op.get("status") == STATUS_COMPLETED:
+            record["status"] = STATUS_COMPLETED
+        record["id"] = _new_id(record["name"], taken)
+        return record
+
+    def apply(self, changes: list[QuestChange]):
+        """Store the ``after`` side of each change."""
+        index = {r["id"]: i for i, r in enumerate(self.records)}
+        for change in changes:
+            qid = change.after["id"]
+            if qid in index:
+                self.records[index[qid]] = change.after
+            else:
+                index[qid] = len(self.records)
+                self.records.append(change.after)
+
+    def save(self):
+        """Write the records atomically (temp file + rename)."""
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._path)
+
+
+def _merge(record: dict, op: dict):
+    """Apply the fields of *op* to *record*: scalars replace, list entries append."""
+    for field in _SCALAR_FIELDS:
+        value = op.get(field)
+        if isinstance(value, str) and value.strip():
+            record[field] = value.strip()
+    for field in _LIST_FIELDS:
+        values = op.get(field)
+        if isinstance(values, str):
+            values = [values]
+        if not isinstance(values, list):
+            continue
+        existing = record.setdefault(field, [])
+        for value in values:
+            if isinstance(value, str) and value.strip() and value.strip() not in existing:
+                existing.append(value.strip())
+
+
+def render_record(r: dict) -> str:
+    """Render one record as a quest log list item."""
+    e = html.escape
+    title = f"<strong>{e(r['name'])}</strong>"
+    if r.get("description"):
+        title += f" &mdash; {e(r['description'])}"
+    details = []
+    if r["kind"] == KIND_MYSTERY:
+        details = [e(clue) for clue in r.get("clues", [])]
+    elif r["status"] == STATUS_COMPLETED:
+        for field, key in (("giver", "prompt.quest.giver"), ("resolution", "prompt.quest.resolution")):
+            if r.get(field):
+                details.append(f"<em>{tr(key)}:</em> {e(r[field])}")
+    else:
+        for field, key in (("origin", "prompt.quest.origin"), ("objective", "prompt.quest.objective")):
+            if r.get(field):
+                details.append(f"<em>{tr(key)}:</em> {e(r[field])}")
+        details.extend(f"<em>{tr('prompt.quest.progress')}:</em> {e(p)}" for p in r.get("progress", []))
+        if r.get("next_step"):
+            details.append(f"<em>{tr('prompt.quest.next_step')}:</em> {e(r['next_step'])}")
+        if r.get("npcs"):
+            details.append(f"<em>{tr('prompt.quest.npcs')}:</em> {', '.join(e(n) for n in r['npcs'])}")
+    if not details:
+        return f"<li>{title}</li>\n"
+    items = "".join(f"  <li>{d}</li>\n" for d in details)
+    return f"<li>{title}\n  <ul>\n{items}  </ul>\n</li>\n"
@@ -1,10 +1,12 @@
 """RichTextEditorWidget — reusable rich-text editor with toolbar and auto-save."""
 
+import bisect
+import logging
 import os
 import re
 import shutil
 
-from PySide6.QtCore import QPoint, QSize, Qt, QTimer, Signal
+from PySide6.QtCore import QObject, QPoint, QSize, Qt, QThread, QTimer, Signal
 from PySide6.QtGui import (
     QBrush,
     QColor,
@@ -35,6 +37,11 @@ from .fold_gutter import GUTTER_WIDTH, FoldGutterWidget
 from .fold_manager import FoldManager
 from .i18n import tr
 
+log = logging.getLogger(__name__)
+
+_AUTOSAVE_DELAY_MS = 2000
+_BACKUP_EVERY = 10  # saves between two refreshes of the .bak copy
+
 
 def _make_format_icon(letter: str, style: str = "", size: int = 20) -> QIcon:
     """Draw a formatting icon (B, I, U) with the appropriate visual style."""
@@ -135,6 +142,62 @@ def _make_unfold_icon(size: int = 18) -> QIcon:
     return QIcon(pix)
 
 
+def _write_atomic(path: str, html: str, backup: bool):
+    """Write *html* to *path* through a fsynced temp file and an atomic rename.
+
+    With *backup*, the file being replaced is first copied to ``.bak``.
+    """
+    if backup and os.path.exists(path):
+        try:
+            shutil.copy2(path, path + ".bak")
+        except OSError as e:
+            log.warning("Could not back up %s: %s", path, e)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(html)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_files(writes: list[tuple[str, str | None]], backup: bool) -> list[str]:
+    """Apply ``(path, content)`` writes in order, deleting files whose content is None.
+
+    Returns the paths written.
+    """
+    written = []
+    for path, content in writes:
+        if content is None:
+            if os.path.exists(path):
+                os.remove(path)
+            continue
+        _write_atomic(path, content, backup)
+        written.append(path)
+    return written
+
+
+class _SaveWorker(QObject):
+    """Writes one document snapshot to disk off the UI thread."""
+
+    finished = Signal(int, list, bool)  # save sequence number, paths written, success
+
+    def __init__(self, seq: int, writes: list[tuple[str, str | None]], backup: bool):
+        super().__init__()
+        self._seq = seq
+        self._writes = writes
+        self._backup = backup
+
+    def run(self):
+        """Write the snapshot and report the paths written."""
+        try:
+            written = _write_files(self._writes, self._backup)
+            ok = True
+        except OSError as e:
+            log.warning("Autosave failed: %s", e)
+            written, ok = [], False
+        self.finished.emit(self._seq, written, ok)
+
+
 class _FoldableTextEdit(QTextEdit):
     """QTextEdit with mouse handling that works correctly with invisible (folded) blocks.
 
@@ -149,16 +212,55 @@ class _FoldableTextEdit(QTextEdit):
         super().__init__(parent)
         self._fold_selecting = False
         self._fold_anchor = -1
+        # Visible-block index, rebuilt lazily after fold or layout changes
+        self._has_hidden: bool | None = None
+        self._visible_tops: list[float] = []  # layout y of each indexed visible block, ascending
+        self._visible_numbers: list[int] = []  # block number of each entry in _visible_tops
+        self._index_next = QTextBlock()  # first block not indexed yet
+        self._invalidate_visible_index()
+        self.document().contentsChanged.connect(self._invalidate_visible_index)
+        self.document().documentLayout().update.connect(self._invalidate_visible_tops)
+
+    def set_fold_manager(self, fold_manager):
+        """Drop the visible-block index whenever *fold_manager* hides or shows blocks."""
+        fold_manager.visibility_changed.connect(self._invalidate_visible_index)
 
     # -- helpers -------------------------------------------------------
 
+    def _invalidate_visible_index(self):
+        self._has_hidden = None
+        self._invalidate_visible_tops()
+
+    def _invalidate_visible_tops(self, *_args):
+        self._visible_tops, self._visible_numbers = [], []
+        self._index_next = self.document().begin()
+
     def _any_hidden(self) -> bool:
-        block = self.document().begin()
-        while block.isValid():
-            if not block.isVisible():
-                return True
+        if self._has_hidden is None:
+            self._has_hidden = False
+            block = self.document().begin()
+            while block.isValid():
+                if not block.isVisible():
+                    self._has_hidden = True
+                    break
+                block = block.next()
+        return self._has_hidden
+
+    def _visible_index(self, doc_y: float) -> tuple[list[float], list[int]]:
+        """Return the layout y and block number of visible blocks, in document order.
+
+        Blocks are indexed on demand, down to the first one starting below *doc_y*.
+        """
+        layout = self.document().documentLayout()
+        tops, numbers = self._visible_tops, self._visible_numbers
+        block = self._index_next
+        while block.isValid() and (not tops or tops[-1] <= doc_y):
+            if block.isVisible():
+                tops.append(layout.blockBoundingRect(block).top())
+                numbers.append(block.blockNumber())
             block = block.next()
-        return False
+        self._index_next = block
+        return tops, numbers
 
     def _visible_hit_test(self, viewport_pos) -> QTextCursor:
         """Map *viewport_pos* to a QTextCursor, correctly skipping hidden blocks."""
@@ -168,28 +270,12 @@ class _FoldableTextEdit(QTextEdit):
         doc_x = float(viewport_pos.x()) + self.horizontalScrollBar().value()
         doc_y = float(viewport_pos.y()) + self.verticalScrollBar().value()
 
-        target_block = None
-        last_visible = None
-        block = doc.begin()
-
-        while block.isValid():
-            if not block.isVisible():
-                block = block.next()
-                continue
-            rect = layout.blockBoundingRect(block)
-            if doc_y < rect.top():
-                target_block = last_visible if last_visible else block
-                break
-            if doc_y < rect.top() + rect.height():
-                target_block = block
-                break
-            last_visible = block
-            block = block.next()
-
-        if target_block is None:
-            target_block = last_visible
-        if target_block is None:
+        # Last visible block starting at or above doc_y (the first one if doc_y is above them all)
+        tops, numbers = self._visible_index(doc_y)
+        if not numbers:
             return QTextCursor(doc)
+        idx = max(bisect.bisect_right(tops, doc_y) - 1, 0)
+        target_block = doc.findBlockByNumber(numbers[idx])
 
         rect = layout.blockBoundingRect(target_block)
         bl = target_block.layout()
@@ -315,7 +401,16 @@ class RichTextEditorWidget(QWidget):
         self._editor_object_name = editor_object_name
         self._foldable_heading_levels = foldable_heading_levels
         self._fold_by_default = fold_by_default
-        self._save_timer = None
+        # Restarted on every edit, so an autosave snapshot is taken once typing pauses
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(_AUTOSAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._autosave)
+        self._save_thread = None  # QThread of the autosave being written, if any
+        self._save_worker = None
+        self._save_seq = 0
+        self._save_count = 0  # saves of the current file, for .bak rotation
+        self._autosave_pending = False  # edited again while an autosave was being written
         self._tts_engine = None
         self._search_index = -1
         self._build_ui()
@@ -435,6 +530,7 @@ class RichTextEditorWidget(QWidget):
             fold_by_default=self._fold_by_default,
             parent=self,
         )
+        self.editor.set_fold_manager(self._fold_mgr)
         self._fold_gutter = FoldGutterWidget(self.editor, self._fold_mgr)
 
         # Search bar (hidden by default)
@@ -658,13 +754,55 @@ class RichTextEditorWidget(QWidget):
         cursor.mergeBlockFormat(block_fmt)
 
     def _schedule_autosave(self):
-        if self._save_timer is not None:
-            return  # Already scheduled
-        self._save_timer = QTimer.singleShot(2000, self._autosave)
+        self._save_timer.start()
+
+    def _next_backup(self) -> bool:
+        """Whether the next save should refresh the .bak copy (every ``_BACKUP_EVERY`` saves)."""
+        backup = self._save_count % _BACKUP_EVERY == 0
+        self._save_count += 1
+        return backup
 
     def _autosave(self):
-        self._save_timer = None
-        self.save()
+        """Snapshot the document and write it on a worker thread.
+
+        Only the snapshot (``toHtml()``) runs on the UI thread; hidden (folded)
+        blocks are serialized like any other, so folds are left alone.  One write is in
+        flight at a time: edits made meanwhile are saved once it lands.
+        """
+        if self._save_thread is not None:
+            self._autosave_pending = True
+            return
+        self._autosave_pending = False
+        self._save_seq += 1
+        writes = self._snapshot()
+        if not writes:
+            return
+        thread = QThread()
+        worker = _SaveWorker(self._save_seq, writes, self._next_backup())
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_autosave_written)
+        self._save_thread, self._save_worker = thread, worker
+        thread.start()
+
+    def _on_autosave_written(self, seq: int, written: list, ok: bool):
+        if seq != self._save_seq or self._save_thread is None:
+            return  # superseded by a synchronous save()
+        self._join_save_thread()
+        if not ok:
+            self._save_failed()
+        for path in written:
+            self.file_saved.emit(path)
+        if self._autosave_pending:
+            self._autosave()
+
+    def _join_save_thread(self):
+        """Wait for the autosave thread, if any, and drop it."""
+        if self._save_thread is None:
+            return
+        self._save_thread.quit()
+        self._save_thread.wait()
+        self._save_thread = self._save_worker = None
 
     @staticmethod
     def _strip_inline_fonts(html: str) -> str:
@@ -683,32 +821,36 @@ class RichTextEditorWidget(QWidget):
             self.editor.setHtml(self._default_html)
 
     def save(self):
-        """Save content to disk with .bak backup.
+        """Save content to disk now, atomically, with a rotating .bak backup.
 
-        Temporarily unfolds all blocks before toHtml() to ensure no
-        content is lost, then restores fold state.
+        Waits for an autosave still being written so that callers can read
+        the file as soon as this returns.
         """
-        # Save fold state and unfold everything for a clean export
-        fold_state = self._fold_mgr.save_fold_state()
-        self._fold_mgr.unfold_all()
-
-        html = self.editor.toHtml()
+        self._save_timer.stop()
+        self._join_save_thread()
+        self._save_seq += 1  # an autosave result still queued is stale now
+        self._autosave_pending = False
+        self._write_now(self._snapshot())
+
+    def _write_now(self, writes: list[tuple[str, str | None]]):
+        """Apply *writes* on the calling thread and announce the files written."""
+        if not writes:
+            return
+        try:
+            written = _write_files(writes, self._next_backup())
+        except OSError as e:
+            log.warning("Could not save %s: %s", self._path, e)
+            self._save_failed()
+            return
+        for path in written:
+            self.file_saved.emit(path)
 
-        # Restore folds
-        self._fold_mgr.restore_fold_state(fold_state)
-        self._fold_gutter.update()
+    def _snapshot(self) -> list[tuple[str, str | None]]:
+        """The ``(path, content)`` writes that save the document as it is now."""
+        return [(self._path, self.editor.toHtml())]
 
-        if os.path.exists(self._path):
-            try:
-                shutil.copy2(self._path, self._path + ".bak")
-            except OSError:
-                pass
-        try:
-            with open(self._path, "w", encoding="utf-8") as f:
-                f.write(html)
-            self.file_saved.emit(self._path)
-        except OSError:
-            pass
+    def _save_failed(self):
+        """Called after a save could not be written."""
 
     def reload_from_disk(self):
         """Reload file content from disk (e.g. after a remote sync update)."""
@@ -756,6 +898,7 @@ class RichTextEditorWidget(QWidget):
         self.save()
         self._path = new_path
         self._default_html = new_default_html
+        self._save_count = 0
         self._load()
         # Reset fold state
         self._fold_mgr.unfold_all()
@@ -1,7 +1,6 @@
 """SessionRecapOverlay — 'Last time on...' card shown on startup."""
 
 import logging
-import os
 import re
 
 from PySide6.QtCore import QEvent, Qt, QTimer, Signal
@@ -17,7 +16,8 @@ from PySide6.QtWidgets import (
 )
 
 from .i18n import tr
-from .utils import active_campaign_name, journal_path
+from .journal_store import JournalStore
+from .utils import active_campaign_name, journal_dir
 
 log = logging.getLogger(__name__)
 
@@ -233,15 +233,11 @@ class SessionRecapOverlay(QWidget):
         if not config.get("show_session_recap", True):
             return
 
-        jp = journal_path(config)
-        if not os.path.isfile(jp):
-            return
-
-        try:
-            with open(jp, "r", encoding="utf-8") as f:
-                html = f.read()
-        except OSError:
+        # Only the newest session's file is read
+        store = JournalStore.open(journal_dir(config))
+        if not store.sessions:
             return
+        html = store.read(store.sessions[-1]["id"])
 
         result = _extract_last_session(html)
         if result is None:
@@ -7,7 +7,6 @@ import shutil
 import time
 from datetime import datetime
 
-import soundfile as sf
 from PySide6.QtCore import QRectF, QSize, Qt, QTimer, Signal
 from PySide6.QtGui import (
     QAction,
@@ -41,10 +40,11 @@ from PySide6.QtWidgets import (
 
 from .audio_recorder import AudioRecorder
 from .i18n import tr
-from .quest_extractor import QuestProposalDialog, start_quest_extraction
+from .quest_extractor import QuestProposalDialog, read_quest_log, start_quest_extraction
 from .snow_particles import AuroraShimmerOverlay, SnowParticleOverlay
-from .summarizer import start_summarization
-from .transcriber import start_live_transcription, start_transcription
+from .summarizer import RollingCondenser, start_summarization
+from .transcriber import AudioChunker, start_live_transcription, start_transcription
+from .transcription_manifest import TranscriptionManifest
 from .utils import (
     active_campaign_name,
     ensure_dir,
@@ -311,6 +311,7 @@ class SessionTab(QWidget):
         self._quest_worker = None
         self._current_wav_path = None
         self._current_transcript = ""
+        self._transcript_dir = None  # session folder of a transcript loaded from disk
         self._current_summary = ""
         self._elapsed = 0
         self._pulse_timer = None
@@ -319,13 +320,17 @@ class SessionTab(QWidget):
         # Bookmark state
         self._bookmarks = []  # list of {"timestamp": int, "label": str}
         self._bookmark_pending_ts = 0
+        self._chunk_spans = []  # [(start_s, end_s), ...] of the current batch transcription's chunks
+        self._chunk_texts = []  # texts received so far, in chunk order
 
         # Re-summarize past session state
         self._resummarize_heading = None  # heading text to replace in journal, or None to append
+        self._summarize_after_transcription = False  # set when resuming a partial transcription
 
         # Live transcription state
         self._live_transcript_parts = []  # segment texts only (for counting)
         self._live_ordered_parts = []  # segments + bookmark markers in chronological order
+        self._rolling = None  # RollingCondenser fed with live segments while recording
         self._last_live_transcription = 0.0
         self._live_tx_thread = None
         self._live_tx_worker = None
@@ -596,6 +601,9 @@ class SessionTab(QWidget):
         # Reset live transcription state
         self._live_transcript_parts = []
         self._live_ordered_parts = []
+        self._discard_rolling()
+        if self._config.get("rolling_summary", True) and self._config.get("api_key"):
+            self._rolling = RollingCondenser(self._config)
         self._last_live_transcription = 0.0
         self._live_tx_pending = False
         self._stop_after_current = False
@@ -797,13 +805,15 @@ class SessionTab(QWidget):
             return
 
         session_dir = os.path.dirname(src_path)
-        flac_path = os.path.join(session_dir, "full_audio.flac")
+        if os.path.splitext(src_path)[1].lower() == ".flac":
+            flac_path = src_path  # recorded (or imported) as FLAC — copy as-is
+        else:
+            flac_path = os.path.join(session_dir, "full_audio.flac")
 
         # Convert to FLAC if not already done (e.g. before transcription)
         if not os.path.exists(flac_path):
             try:
-                data, sr = sf.read(src_path, dtype="int16")
-                sf.write(flac_path, data, sr, format="FLAC")
+                AudioChunker.to_flac(src_path, flac_path)
             except Exception as e:
                 self._on_error(tr("session.error.flac_failed", error=e))
                 return
@@ -860,6 +870,8 @@ class SessionTab(QWidget):
         # Write bookmark marker directly into the live transcript stream
         marker = f"[Bookmark: {label}]"
         self._live_ordered_parts.append(marker)
+        if self._rolling:
+            self._rolling.add(marker)
         self.transcript_display.append(marker)
 
         self._save_bookmarks()
@@ -874,16 +886,40 @@ class SessionTab(QWidget):
         with open(path, "w", encoding="utf-8") as f:
             json.dump(self._bookmarks, f, ensure_ascii=False, indent=2)
 
+    @staticmethod
+    def _load_bookmarks(session_dir: str) -> list[dict]:
+        """Read a past session's bookmarks.json, or an empty list."""
+        try:
+            with open(os.path.join(session_dir, "bookmarks.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
     def _inject_bookmarks_proportional(self, text: str) -> str:
         """Insert bookmark markers at proportional positions in a batch transcript."""
         if not self._bookmarks or not text or self._elapsed <= 0:
             return text
-        total = self._elapsed
+        return self._inject_markers(text, self._bookmarks, 0, self._elapsed)
+
+    def _inject_bookmarks_by_chunk(self, texts: list[str], spans: list[tuple[float, float]]) -> str:
+        """Insert bookmark markers into the chunk covering each timestamp, proportionally within it."""
+        parts = []
+        for i, (text, (start, end)) in enumerate(zip(texts, spans)):
+            if i == len(spans) - 1:
+                end = float("inf")  # bookmarks past the decoded length belong to the last chunk
+            inside = [bm for bm in self._bookmarks if start <= bm["timestamp"] < end]
+            duration = spans[i][1] - start
+            parts.append(self._inject_markers(text, inside, start, duration) if text and inside else text)
+        return "\n\n".join(parts)
+
+    @staticmethod
+    def _inject_markers(text: str, bookmarks: list[dict], offset: float, duration: float) -> str:
+        """Insert markers for *bookmarks* into *text*, which spans *duration* seconds from *offset*."""
         length = len(text)
-        for bm in sorted(self._bookmarks, key=lambda b: b["timestamp"], reverse=True):
-            ts = bm["timestamp"]
+        for bm in sorted(bookmarks, key=lambda b: b["timestamp"], reverse=True):
+            ts = bm["timestamp"] - offset
             marker = f"\n[Bookmark: {bm['label']}]\n"
-            pos = min(int((ts / total) * length), length)
+            pos = min(int((ts / duration) * length), length) if duration > 0 else length
             nl = text.rfind("\n", 0, pos + 1)
             if nl == -1:
                 nl = 0
@@ -902,10 +938,13 @@ class SessionTab(QWidget):
         self.status_label.setStyleSheet("color: #d4af37;")
         self.btn_transcribe.setEnabled(False)
         self.transcript_display.clear()
+        self._chunk_spans = []
+        self._chunk_texts = []
 
         self._transcription_thread, self._transcription_worker = start_transcription(wav_path, self._config)
         self._transcription_worker.progress.connect(self._on_transcription_progress)
         self._transcription_worker.chunk_completed.connect(self._on_chunk_completed)
+        self._transcription_worker.chunks_planned.connect(self._on_chunks_planned)
         self._transcription_worker.completed.connect(self._on_transcription_done)
         self._transcription_worker.error.connect(self._on_error)
         self._transcription_thread.start()
@@ -959,6 +998,8 @@ class SessionTab(QWidget):
         if text.strip():
             self._live_transcript_parts.append(text)
             self._live_ordered_parts.append(text)
+            if self._rolling:
+                self._rolling.add(text)
             self.transcript_display.append(text)
 
         if self._is_final_live_chunk:
@@ -990,6 +1031,7 @@ class SessionTab(QWidget):
     def _finalize_live_transcription(self):
         """Combine all live transcript parts (with interleaved bookmarks) into final transcript."""
         full_text = "\n\n".join(self._live_ordered_parts)
+        self._transcript_dir = None
         self._current_transcript = full_text
         self.transcript_display.setPlainText(full_text)
 
@@ -1016,11 +1058,20 @@ class SessionTab(QWidget):
     def _on_transcription_progress(self, current: int, total: int):
         self.status_label.setText(tr("session.status.transcribing_chunk", current=current, total=total))
 
+    def _on_chunks_planned(self, spans: list):
+        self._chunk_spans = spans
+
     def _on_chunk_completed(self, index: int, text: str):
+        self._chunk_texts.append(text)
         self.transcript_display.append(text)
 
     def _on_transcription_done(self, full_text: str):
-        full_text = self._inject_bookmarks_proportional(full_text)
+        if self._bookmarks and self._chunk_spans and len(self._chunk_texts) == len(self._chunk_spans):
+            full_text = self._inject_bookmarks_by_chunk(self._chunk_texts, self._chunk_spans)
+        else:
+            full_text = self._inject_bookmarks_proportional(full_text)
+        self._discard_rolling()
+        self._transcript_dir = None
         self._current_transcript = full_text
         self.transcript_display.setPlainText(full_text)
         self.status_label.setText(tr("session.status.transcription_done"))
@@ -1028,9 +1079,18 @@ class SessionTab(QWidget):
         self._update_action_button()
         self.btn_transcribe.setEnabled(True)
         self.transcription_completed.emit()
+        if self._summarize_after_transcription:
+            self._summarize_after_transcription = False
+            self._start_summarization()
 
     # --- Summarization ---
 
+    def _discard_rolling(self):
+        """Drop the live rolling digest once the transcript no longer comes from live segments."""
+        if self._rolling:
+            self._rolling.close()
+            self._rolling = None
+
     def _start_summarization(self):
         self.btn_transcribe.setEnabled(False)
         self.status_label.setText(tr("session.status.summarizing"))
@@ -1053,13 +1113,22 @@ class SessionTab(QWidget):
             context_parts.append(f"{tr('session.context.quest_header')}\n{quest_context}")
         combined_context = "\n\n".join(context_parts)
 
+        wav_path = self._current_wav_path or self._recorder.wav_path
+        session_dir = self._transcript_dir or (os.path.dirname(wav_path) if wav_path else None)
         self._summary_thread, self._summary_worker = start_summarization(
-            self._current_transcript, combined_context, self._config
+            self._current_transcript, combined_context, self._config, self._rolling, session_dir
         )
+        self._summary_worker.partial.connect(self._on_summary_partial)
         self._summary_worker.completed.connect(self._on_summary_done)
         self._summary_worker.error.connect(self._on_error)
         self._summary_thread.start()
 
+    def _on_summary_partial(self, summary_html: str):
+        """Show the summary as it streams in; scroll stays pinned to the end."""
+        self.summary_display.setHtml(summary_html)
+        bar = self.summary_display.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
     def _on_summary_done(self, summary_html: str):
         self._current_summary = summary_html
         self.summary_display.setHtml(summary_html)
@@ -1102,9 +1171,10 @@ class SessionTab(QWidget):
         if not self._current_summary:
             return
 
-        current_quests = ""
+        current_quests, quest_items = "", []
         if self._quest_log:
             current_quests = self._quest_log.editor.toPlainText()
+            quest_items = read_quest_log(self._quest_log.editor.document())
 
         self.status_label.setText(tr("session.status.quest_extracting"))
         self.status_label.setStyleSheet("color: #d4af37;")
@@ -1113,6 +1183,7 @@ class SessionTab(QWidget):
         self._quest_thread, self._quest_worker = start_quest_extraction(
             self._current_summary,
             current_quests,
+            quest_items,
             self._config,
             campaign_name=active_campaign_name(self._config),
         )
@@ -1120,16 +1191,29 @@ class SessionTab(QWidget):
         self._quest_worker.error.connect(self._on_error)
         self._quest_thread.start()
 
-    def _on_quest_extraction_done(self, proposed_html: str):
+    def _on_quest_extraction_done(self, store, changes: list):
+        if not changes:
+            self.status_label.setText(tr("session.status.quest_no_changes"))
+            self.status_label.setStyleSheet("color: #d4af37;")
+            self.btn_update_quests.setEnabled(True)
+            return
+
         self.status_label.setText(tr("session.status.quest_ready"))
         self.status_label.setStyleSheet("color: #7ec83a;")
 
         current_html = self._quest_log.get_full_html() if self._quest_log else ""
-        dlg = QuestProposalDialog(proposed_html, current_html, self)
+        dlg = QuestProposalDialog(current_html, changes, self)
         if dlg.exec() == QDialog.DialogCode.Accepted:
-            edited_html = dlg.get_html()
             if self._quest_log:
-                self._quest_log.replace_quest_log(edited_html)
+                store.apply(dlg.get_changes())
+                self._quest_log.replace_quest_log(dlg.get_html())
+                # The records now describe the quest log as saved
+                document = self._quest_log.editor.document()
+                store.reconcile(read_quest_log(document), document.toPlainText())
+                try:
+                    store.save()
+                except OSError:
+                    pass  # records are read back from the quest log next time
                 self.status_label.setText(tr("session.status.quest_updated"))
                 self.status_label.setStyleSheet("color: #d4af37;")
         else:
@@ -1165,7 +1249,7 @@ class SessionTab(QWidget):
             self.status_label.setStyleSheet("color: #ff6b6b;")
             return
 
-        # Discover sessions with transcripts
+        # Discover sessions with transcripts, or with an interrupted transcription to resume
         sessions = []
         for name in os.listdir(session_base):
             if not name.startswith("session_"):
@@ -1174,7 +1258,10 @@ class SessionTab(QWidget):
             if not os.path.isdir(folder):
                 continue
             transcript = os.path.join(folder, "transcript.txt")
-            if not os.path.isfile(transcript):
+            manifest = TranscriptionManifest.load(folder)
+            if manifest and (manifest.is_complete or not os.path.isfile(manifest.source_path)):
+                manifest = None
+            if not manifest and not os.path.isfile(transcript):
                 continue
             # Parse datetime from folder name: session_YYYYMMDD_HHMMSS[_suffix]
             parts = name.split("_")
@@ -1185,7 +1272,7 @@ class SessionTab(QWidget):
             except ValueError:
                 continue
             suffix = "_".join(parts[3:]) if len(parts) > 3 else ""
-            sessions.append((dt, name, folder, transcript, suffix))
+            sessions.append((dt, name, folder, transcript, suffix, manifest))
 
         sessions.sort(key=lambda x: x[0], reverse=True)
 
@@ -1201,13 +1288,19 @@ class SessionTab(QWidget):
         layout = QVBoxLayout(dlg)
 
         session_list = QListWidget()
-        for dt, name, folder, transcript, suffix in sessions:
+        for dt, name, folder, transcript, suffix, manifest in sessions:
             date_str = dt.strftime("%d/%m/%Y - %H:%M")
             label = date_str
             if suffix:
                 label += f" ({suffix})"
+            resume_audio = None
+            if manifest:
+                label += " — " + tr(
+                    "session.resummarize.resumable", done=manifest.done_count, total=len(manifest.chunks)
+                )
+                resume_audio = manifest.source_path
             item = QListWidgetItem(label)
-            item.setData(Qt.ItemDataRole.UserRole, (dt, transcript))
+            item.setData(Qt.ItemDataRole.UserRole, (dt, transcript, resume_audio))
             session_list.addItem(item)
         session_list.setCurrentRow(0)
         layout.addWidget(session_list)
@@ -1248,12 +1341,24 @@ class SessionTab(QWidget):
         if not selected:
             return
 
-        _dt, transcript_path = selected.data(Qt.ItemDataRole.UserRole)
+        _dt, transcript_path, resume_audio = selected.data(Qt.ItemDataRole.UserRole)
         self._resummarize_heading = heading_combo.currentText() if replace_cb.isChecked() else None
+        self._discard_rolling()
+
+        if resume_audio:
+            # Finish the interrupted transcription first; summarization follows on completion
+            self._current_wav_path = resume_audio
+            self._summarize_after_transcription = True
+            self._bookmarks = self._load_bookmarks(os.path.dirname(resume_audio))
+            self.summary_display.clear()
+            self._current_summary = ""
+            self._start_transcription()
+            return
 
         # Load transcript and start summarization
         with open(transcript_path, "r", encoding="utf-8") as f:
             self._current_transcript = f.read()
+        self._transcript_dir = os.path.dirname(transcript_path)
 
         self.transcript_display.setPlainText(self._current_transcript)
         self.summary_display.clear()
@@ -1262,6 +1367,7 @@ class SessionTab(QWidget):
         self._start_summarization()
 
     def _on_error(self, msg: str):
+        self._summarize_after_transcription = False
         self.status_label.setText(msg)
         self.status_label.setStyleSheet("color: #ff6b6b;")
         # Restore record button to initial state
@@ -1283,6 +1389,7 @@ class SessionTab(QWidget):
 
     def cleanup(self):
         """Clean up threads and temporary FLAC files on exit."""
+        self._discard_rolling()
         # Remove FLAC files generated during transcription
         self._cleanup_flac_files()
 
@@ -1308,17 +1415,25 @@ class SessionTab(QWidget):
             self._quest_thread.quit()
             self._quest_thread.wait(2000)
 
+    _TEMP_AUDIO_PATTERNS = ("full_audio.flac", "chunk_*.flac", "live_chunk_*.flac")
+
     def _cleanup_flac_files(self):
-        """Remove temporary FLAC files from the current session directory."""
+        """Remove temporary FLAC files from the current session directory.
+
+        The recording itself (``recording.flac``) and imported files are kept.
+        """
         wav_path = self._current_wav_path or getattr(self._recorder, "wav_path", None)
         if not wav_path:
             return
         session_dir = os.path.dirname(wav_path)
-        for flac_file in glob.glob(os.path.join(session_dir, "*.flac")):
-            try:
-                os.remove(flac_file)
-            except OSError:
-                pass
+        for pattern in self._TEMP_AUDIO_PATTERNS:
+            for flac_file in glob.glob(os.path.join(session_dir, pattern)):
+                if os.path.abspath(flac_file) == os.path.abspath(wav_path):
+                    continue
+                try:
+                    os.remove(flac_file)
+                except OSError:
+                    pass
 
     def retranslate_ui(self):
         """Re-apply translated strings to all static UI elements."""
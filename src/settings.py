@@ -117,6 +117,10 @@ class SettingsDialog(QDialog):
         self.chunk_spin.setSuffix(" min")
         adv_layout.addRow(tr("settings.advanced.chunk_label"), self.chunk_spin)
 
+        self.parallelism_spin = QSpinBox()
+        self.parallelism_spin.setRange(1, 8)
+        adv_layout.addRow(tr("settings.advanced.parallelism_label"), self.parallelism_spin)
+
         self.bias_edit = QTextEdit()
         self.bias_edit.setMaximumHeight(120)
         self.bias_edit.setPlaceholderText(tr("settings.advanced.bias_placeholder"))
@@ -281,6 +285,7 @@ class SettingsDialog(QDialog):
         self.show_recap_check.setChecked(self._config.get("show_session_recap", True))
         self.notification_sounds_check.setChecked(self._config.get("notification_sounds_enabled", True))
         self.chunk_spin.setValue(self._config.get("chunk_duration_minutes", 150))
+        self.parallelism_spin.setValue(self._config.get("transcription_parallelism", 3))
 
         bias = self._config.get("context_bias", [])
         self.bias_edit.setPlainText("\n".join(bias))
@@ -315,6 +320,7 @@ class SettingsDialog(QDialog):
         self._config["audio_device"] = self.device_combo.currentData()
         self._config["sample_rate"] = self.sample_rate_spin.value()
         self._config["chunk_duration_minutes"] = self.chunk_spin.value()
+        self._config["transcription_parallelism"] = self.parallelism_spin.value()
         self._config["auto_update_check"] = self.auto_update_check.isChecked()
         self._config["themed_cursors"] = self.themed_cursors_check.isChecked()
         self._config["show_session_recap"] = self.show_recap_check.isChecked()
@@ -1,11 +1,23 @@
 """Summarization via Mistral chat API with epic fantasy style."""
 
+import functools
+import hashlib
+import json
+import logging
+import os
+import queue
 import re
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from PySide6.QtCore import QObject, QThread, Signal
 
 from .i18n import tr
+from .mistral_pool import mistral_call
+from .transcript_segmenter import estimate_tokens, model_context_tokens, segment_transcript
+
+log = logging.getLogger(__name__)
 
 
 def _strip_code_fences(text: str) -> str:
@@ -24,6 +36,10 @@ def _strip_code_fences(text: str) -> str:
     return text.strip()
 
 
+# Opening fence only: partial text is shown as-is, the full cleanup runs once at the end
+_LEADING_FENCE = re.compile(r"^\s*```(?:html)?\s*")
+
+
 class _PartialFormatMap(dict):
     """Dict subclass that leaves unknown {keys} untouched during format_map."""
 
@@ -84,70 +100,126 @@ def get_default_condense() -> str:
     return _get_condense_prompt()
 
 
-def _call_with_retry(fn, retries=3, base_delay=15):
-    """Call fn() with retry and exponential backoff on 429 rate limit."""
-    for attempt in range(retries):
+class CondenseCache:
+    """Condensed transcript segments persisted in a session folder.
+
+    Entries are keyed by the SHA-256 of the segment text; the file also
+    records the condense prompt and model they were produced with, and is
+    emptied as soon as either changes, so a re-summary after editing only
+    the final system prompt skips straight to the final call.
+    """
+
+    FILE_NAME = "condense_cache.json"
+
+    def __init__(self, session_dir: str, condense_template: str, model: str):
+        self._path = os.path.join(session_dir, self.FILE_NAME)
+        self._prompt_hash = hashlib.sha256(condense_template.encode("utf-8")).hexdigest()
+        self._model = model
+        self._entries = {}
         try:
-            return fn()
-        except Exception as e:
-            if "429" in str(e) and attempt < retries - 1:
-                time.sleep(base_delay * (2**attempt))  # 15s, 30s, 60s
-                continue
-            raise
+            with open(self._path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("prompt_hash") == self._prompt_hash and data.get("model") == model:
+                self._entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> str | None:
+        """Condensed form of *text*, or None if it was never condensed."""
+        return self._entries.get(self._key(text))
+
+    def put(self, text: str, condensed: str):
+        """Remember *condensed* as the condensed form of *text*."""
+        self._entries[self._key(text)] = condensed
+
+    def save(self):
+        """Write the cache atomically (temp file + rename)."""
+        data = {"prompt_hash": self._prompt_hash, "model": self._model, "entries": self._entries}
+        tmp_path = self._path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            log.warning("Could not save condense cache: %s", e)
 
 
 class SummarizerWorker(QObject):
     """Runs summarization in a QThread via Mistral chat API."""
 
+    partial = Signal(str)  # summary HTML so far, while streaming
     completed = Signal(str)  # summary HTML
     error = Signal(str)
 
-    def __init__(self, transcript: str, quest_context: str, config: dict):
+    def __init__(
+        self,
+        transcript: str,
+        quest_context: str,
+        config: dict,
+        rolling: "RollingCondenser" = None,
+        session_dir: str = None,
+    ):
         super().__init__()
         self._transcript = transcript
         self._quest_context = quest_context
         self._config = config
+        self._rolling = rolling
+        self._session_dir = session_dir
 
     def run(self):
         """Execute summarization."""
         try:
-            from mistralai import Mistral
-
             api_key = self._config.get("api_key", "")
             if not api_key:
                 self.error.emit(tr("summarizer.error.no_api_key"))
                 return
 
-            client = Mistral(api_key=api_key)
             model = self._config.get("summary_model", "mistral-large-latest")
-
-            transcript = self._transcript
-
-            # Two-stage: condense first if very long
-            if len(transcript) > 28000:
-                transcript = self._condense(client, model, transcript)
-
-            user_template = _get_user_template()
-            user_msg = user_template.format(
-                context=self._quest_context or tr("summarizer.no_context"),
-                transcript=transcript,
-            )
-
+            language = self._config.get("language", "en")
             system_prompt = self._config.get("prompt_summary_system") or _get_system_prompt()
+            user_template = _get_user_template()
+            context = self._quest_context or tr("summarizer.no_context")
 
-            response = _call_with_retry(
-                lambda: client.chat.complete(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_msg},
-                    ],
-                    temperature=0.2,
-                    max_tokens=8000,
+            # Two-stage: condense first if the transcript won't fit one summary call
+            overhead = estimate_tokens(system_prompt + user_template + context, language)
+            single_pass_budget = self._input_budget(model, self._SUMMARY_MAX_TOKENS) - overhead
+            transcript = self._transcript
+            if estimate_tokens(transcript, language) > single_pass_budget:
+                digest = self._rolling_digest()
+                if digest is None:
+                    transcript = self._condense(model, transcript, single_pass_budget)
+                elif estimate_tokens(digest, language) > single_pass_budget:
+                    transcript = self._condense(model, digest, single_pass_budget)
+                else:
+                    transcript = digest
+
+            user_msg = user_template.format(context=context, transcript=transcript)
+
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_msg},
+            ]
+            if self._config.get("summary_streaming", True):
+                summary = mistral_call(
+                    self._config, "chat", lambda client, timeout_ms: self._stream(client, model, messages, timeout_ms)
                 )
-            )
-
-            summary = response.choices[0].message.content
+            else:
+                response = mistral_call(
+                    self._config,
+                    "chat",
+                    lambda client, timeout_ms: client.chat.complete(
+                        model=model,
+                        messages=messages,
+                        temperature=0.2,
+                        max_tokens=self._SUMMARY_MAX_TOKENS,
+                        timeout_ms=timeout_ms,
+                    ),
+                )
+                summary = response.choices[0].message.content
             # Strip markdown code fences the model sometimes wraps around HTML
             summary = _strip_code_fences(summary)
             self.completed.emit(summary)
@@ -155,31 +227,220 @@ class SummarizerWorker(QObject):
         except Exception as e:
             self.error.emit(tr("summarizer.error.generic", error=e))
 
-    _CHUNK_SIZE = 40_000  # chars per condensation chunk
+    _SUMMARY_MAX_TOKENS = 8000  # output budget of the final summary call
+    _PARTIAL_INTERVAL = 0.25  # seconds between partial summary updates while streaming
+    _CONDENSE_MAX_TOKENS = 12000  # output budget of each condense call
+    _MAX_SEGMENT_TOKENS = 10_000  # input per condense call; larger slices lose detail
+    _CONTEXT_MARGIN = 0.9  # share of the context window used, leaving room for estimate error
+    _MAX_REDUCE_LEVELS = 3  # condense passes at most, including the first
+
+    def _rolling_digest(self) -> str | None:
+        """Return the digest condensed during live recording, or None to condense from scratch."""
+        if self._rolling is None:
+            return None
+        try:
+            return self._rolling.digest()
+        except Exception as e:
+            log.warning("Rolling condensation failed, condensing the full transcript: %s", e)
+            return None
+
+    def _stream(self, client, model: str, messages: list[dict], timeout_ms: int) -> str:
+        """Stream the final summary, emitting the text so far at most every ``_PARTIAL_INTERVAL``.
+
+        A retried call starts over, and its first partial replaces the
+        previous attempt's text on screen.
+        """
+        parts = []
+        last_emit = time.monotonic()
+        for event in client.chat.stream(
+            model=model,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=self._SUMMARY_MAX_TOKENS,
+            timeout_ms=timeout_ms,
+        ):
+            choices = event.data.choices
+            delta = choices[0].delta.content if choices else None
+            if isinstance(delta, str) and delta:
+                parts.append(delta)
+                now = time.monotonic()
+                if now - last_emit >= self._PARTIAL_INTERVAL:
+                    last_emit = now
+                    self.partial.emit(_LEADING_FENCE.sub("", "".join(parts)))
+        return "".join(parts)
+
+    @classmethod
+    def _input_budget(cls, model: str, max_output_tokens: int) -> int:
+        """Tokens of input that fit *model*'s context next to *max_output_tokens* of output."""
+        return int(model_context_tokens(model) * cls._CONTEXT_MARGIN) - max_output_tokens
+
+    @classmethod
+    def _segment_budget(cls, model: str, condense_template: str, language: str) -> int:
+        """Tokens of transcript per condense call."""
+        return min(
+            cls._MAX_SEGMENT_TOKENS,
+            cls._input_budget(model, cls._CONDENSE_MAX_TOKENS) - estimate_tokens(condense_template, language),
+        )
 
-    def _condense(self, client, model: str, text: str) -> str:
-        """Condense a long transcript in chunks before final summarization."""
+    @classmethod
+    def _condense_one(cls, config: dict, model: str, condense_template: str, text: str) -> str:
+        """Condense one transcript segment with a single chat call."""
+        prompt = condense_template.format(text=text)
+        response = mistral_call(
+            config,
+            "chat",
+            lambda client, timeout_ms: client.chat.complete(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.0,
+                max_tokens=cls._CONDENSE_MAX_TOKENS,
+                timeout_ms=timeout_ms,
+            ),
+        )
+        return response.choices[0].message.content
+
+    def _condense(self, model: str, text: str, target_tokens: int) -> str:
+        """Condense a long transcript in segments before final summarization.
+
+        The transcript is split at speaker turns, bookmarks and paragraphs
+        into segments sized to the condense call's budget.  Segments are
+        condensed concurrently (``summary_parallelism`` at a time) and
+        reassembled in order.  With ``summary_hierarchical_reduce``, a result
+        still above *target_tokens* is re-segmented and condensed again.
+        """
+        language = self._config.get("language", "en")
         condense_template = self._config.get("prompt_condense") or _get_condense_prompt()
-        chunks = [text[i : i + self._CHUNK_SIZE] for i in range(0, len(text), self._CHUNK_SIZE)]
-        condensed_parts = []
-        for chunk in chunks:
-            prompt = condense_template.format(text=chunk)
-            response = _call_with_retry(
-                lambda: client.chat.complete(
-                    model=model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.0,
-                    max_tokens=12000,
-                )
+        segment_tokens = self._segment_budget(model, condense_template, language)
+        segments = segment_transcript(text, segment_tokens, language)
+        cache = None
+        if self._session_dir and os.path.isdir(self._session_dir):
+            cache = CondenseCache(self._session_dir, condense_template, model)
+        parts = self._condense_chunks(model, condense_template, segments, cache)
+        condensed = "\n\n".join(parts)
+
+        if not self._config.get("summary_hierarchical_reduce", True):
+            return condensed
+        for _level in range(1, self._MAX_REDUCE_LEVELS):
+            if estimate_tokens(condensed, language) <= target_tokens or len(parts) < 2:
+                break
+            parts = self._condense_chunks(
+                model, condense_template, segment_transcript(condensed, segment_tokens, language), cache
             )
-            condensed_parts.append(response.choices[0].message.content)
-        return "\n\n".join(condensed_parts)
-
+            reduced = "\n\n".join(parts)
+            if len(reduced) >= len(condensed):
+                break  # not shrinking any more; further passes would only lose detail
+            condensed = reduced
+        return condensed
+
+    def _condense_chunks(
+        self, model: str, condense_template: str, chunks: list[str], cache: CondenseCache = None
+    ) -> list[str]:
+        """Condense *chunks* on a bounded pool; results come back in chunk order.
+
+        Chunks found in *cache* are not sent again; new results are added to it.
+        """
+        results = [cache.get(chunk) if cache else None for chunk in chunks]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        condense_one = functools.partial(self._condense_one, self._config, model, condense_template)
+        parallelism = max(1, int(self._config.get("summary_parallelism", 3)))
+        pool = ThreadPoolExecutor(max_workers=min(parallelism, len(missing)), thread_name_prefix="condense")
+        try:
+            for i, result in zip(missing, pool.map(condense_one, [chunks[i] for i in missing])):
+                results[i] = result
+                if cache:
+                    cache.put(chunks[i], result)
+        finally:
+            # On failure, drop chunks still queued instead of finishing them;
+            # results collected so far are kept for the next attempt.
+            pool.shutdown(wait=True, cancel_futures=True)
+            if cache:
+                cache.save()
+        return results
+
+
+class RollingCondenser:
+    """Condenses a live transcript in the background while the session is still recording.
+
+    Segments are buffered until they fill one condense call's budget, then
+    condensed on a single background thread so the digest stays in order.
+    The thread is a daemon, so a call still in flight when the app exits is
+    abandoned instead of holding up interpreter shutdown.  At the end,
+    :meth:`digest` waits for the call in flight and returns the condensed
+    parts followed by the raw tail that never filled a segment, so only the
+    final summary call remains when recording stops.
+    """
 
-def start_summarization(transcript: str, quest_context: str, config: dict) -> tuple[QThread, SummarizerWorker]:
-    """Create and start a summarization worker in a new thread."""
+    def __init__(self, config: dict):
+        self._config = config
+        self._model = config.get("summary_model", "mistral-large-latest")
+        self._language = config.get("language", "en")
+        self._template = config.get("prompt_condense") or _get_condense_prompt()
+        self._segment_tokens = SummarizerWorker._segment_budget(self._model, self._template, self._language)
+        self._queue = queue.Queue()  # (future, segment) pairs; None stops the thread
+        self._lock = threading.Lock()
+        self._futures = []
+        self._pending = []  # raw parts not yet sent for condensation
+        self._pending_tokens = 0
+        threading.Thread(target=self._run, name="rolling-condense", daemon=True).start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, segment = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(SummarizerWorker._condense_one(self._config, self._model, self._template, segment))
+            except Exception as e:
+                future.set_exception(e)
+
+    def add(self, text: str):
+        """Append a transcript segment (or bookmark marker) in chronological order."""
+        with self._lock:
+            self._pending.append(text)
+            self._pending_tokens += estimate_tokens(text, self._language)
+            if self._pending_tokens < self._segment_tokens:
+                return
+            segment = "\n\n".join(self._pending)
+            self._pending, self._pending_tokens = [], 0
+            future = Future()
+            self._futures.append(future)
+            self._queue.put((future, segment))
+
+    def digest(self) -> str:
+        """Condensed parts so far plus the raw tail, waiting for any call in flight."""
+        with self._lock:
+            futures = list(self._futures)
+            tail = list(self._pending)
+        return "\n\n".join([f.result() for f in futures] + tail)
+
+    def close(self):
+        """Drop queued condensation work; the digest is no longer needed."""
+        with self._lock:
+            for future in self._futures:
+                future.cancel()
+        self._queue.put(None)
+
+
+def start_summarization(
+    transcript: str,
+    quest_context: str,
+    config: dict,
+    rolling: RollingCondenser = None,
+    session_dir: str = None,
+) -> tuple[QThread, SummarizerWorker]:
+    """Create and start a summarization worker in a new thread.
+
+    Pass the *rolling* condenser of a live-transcribed session to reuse its
+    digest, and the *session_dir* to reuse condensations from earlier runs.
+    """
     thread = QThread()
-    worker = SummarizerWorker(transcript, quest_context, config)
+    worker = SummarizerWorker(transcript, quest_context, config, rolling, session_dir)
     worker.moveToThread(thread)
     thread.started.connect(worker.run)
     worker.completed.connect(thread.quit)
@@ -2,61 +2,174 @@
 
 import os
 import re
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import numpy as np
 import soundfile as sf
 from PySide6.QtCore import QObject, QThread, Signal
 
+from .flac_index import load_or_build_seek_index, write_slice
 from .i18n import tr
+from .mistral_pool import mistral_call
+from .transcript_cache import TranscriptCache, cache_key, file_sha256, get_transcript_cache
+from .transcription_manifest import STATUS_DONE, TranscriptionManifest, job_settings
 
 
 class AudioChunker:
-    """Splits a WAV file into chunks if it exceeds max duration."""
+    """Splits a recording into FLAC chunks if it exceeds max duration.
+
+    FLAC input (the recorder's default format) is never decoded: a short
+    recording is sent as-is and a long one is sliced at frame boundaries
+    through its seek index.  Other formats are streamed block by block into
+    FLAC, so peak memory stays at one read block whatever the file length.
+
+    Cut points are silence-aware: for each nominal cut, the
+    ``chunk_silence_search_seconds`` before it are scanned for the quietest
+    stretch and the chunk ends there, with no overlap.  Setting the search
+    window to 0 restores fixed cuts with a 10s overlap.
+    """
+
+    _BLOCK_FRAMES = 1 << 16  # frames read per streaming step (~4s at 16 kHz)
+    _OVERLAP_SECONDS = 10  # overlap between fixed (non silence-aware) cuts
+    _RMS_FRAME_SECONDS = 0.02  # frame length for the RMS scan
+    _RMS_SMOOTH_SECONDS = 0.5  # quiet stretch length looked for around a cut
 
     @staticmethod
-    def chunk_audio(wav_path: str, max_minutes: int = 150) -> list[str]:
-        """Split WAV into chunks with 10s overlap. Returns list of file paths."""
+    def chunk_audio(wav_path: str, max_minutes: int = 150, search_seconds: float = 30) -> list[str]:
+        """Split audio into chunks. Returns list of file paths."""
+        return [path for path, _start, _end in AudioChunker.chunk_audio_spans(wav_path, max_minutes, search_seconds)]
+
+    @staticmethod
+    def chunk_audio_spans(
+        wav_path: str, max_minutes: int = 150, search_seconds: float = 30
+    ) -> list[tuple[str, float, float]]:
+        """Split audio into chunks and return ``(path, start_s, end_s)`` for each.
+
+        The spans are the exact positions of each chunk in the source
+        recording, so chunk-relative timestamps can be mapped back.
+        """
         info = sf.info(wav_path)
         total_seconds = info.duration
         max_seconds = max_minutes * 60
 
         sr = info.samplerate
         chunk_dir = os.path.dirname(wav_path)
+        is_flac = info.format == "FLAC"
 
         if total_seconds <= max_seconds:
+            if is_flac:
+                return [(wav_path, 0.0, total_seconds)]
             flac_path = os.path.join(chunk_dir, "full_audio.flac")
-            data, _ = sf.read(wav_path, dtype="int16")
-            sf.write(flac_path, data, sr, format="FLAC")
-            return [flac_path]
+            AudioChunker.to_flac(wav_path, flac_path)
+            return [(flac_path, 0.0, total_seconds)]
 
-        overlap_samples = int(10 * sr)
         chunk_samples = int(max_seconds * sr)
+        search_samples = int(search_seconds * sr)
+
+        with sf.SoundFile(wav_path) as src:
+            index = load_or_build_seek_index(wav_path) if is_flac else None
+            step = index["blocksize"] if index else 1
+            spans = []
+            start = 0
+            idx = 0
+
+            while start < src.frames:
+                nominal = start + chunk_samples
+                if nominal >= src.frames:
+                    end = src.frames
+                elif search_samples > 0:
+                    end = AudioChunker._find_quiet_cut(src, max(start + step, nominal - search_samples), nominal, step)
+                else:
+                    end = nominal
+
+                chunk_path = os.path.join(chunk_dir, f"chunk_{idx:03d}.flac")
+                if index:
+                    start, end = write_slice(wav_path, index, start, end, chunk_path)
+                else:
+                    AudioChunker._stream_range(src, chunk_path, start, end)
+                spans.append((chunk_path, start / sr, end / sr))
+
+                idx += 1
+                if end >= src.frames:
+                    break
+                start = end if search_samples > 0 else end - int(AudioChunker._OVERLAP_SECONDS * sr)
+
+        return spans
 
-        chunks = []
-        data, _ = sf.read(wav_path, dtype="int16")
-
-        total_samples = len(data)
-        start = 0
-        idx = 0
-
-        while start < total_samples:
-            end = min(start + chunk_samples, total_samples)
-            chunk_data = data[start:end]
-
-            chunk_path = os.path.join(chunk_dir, f"chunk_{idx:03d}.flac")
-            sf.write(chunk_path, chunk_data, sr, format="FLAC")
-            chunks.append(chunk_path)
-
-            idx += 1
-            start = end - overlap_samples
-            if end >= total_samples:
-                break
+    @staticmethod
+    def _find_quiet_cut(src: sf.SoundFile, lo: int, hi: int, step: int = 1) -> int:
+        """Return the cut sample in [lo, hi] with the lowest smoothed frame RMS.
+
+        Only the search window is decoded.  Candidates are restricted to
+        multiples of *step* (the FLAC block size when slicing frames);
+        ties go to the candidate closest to *hi*, the nominal cut.
+        """
+        sr = src.samplerate
+        frame = max(1, int(sr * AudioChunker._RMS_FRAME_SECONDS))
+        src.seek(lo)
+        data = src.read(hi - lo, dtype="float32", always_2d=True)
+        n_frames = len(data) // frame
+        candidates = np.arange(-(-lo // step) * step, hi + 1, step)
+        if n_frames == 0 or len(candidates) == 0:
+            return hi - hi % step
+
+        power = np.square(data[: n_frames * frame]).mean(axis=1).reshape(n_frames, frame).mean(axis=1)
+        width = max(1, int(AudioChunker._RMS_SMOOTH_SECONDS / AudioChunker._RMS_FRAME_SECONDS))
+        energy = np.convolve(power, np.ones(width) / width, mode="same")
+
+        frame_idx = np.clip((candidates - lo) // frame, 0, n_frames - 1)
+        best = np.lexsort((hi - candidates, energy[frame_idx]))[0]
+        return int(candidates[best])
 
-        return chunks
+    @staticmethod
+    def extract_range(src_path: str, start: int, end: int, flac_path: str) -> None:
+        """Write frames [start, end) of *src_path* to *flac_path*, as chunking would have."""
+        if sf.info(src_path).format == "FLAC":
+            write_slice(src_path, load_or_build_seek_index(src_path), start, end, flac_path)
+        else:
+            with sf.SoundFile(src_path) as src:
+                AudioChunker._stream_range(src, flac_path, start, end)
 
+    @staticmethod
+    def to_flac(src_path: str, flac_path: str) -> None:
+        """Stream-convert any soundfile-readable audio file to 16-bit FLAC."""
+        with sf.SoundFile(src_path) as src:
+            AudioChunker._stream_range(src, flac_path, 0, src.frames)
 
-def _transcribe_file(client, chunk_path: str, config: dict, retries: int = 3) -> str:
-    """Transcribe a single audio file using Mistral Voxtral API with retry logic."""
+    @staticmethod
+    def _stream_range(src: sf.SoundFile, flac_path: str, start: int, end: int) -> None:
+        """Copy frames [start, end) of an open SoundFile into a new FLAC file, block by block."""
+        src.seek(start)
+        remaining = end - start
+        with sf.SoundFile(
+            flac_path,
+            mode="w",
+            samplerate=src.samplerate,
+            channels=src.channels,
+            format="FLAC",
+            subtype="PCM_16",
+        ) as dst:
+            while remaining > 0:
+                block = src.read(min(AudioChunker._BLOCK_FRAMES, remaining), dtype="int16")
+                if not len(block):
+                    break
+                dst.write(block)
+                remaining -= len(block)
+
+
+def _transcribe_file(
+    chunk_path: str,
+    config: dict,
+    cache: TranscriptCache = None,
+    audio_hash: str = None,
+) -> str:
+    """Transcribe a single audio file using Mistral Voxtral API.
+
+    Rate limiting and retries are handled by the shared client pool.
+    With a *cache*, a chunk already transcribed with the same settings is
+    returned without calling the API, and new results are stored;
+    *audio_hash* saves re-hashing a chunk whose SHA-256 is already known.
+    """
     _BIAS_VALID = re.compile(r"^[a-zA-Z0-9_-]+$")  # pylint: disable=invalid-name
     raw_bias = config.get("context_bias", [])
     context_bias = []
@@ -69,51 +182,66 @@ def _transcribe_file(client, chunk_path: str, config: dict, retries: int = 3) ->
     model = config.get("transcription_model", "voxtral-mini-latest")
     diarize = config.get("diarize", False)
 
-    for attempt in range(retries):
-        try:
-            with open(chunk_path, "rb") as f:
-                kwargs = dict(
-                    model=model,
-                    file={"file_name": os.path.basename(chunk_path), "content": f},
-                    language=language,
-                    context_bias=context_bias or None,
-                    diarize=diarize,
-                )
-                if diarize:
-                    kwargs["timestamp_granularities"] = ["segment"]
-                result = client.audio.transcriptions.complete(**kwargs)
-
-            if diarize and hasattr(result, "segments") and result.segments:
-                parts = []
-                for seg in result.segments:
-                    speaker = getattr(seg, "speaker", None)
-                    text = getattr(seg, "text", str(seg))
-                    if speaker is not None:
-                        parts.append(f"[{speaker}]: {text}")
-                    else:
-                        parts.append(text)
-                return "\n".join(parts)
-
-            return result.text if hasattr(result, "text") else str(result)
-
-        except Exception as e:
-            err_str = str(e)
-            if "401" in err_str:
-                raise RuntimeError(tr("transcriber.error.invalid_key"))
-            if "429" in err_str and attempt < retries - 1:
-                wait = 15 * (2**attempt)  # 15s, 30s, 60s
-                time.sleep(wait)
-                continue
-            if attempt == retries - 1:
-                raise
-    return ""
+    key = None
+    if cache is not None:
+        key = cache_key(audio_hash or file_sha256(chunk_path), model, language, diarize, context_bias)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    def request(client, timeout_ms):
+        # Reopened on every attempt: a failed upload leaves the file consumed.
+        with open(chunk_path, "rb") as f:
+            kwargs = dict(
+                model=model,
+                file={"file_name": os.path.basename(chunk_path), "content": f},
+                language=language,
+                context_bias=context_bias or None,
+                diarize=diarize,
+                timeout_ms=timeout_ms,
+            )
+            if diarize:
+                kwargs["timestamp_granularities"] = ["segment"]
+            return client.audio.transcriptions.complete(**kwargs)
+
+    try:
+        result = mistral_call(config, "transcription", request)
+    except Exception as e:
+        if "401" in str(e):
+            raise RuntimeError(tr("transcriber.error.invalid_key"))
+        raise
+
+    if diarize and hasattr(result, "segments") and result.segments:
+        parts = []
+        for seg in result.segments:
+            speaker = getattr(seg, "speaker", None)
+            text = getattr(seg, "text", str(seg))
+            if speaker is not None:
+                parts.append(f"[{speaker}]: {text}")
+            else:
+                parts.append(text)
+        text = "\n".join(parts)
+    else:
+        text = result.text if hasattr(result, "text") else str(result)
+
+    if key is not None and text.strip():
+        cache.put(key, text)
+    return text
 
 
 class TranscriptionWorker(QObject):
-    """Runs transcription in a QThread via Mistral Voxtral API."""
+    """Runs transcription in a QThread via Mistral Voxtral API.
+
+    Chunks are sent concurrently, up to ``transcription_parallelism`` at a
+    time; ``progress`` and ``chunk_completed`` are still emitted in chunk
+    order, holding back any chunk that finishes before its predecessors.
+    Progress is kept in the session's transcription manifest, so a run
+    that was interrupted resumes from its unfinished chunks.
+    """
 
     progress = Signal(int, int)  # current, total
     chunk_completed = Signal(int, str)  # index, text
+    chunks_planned = Signal(list)  # [(start_s, end_s), ...] of each chunk in the recording
     completed = Signal(str)  # full transcript
     error = Signal(str)
 
@@ -125,24 +253,15 @@ class TranscriptionWorker(QObject):
     def run(self):
         """Execute transcription pipeline."""
         try:
-            from mistralai import Mistral
-
             api_key = self._config.get("api_key", "")
             if not api_key:
                 self.error.emit(tr("transcriber.error.no_api_key"))
                 return
 
-            client = Mistral(api_key=api_key)
-            max_minutes = self._config.get("chunk_duration_minutes", 150)
-            chunks = AudioChunker.chunk_audio(self._wav_path, max_minutes)
-            total = len(chunks)
-            full_text_parts = []
-
-            for i, chunk_path in enumerate(chunks):
-                self.progress.emit(i + 1, total)
-                text = _transcribe_file(client, chunk_path, self._config)
-                full_text_parts.append(text)
-                self.chunk_completed.emit(i, text)
+            manifest = self._load_or_plan_manifest()
+            self.chunks_planned.emit([(c["start_s"], c["end_s"]) for c in manifest.chunks])
+            parallelism = max(1, int(self._config.get("transcription_parallelism", 3)))
+            full_text_parts = self._transcribe_chunks(manifest, parallelism)
 
             full_text = "\n\n".join(full_text_parts)
 
@@ -151,12 +270,90 @@ class TranscriptionWorker(QObject):
             transcript_path = os.path.join(session_dir, "transcript.txt")
             with open(transcript_path, "w", encoding="utf-8") as f:
                 f.write(full_text)
+            manifest.mark_complete()
 
             self.completed.emit(full_text)
 
         except Exception as e:
             self.error.emit(tr("transcriber.error.transcription", error=e))
 
+    def _load_or_plan_manifest(self) -> TranscriptionManifest:
+        """Resume the session's unfinished job if it still applies, else chunk the audio afresh."""
+        settings = job_settings(self._config)
+        manifest = TranscriptionManifest.load(os.path.dirname(self._wav_path))
+        if manifest and not manifest.is_complete and manifest.matches(self._wav_path, settings):
+            # Chunk files may have been cleaned up since; slicing is deterministic,
+            # so missing ones are re-created from their recorded sample range.
+            for i, chunk in enumerate(manifest.chunks):
+                path = manifest.chunk_path(i)
+                if chunk["status"] != STATUS_DONE and not os.path.exists(path):
+                    AudioChunker.extract_range(self._wav_path, chunk["start_sample"], chunk["end_sample"], path)
+            return manifest
+
+        max_minutes = self._config.get("chunk_duration_minutes", 150)
+        search_seconds = self._config.get("chunk_silence_search_seconds", 30)
+        spans = AudioChunker.chunk_audio_spans(self._wav_path, max_minutes, search_seconds)
+        sr = sf.info(self._wav_path).samplerate
+        chunks = [
+            {
+                "file": os.path.basename(path),
+                "start_sample": round(start * sr),
+                "end_sample": round(end * sr),
+                "start_s": start,
+                "end_s": end,
+                "sha256": file_sha256(path),
+            }
+            for path, start, end in spans
+        ]
+        return TranscriptionManifest.create(self._wav_path, settings, chunks)
+
+    def _transcribe_chunks(self, manifest: TranscriptionManifest, parallelism: int) -> list[str]:
+        """Transcribe the manifest's pending chunks on a bounded pool; return all texts in chunk order.
+
+        Chunks already done in a previous run are emitted straight from the
+        manifest, which is updated as each remaining chunk finishes.
+        """
+        total = len(manifest.chunks)
+        texts = [c["text"] if c["status"] == STATUS_DONE else None for c in manifest.chunks]
+        pending = [i for i, text in enumerate(texts) if text is None]
+        cache = get_transcript_cache(self._config)
+        next_index = 0  # first chunk not yet emitted
+
+        def emit_ready():
+            nonlocal next_index
+            while next_index < total and texts[next_index] is not None:
+                self.chunk_completed.emit(next_index, texts[next_index])
+                next_index += 1
+                if next_index < total:
+                    self.progress.emit(next_index + 1, total)
+
+        self.progress.emit(1, total)
+        emit_ready()
+        if not pending:
+            return texts
+
+        pool = ThreadPoolExecutor(max_workers=min(parallelism, len(pending)), thread_name_prefix="transcribe")
+        try:
+            futures = {
+                pool.submit(
+                    _transcribe_file,
+                    manifest.chunk_path(i),
+                    self._config,
+                    cache=cache,
+                    audio_hash=manifest.chunks[i]["sha256"],
+                ): i
+                for i in pending
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                texts[i] = future.result()
+                manifest.mark_done(i, texts[i])
+                emit_ready()
+        finally:
+            # On failure, drop chunks still queued instead of finishing them.
+            pool.shutdown(wait=True, cancel_futures=True)
+        return texts
+
 
 class LiveTranscriptionWorker(QObject):
     """Transcribes a single audio chunk for live/incremental transcription."""
@@ -172,15 +369,12 @@ class LiveTranscriptionWorker(QObject):
     def run(self):
         """Transcribe a single audio chunk and emit the result."""
         try:
-            from mistralai import Mistral
-
             api_key = self._config.get("api_key", "")
             if not api_key:
                 self.error.emit(tr("transcriber.error.no_api_key_short"))
                 return
 
-            client = Mistral(api_key=api_key)
-            text = _transcribe_file(client, self._flac_path, self._config)
+            text = _transcribe_file(self._flac_path, self._config)
 
             # Clean up temp FLAC file
             try:
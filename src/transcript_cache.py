@@ -0,0 +1,151 @@
+"""Content-addressed on-disk cache of chunk transcriptions.
+
+Entries are keyed by the SHA-256 of the audio chunk plus every request
+parameter that changes the result (model, language, diarize flag and the
+normalized context bias), so re-transcribing audio that was already
+processed skips the upload entirely.  Each entry is a small text file;
+file mtimes double as LRU timestamps and the oldest entries are evicted
+once the cache grows past its size limit.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from .utils import ensure_dir, project_root
+
+log = logging.getLogger(__name__)
+
+_CACHE_SUBDIR = os.path.join("cache", "transcripts")
+_READ_BLOCK = 1 << 20
+
+
+def file_sha256(path: str) -> str:
+    """Return the hex SHA-256 of a file, read in blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_READ_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_key(audio_hash: str, model: str, language: str, diarize: bool, context_bias: list[str]) -> str:
+    """Build the cache key for one transcription request.
+
+    *context_bias* is normalized (deduplicated, sorted) so reordering the
+    bias list in the settings does not invalidate the cache.
+    """
+    params = json.dumps(
+        {
+            "model": model,
+            "language": language,
+            "diarize": bool(diarize),
+            "context_bias": sorted(set(context_bias)),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(f"{audio_hash}\n{params}".encode("utf-8")).hexdigest()
+
+
+class TranscriptCache:
+    """Thread-safe LRU cache of transcription texts, bounded by total size on disk."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self._dir = ensure_dir(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None  # computed lazily on first put
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._dir, f"{key}.txt")
+
+    def get(self, key: str) -> str | None:
+        """Return the cached text for *key*, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str):
+        """Store *text* under *key*, then evict least recently used entries over the limit."""
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        data = text.encode("utf-8")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log.warning("Could not write transcript cache entry: %s", e)
+            return
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _mtime, size, _path in self._scan())
+            else:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        """Return ``(mtime, size, path)`` for every entry."""
+        entries = []
+        for name in os.listdir(self._dir):
+            if not name.endswith(".txt"):
+                continue
+            path = os.path.join(self._dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict(self):
+        """Delete the oldest entries until the cache fits its limit. Caller holds the lock."""
+        entries = sorted(self._scan())
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_transcript_cache(config: dict) -> TranscriptCache:
+    """Return the process-wide transcript cache, created on first use."""
+    global _cache  # pylint: disable=global-statement
+    with _cache_lock:
+        max_bytes = int(config.get("transcription_cache_mb", 50)) * 1024 * 1024
+        if _cache is None:
+            _cache = TranscriptCache(os.path.join(project_root(), _CACHE_SUBDIR), max_bytes)
+        else:
+            _cache.max_bytes = max_bytes
+        return _cache
+
+
+def transcript_cache_stats() -> tuple[int, int]:
+    """Return ``(hits, misses)`` of the process-wide cache, or zeros before first use."""
+    with _cache_lock:
+        if _cache is None:
+            return 0, 0
+        return _cache.hits, _cache.misses
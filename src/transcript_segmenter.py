@@ -0,0 +1,126 @@
+"""Token-aware transcript segmentation for summarization.
+
+Transcripts are split at natural boundaries — diarized speaker turns
+(``[speaker]: ...`` lines), bookmark markers and paragraph breaks — and
+packed greedily into segments that fit a token budget.  A single unit that
+is larger than the budget on its own is split at sentence ends, and as a
+last resort at whitespace.
+
+Token counts are estimated from character counts with rough per-language
+ratios for conversational text, which is close enough for budgeting and
+avoids shipping a tokenizer.
+"""
+
+import re
+
+# Average characters per token by transcript language.
+_CHARS_PER_TOKEN = {
+    "en": 4.0,
+    "fr": 3.6,
+    "de": 3.5,
+    "es": 3.7,
+    "it": 3.6,
+    "nl": 3.5,
+    "pt": 3.7,
+}
+_DEFAULT_CHARS_PER_TOKEN = 3.6
+
+# Context windows (tokens) by model name prefix; first match wins.
+_MODEL_CONTEXT = (
+    ("mistral-large", 128_000),
+    ("mistral-medium", 128_000),
+    ("mistral-small", 128_000),
+    ("magistral", 40_000),
+    ("ministral", 128_000),
+    ("open-mistral-nemo", 128_000),
+    ("codestral", 256_000),
+)
+_DEFAULT_CONTEXT = 32_000
+
+_UNIT_START = re.compile(r"^(?:\[[^\]\n]+\]:|\[Bookmark: [^\]\n]*\])", re.MULTILINE)
+_BOOKMARK = re.compile(r"\[Bookmark: [^\]\n]*\]")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def estimate_tokens(text: str, language: str = "en") -> int:
+    """Estimate the token count of *text* for a transcript in *language*."""
+    return int(len(text) / _CHARS_PER_TOKEN.get(language, _DEFAULT_CHARS_PER_TOKEN)) + 1
+
+
+def model_context_tokens(model: str) -> int:
+    """Return the context window of *model*, in tokens."""
+    for prefix, tokens in _MODEL_CONTEXT:
+        if model.startswith(prefix):
+            return tokens
+    return _DEFAULT_CONTEXT
+
+
+def _split_units(text: str) -> list[str]:
+    """Split *text* into speaker turns, bookmark markers and paragraphs, in order."""
+    units = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        starts = [m.start() for m in _UNIT_START.finditer(paragraph)]
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+        starts.append(len(paragraph))
+        for a, b in zip(starts, starts[1:]):
+            unit = paragraph[a:b].strip()
+            if unit:
+                units.append(unit)
+    return units
+
+
+def _split_oversized(unit: str, max_chars: int) -> list[str]:
+    """Split a unit longer than *max_chars* at sentence ends, else at whitespace."""
+    pieces = []
+    current = ""
+    for sentence in _SENTENCE_END.split(unit):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def segment_transcript(text: str, max_tokens: int, language: str = "en") -> list[str]:
+    """Split *text* into segments of at most *max_tokens* estimated tokens.
+
+    Segments break only between speaker turns, bookmark markers or
+    paragraphs, unless a single unit is itself over budget.  A bookmark
+    marker is kept with the turn that follows it.
+    """
+    ratio = _CHARS_PER_TOKEN.get(language, _DEFAULT_CHARS_PER_TOKEN)
+    max_chars = max(1, int(max_tokens * ratio))
+
+    segments = []
+    current = []
+    size = 0
+    marker = ""  # bookmark marker waiting for the turn it introduces
+    for unit in _split_units(text):
+        if _BOOKMARK.fullmatch(unit):
+            marker = f"{marker}{unit}\n"
+            continue
+        unit, marker = marker + unit, ""
+        for piece in _split_oversized(unit, max_chars) if len(unit) > max_chars else (unit,):
+            if current and size + len(piece) > max_chars:
+                segments.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 2
+    if marker:
+        current.append(marker.rstrip())
+    if current:
+        segments.append("\n\n".join(current))
+    return segments
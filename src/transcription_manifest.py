@@ -0,0 +1,134 @@
+"""Per-session transcription job manifest, so interrupted runs can resume.
+
+The manifest (``transcription_job.json`` in the session folder) records the
+source recording, the settings that shaped the chunks and their texts, and
+one entry per chunk: its sample range in the recording, the SHA-256 of the
+chunk file, its status and, once done, its text.  It is rewritten after
+every finished chunk, so a crash or network drop loses at most the chunks
+that were in flight.
+"""
+
+import json
+import os
+
+MANIFEST_NAME = "transcription_job.json"
+_VERSION = 1
+
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+
+
+def job_settings(config: dict) -> dict:
+    """Return the settings a manifest is only valid for."""
+    return {
+        "transcription_model": config.get("transcription_model", "voxtral-mini-latest"),
+        "language": config.get("language", "fr"),
+        "diarize": bool(config.get("diarize", False)),
+        "chunk_duration_minutes": config.get("chunk_duration_minutes", 150),
+        "chunk_silence_search_seconds": config.get("chunk_silence_search_seconds", 30),
+        # Normalized like the transcript cache key: reordering the list keeps the manifest valid.
+        "context_bias": sorted(set(config.get("context_bias", []))),
+    }
+
+
+class TranscriptionManifest:
+    """Chunk plan and progress of one session's transcription."""
+
+    def __init__(self, path: str, data: dict):
+        self._path = path
+        self._data = data
+
+    @classmethod
+    def create(cls, source_path: str, settings: dict, chunks: list[dict]) -> "TranscriptionManifest":
+        """Start a new manifest next to *source_path* and write it.
+
+        Each chunk dict holds ``file`` (name in the session folder),
+        ``start_sample``/``end_sample``, ``start_s``/``end_s`` and ``sha256``.
+        """
+        st = os.stat(source_path)
+        data = {
+            "version": _VERSION,
+            "source": os.path.basename(source_path),
+            "source_size": st.st_size,
+            "source_mtime": st.st_mtime,
+            "settings": settings,
+            "complete": False,
+            "chunks": [dict(c, status=STATUS_PENDING, text="") for c in chunks],
+        }
+        manifest = cls(os.path.join(os.path.dirname(source_path), MANIFEST_NAME), data)
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, session_dir: str) -> "TranscriptionManifest | None":
+        """Read the manifest of *session_dir*, or None if missing or unreadable."""
+        path = os.path.join(session_dir, MANIFEST_NAME)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != _VERSION or not data.get("chunks"):
+            return None
+        return cls(path, data)
+
+    def matches(self, source_path: str, settings: dict) -> bool:
+        """True if this manifest was built from *source_path*, unchanged, with *settings*."""
+        try:
+            st = os.stat(source_path)
+        except OSError:
+            return False
+        return (
+            self._data.get("source") == os.path.basename(source_path)
+            and self._data.get("source_size") == st.st_size
+            and self._data.get("source_mtime") == st.st_mtime
+            and self._data.get("settings") == settings
+        )
+
+    @property
+    def session_dir(self) -> str:
+        """Folder of the session the manifest belongs to."""
+        return os.path.dirname(self._path)
+
+    @property
+    def source_path(self) -> str:
+        """Path of the recording the chunks were cut from."""
+        return os.path.join(self.session_dir, self._data["source"])
+
+    @property
+    def chunks(self) -> list[dict]:
+        """Chunk entries in recording order."""
+        return self._data["chunks"]
+
+    @property
+    def done_count(self) -> int:
+        """Number of chunks already transcribed."""
+        return sum(1 for c in self.chunks if c["status"] == STATUS_DONE)
+
+    @property
+    def is_complete(self) -> bool:
+        """True once the whole job has finished."""
+        return self._data.get("complete", False)
+
+    def chunk_path(self, index: int) -> str:
+        """Path of the audio file of chunk *index*."""
+        return os.path.join(self.session_dir, self.chunks[index]["file"])
+
+    def mark_done(self, index: int, text: str):
+        """Record the text of a finished chunk and persist the manifest."""
+        chunk = self.chunks[index]
+        chunk["status"] = STATUS_DONE
+        chunk["text"] = text
+        self.save()
+
+    def mark_complete(self):
+        """Flag the whole job as finished and persist the manifest."""
+        self._data["complete"] = True
+        self.save()
+
+    def save(self):
+        """Write the manifest atomically (temp file + rename)."""
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._path)
@@ -28,7 +28,26 @@ _DEFAULT_CONFIG = {
     "audio_device": None,
     "sample_rate": 16000,
     "channels": 1,
+    "capture_mode": "ring",
+    "capture_ring_seconds": 10,
+    "recording_format": "flac",
     "chunk_duration_minutes": 60,
+    "chunk_silence_search_seconds": 30,
+    "transcription_parallelism": 3,
+    "transcription_cache_mb": 50,
+    "summary_parallelism": 3,
+    "summary_streaming": True,
+    "rolling_summary": True,
+    "summary_hierarchical_reduce": True,
+    "api_requests_per_minute": 60,
+    "api_burst": 5,
+    "assistant_top_k": 6,
+    "assistant_quest_log_tokens": 4000,
+    "assistant_streaming": True,
+    "assistant_conversation": True,
+    "assistant_history_tokens": 4000,
+    "semantic_search": True,
+    "embedding_model": "mistral-embed",
     "transcription_model": "voxtral-mini-latest",
     "summary_model": "mistral-large-latest",
     "language": "en",
@@ -37,6 +56,7 @@ _DEFAULT_CONFIG = {
     "auto_update_check": True,
     "themed_cursors": True,
     "show_session_recap": True,
+    "journal_page_sessions": 20,
     "notification_sounds_enabled": True,
     "active_campaign": "",
     "campaigns": {},
@@ -157,11 +177,21 @@ def quest_log_path(cfg: dict) -> str:
     return os.path.join(active_campaign_dir(cfg), "quest_log.html")
 
 
+def quest_store_path(cfg: dict) -> str:
+    """Return the absolute path to the structured quest records (quest log sidecar)."""
+    return os.path.join(active_campaign_dir(cfg), "quest_log.json")
+
+
 def journal_path(cfg: dict) -> str:
-    """Return the absolute path to the journal file."""
+    """Return the absolute path to the single-file journal of earlier versions."""
     return os.path.join(active_campaign_dir(cfg), "journal.html")
 
 
+def journal_dir(cfg: dict) -> str:
+    """Return the absolute path to the journal directory (index and one fragment per session)."""
+    return os.path.join(active_campaign_dir(cfg), "journal")
+
+
 def sessions_dir(cfg: dict) -> str:
     """Return the absolute path to the sessions directory."""
     return ensure_dir(os.path.join(active_campaign_dir(cfg), "sessions"))
@@ -0,0 +1,260 @@
+"""Per-campaign embedding store for semantic search over the campaign.
+
+The journal and quest log sections (see :mod:`campaign_index`) and every
+session transcript are cut into passages of a few hundred tokens and
+embedded through the Mistral embeddings endpoint.  Vectors are stored
+L2-normalized in a float32 ``vectors.f32`` file opened as a NumPy memmap,
+with a ``vectors.json`` sidecar holding one ID table row per vector
+(passage hash, source, title, text) and the embedding model.
+
+Passage IDs are the SHA-1 of their source and text, so a sync only embeds
+passages that are new or changed; rows of passages that disappeared are
+dropped when the files are rewritten.  Search is one matrix-vector product
+(cosine similarity on normalized rows).
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from .campaign_index import SOURCE_JOURNAL, SOURCE_QUEST_LOG, split_sections
+from .journal_store import JournalStore
+from .mistral_pool import mistral_call
+from .transcript_segmenter import estimate_tokens, segment_transcript
+from .utils import active_campaign_dir, ensure_dir, journal_dir, quest_log_path, sessions_dir
+
+log = logging.getLogger(__name__)
+
+SOURCE_TRANSCRIPT = "transcript"
+
+_STORE_SUBDIR = "embeddings"
+_VECTORS_NAME = "vectors.f32"
+_TABLE_NAME = "vectors.json"
+_VERSION = 1
+
+_PASSAGE_TOKENS = 500  # target passage size
+_BATCH_TOKENS = 8000  # estimated tokens per embeddings request
+_BATCH_SIZE = 64  # passages per embeddings request
+
+
+def _passage(source: str, title: str, text: str) -> dict:
+    digest = hashlib.sha1(f"{source}\n{text}".encode("utf-8")).hexdigest()
+    return {"id": digest, "source": source, "title": title, "text": text}
+
+
+_passage_cache = {}  # path -> ((mtime, size, language), [passage, ...])
+_passage_cache_lock = threading.Lock()
+
+
+def _file_passages(path: str, source: str, language: str) -> list[dict]:
+    """Passages of one document, re-cut only when the file changed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return []
+    stamp = (st.st_mtime, st.st_size, language)
+    with _passage_cache_lock:
+        cached = _passage_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+    except OSError:
+        return []
+    passages = []
+    if source == SOURCE_TRANSCRIPT:
+        title = os.path.basename(os.path.dirname(path))
+        for text in segment_transcript(content, _PASSAGE_TOKENS, language):
+            passages.append(_passage(source, title, text))
+    else:
+        for section in split_sections(content, source):
+            for text in segment_transcript(section.text, _PASSAGE_TOKENS, language):
+                passages.append(_passage(source, section.title, text))
+    with _passage_cache_lock:
+        _passage_cache[path] = (stamp, passages)
+    return passages
+
+
+def campaign_passages(config: dict) -> list[dict]:
+    """Cut the active campaign's journal sessions, quest log and transcripts into passages."""
+    language = config.get("language", "en")
+    documents = [(path, SOURCE_JOURNAL) for path in JournalStore.open(journal_dir(config)).files()]
+    documents.append((quest_log_path(config), SOURCE_QUEST_LOG))
+    for path in sorted(glob.glob(os.path.join(sessions_dir(config), "*", "transcript.txt"))):
+        documents.append((path, SOURCE_TRANSCRIPT))
+    passages = []
+    for path, source in documents:
+        passages.extend(_file_passages(path, source, language))
+    return passages
+
+
+def embed_texts(config: dict, texts: list[str]) -> np.ndarray:
+    """Embed *texts* in batches; returns L2-normalized float32 rows, one per text."""
+    model = config.get("embedding_model", "mistral-embed")
+    language = config.get("language", "en")
+    rows = []
+    batch, batch_tokens = [], 0
+
+    def flush():
+        response = mistral_call(
+            config,
+            "embeddings",
+            lambda client, timeout_ms: client.embeddings.create(model=model, inputs=batch, timeout_ms=timeout_ms),
+        )
+        data = sorted(response.data, key=lambda d: d.index or 0)
+        rows.extend(d.embedding for d in data)
+
+    for text in texts:
+        tokens = estimate_tokens(text, language)
+        if batch and (batch_tokens + tokens > _BATCH_TOKENS or len(batch) >= _BATCH_SIZE):
+            flush()
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        flush()
+
+    vectors = np.asarray(rows, dtype=np.float32).reshape(len(rows), -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class VectorStore:
+    """Embedding vectors of one campaign, memory-mapped from disk."""
+
+    def __init__(self, directory: str):
+        self._dir = directory
+        self._lock = threading.Lock()
+        self._model = ""
+        self._table = []  # one passage dict per row
+        self._vectors = None  # np.memmap (rows x dim) or None when empty
+        self._load()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self._dir, _VECTORS_NAME)
+
+    @property
+    def _table_path(self) -> str:
+        return os.path.join(self._dir, _TABLE_NAME)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def _load(self):
+        try:
+            with open(self._table_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != _VERSION or not data.get("rows"):
+                return
+            dim = int(data["dim"])
+            vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(len(data["rows"]), dim))
+        except (OSError, ValueError, KeyError) as e:
+            log.info("No usable embedding store in %s (%s)", self._dir, e)
+            return
+        self._model = data.get("model", "")
+        self._table = data["rows"]
+        self._vectors = vectors
+
+    def _write(self, table: list[dict], vectors: np.ndarray):
+        """Persist *table* and *vectors* atomically and re-open the memmap. Caller holds the lock."""
+        ensure_dir(self._dir)
+        self._vectors = None  # release the old mapping before replacing the file
+        tmp_vectors = self._vectors_path + ".tmp"
+        vectors.astype(np.float32).tofile(tmp_vectors)
+        tmp_table = self._table_path + ".tmp"
+        with open(tmp_table, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": _VERSION, "model": self._model, "dim": vectors.shape[1], "rows": table},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_vectors, self._vectors_path)
+        os.replace(tmp_table, self._table_path)
+        self._table = table
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=vectors.shape)
+
+    def sync(self, config: dict, passages: list[dict], progress=None) -> int:
+        """Make the store hold exactly *passages*, embedding only new ones.
+
+        *progress*, if given, is called with the number of passages about to
+        be embedded.  Returns that number.
+        """
+        model = config.get("embedding_model", "mistral-embed")
+        with self._lock:
+            if model != self._model:
+                self._model, self._table, self._vectors = model, [], None
+            rows = {row["id"]: i for i, row in enumerate(self._table)}
+
+        wanted = list({p["id"]: p for p in passages}.values())
+        missing = [p for p in wanted if p["id"] not in rows]
+        if not missing and len(wanted) == len(rows):
+            return 0
+        if missing and progress is not None:
+            progress(len(missing))
+        new_vectors = embed_texts(config, [p["text"] for p in missing]) if missing else None
+
+        with self._lock:
+            rows = {row["id"]: i for i, row in enumerate(self._table)}  # may have changed meanwhile
+            fresh = {p["id"]: i for i, p in enumerate(missing)}
+            table, parts = [], []
+            for p in wanted:
+                if p["id"] in fresh:
+                    parts.append(new_vectors[fresh[p["id"]]])
+                elif self._vectors is not None and p["id"] in rows:
+                    parts.append(np.array(self._vectors[rows[p["id"]]]))  # copy, so the old mapping can close
+                else:
+                    continue
+                table.append(p)
+            if not parts:
+                self._table, self._vectors = [], None
+                return len(missing)
+            self._write(table, np.vstack(parts))
+        log.info("Embedding store: %d passages (%d embedded)", len(wanted), len(missing))
+        return len(missing)
+
+    def search(self, query_vector: np.ndarray, k: int, sources: set[str] | None = None) -> list[tuple[dict, float]]:
+        """Return up to *k* ``(passage, cosine similarity)`` pairs, best first."""
+        with self._lock:
+            if self._vectors is None or k <= 0:
+                return []
+            scores = self._vectors @ query_vector.astype(np.float32)
+            if sources is not None:
+                mask = np.fromiter((row["source"] in sources for row in self._table), bool, len(self._table))
+                scores = np.where(mask, scores, -np.inf)
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self._table[i], float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+
+_stores = {}  # campaign dir -> VectorStore
+_stores_lock = threading.Lock()
+
+
+def get_vector_store(config: dict) -> VectorStore:
+    """Return the embedding store of the active campaign."""
+    directory = os.path.join(active_campaign_dir(config), _STORE_SUBDIR)
+    key = os.path.normcase(directory)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = VectorStore(directory)
+            _stores[key] = store
+        return store
+
+
+def semantic_search(
+    config: dict, query: str, k: int, sources: set[str] | None = None, progress=None
+) -> list[tuple[dict, float]]:
+    """Bring the active campaign's store up to date, then return the *k* passages closest to *query*."""
+    store = get_vector_store(config)
+    store.sync(config, campaign_passages(config), progress)
+    return store.search(embed_texts(config, [query])[0], k, sources)
@@ -0,0 +1,118 @@
+"""Benchmark the peak memory of AudioChunker on long synthetic recordings.
+
+Generates 16 kHz mono recordings (noise with a quiet second every minute,
+so silence-aware cuts have something to find) as WAV and FLAC, then runs
+``AudioChunker.chunk_audio_spans`` on each under ``tracemalloc``, in a
+fresh process so every case starts from the same baseline.  "peak MB" is
+the traced Python/NumPy peak; "RSS +MB" also counts libsndfile's buffers
+(Unix only).  The chunks are deleted afterwards; the recordings are kept
+in ``--dir`` for the next run.
+
+Usage:
+    python tools/bench_chunker.py                    # 1 h, 4 h and 8 h, WAV and FLAC
+    python tools/bench_chunker.py --hours 8 --formats wav --dir D:/tmp
+"""
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import soundfile as sf
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.transcriber import AudioChunker  # noqa: E402
+from src.utils import _DEFAULT_CONFIG  # noqa: E402
+
+_SAMPLE_RATE = 16000
+
+
+def _generate(path: str, hours: float):
+    """Write *hours* of synthetic speech-like audio to *path*, one minute at a time."""
+    rng = np.random.default_rng(0)
+    minute = 60 * _SAMPLE_RATE
+    fmt = "FLAC" if path.endswith(".flac") else "WAV"
+    with sf.SoundFile(path, "w", samplerate=_SAMPLE_RATE, channels=1, format=fmt, subtype="PCM_16") as dst:
+        for _ in range(int(hours * 60)):
+            block = rng.integers(-4000, 4000, minute, dtype=np.int16)
+            block[-_SAMPLE_RATE:] //= 100  # a quiet second at the end of each minute
+            dst.write(block)
+
+
+def _max_rss() -> float:
+    """Peak resident set size of this process in MB, NaN where it cannot be read."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else float("nan")
+
+
+def _measure(path: str, max_minutes: int, search_seconds: float):
+    """Chunk *path* under tracemalloc and print one result line."""
+    rss_before = _max_rss()
+    tracemalloc.start()
+    t = time.perf_counter()
+    spans = AudioChunker.chunk_audio_spans(path, max_minutes, search_seconds)
+    elapsed = time.perf_counter() - t
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    rss_growth = _max_rss() - rss_before
+    for chunk_path, _start, _end in spans:
+        if chunk_path != path:
+            os.remove(chunk_path)
+    for sidecar in glob.glob(path + ".*"):  # the FLAC seek index
+        os.remove(sidecar)
+    print(f"{len(spans):>6} {peak / 2**20:>9.2f} {rss_growth:>10.1f} {elapsed:>8.1f}")
+
+
+def main():
+    """Generate the recordings and measure the chunker on each."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--formats", nargs="+", choices=["wav", "flac"], default=["wav", "flac"])
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "dnd_logger_bench"))
+    parser.add_argument("--max-minutes", type=int, default=_DEFAULT_CONFIG["chunk_duration_minutes"])
+    parser.add_argument("--search-seconds", type=float, default=_DEFAULT_CONFIG["chunk_silence_search_seconds"])
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        _measure(args.measure, args.max_minutes, args.search_seconds)
+        return
+
+    print(f"chunks of {args.max_minutes} min, silence search {args.search_seconds:g} s")
+    print(f"{'input':<12} {'full read MB':>12} {'chunks':>6} {'peak MB':>9} {'RSS +MB':>10} {'time s':>8}")
+    for hours in args.hours:
+        for fmt in args.formats:
+            case_dir = os.path.join(args.dir, f"{hours:g}h_{fmt}")
+            os.makedirs(case_dir, exist_ok=True)
+            path = os.path.join(case_dir, f"recording.{fmt}")
+            if not os.path.exists(path):
+                _generate(path, hours)
+            full_read = sf.info(path).frames * 2 / 2**20  # what sf.read(dtype="int16") would hold
+            print(f"{f'{hours:g} h {fmt}':<12} {full_read:>12.1f} ", end="", flush=True)
+            subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--measure",
+                    path,
+                    "--max-minutes",
+                    str(args.max_minutes),
+                    "--search-seconds",
+                    str(args.search_seconds),
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark and fuzz-check diff_utils.line_opcodes against difflib.
+
+Timing: a 50 000-line journal with edits spread in different patterns,
+where difflib is quadratic.  Fuzz: random line lists of 300-2000 lines
+with 20 single-line edits, over vocabularies from 3 symbols (a region
+made only of repeated structural lines) to mostly unique lines.  For every
+input the opcodes must rebuild the new side, and the number of equal lines
+matched is compared with difflib's (higher is better).
+
+Usage:
+    python tools/bench_diff.py
+    python tools/bench_diff.py --lines 20000 --cases 100
+"""
+
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.diff_utils import line_opcodes  # noqa: E402
+
+
+def _equal_lines(opcodes) -> int:
+    return sum(i2 - i1 for tag, i1, i2, _j1, _j2 in opcodes if tag == "equal")
+
+
+def _check(a: list[str], b: list[str], opcodes):
+    """Fail if *opcodes* do not turn *a* into *b*."""
+    out = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        out.extend(a[i1:i2] if tag == "equal" else b[j1:j2])
+    if out != b:
+        raise AssertionError("opcodes do not rebuild the new side")
+
+
+def _timing(n: int):
+    """Time line_opcodes on edit patterns that make difflib quadratic."""
+    a = [f"line {i} of the journal" for i in range(n)]
+
+    def edited(indexes):
+        b = list(a)
+        for i in indexes:
+            b[i] += " (edited)"
+        return b
+
+    rng = random.Random(1)
+    steps = [sum(range(10, 10 + k)) for k in range(n)]
+    every_20th = edited(range(0, n, 20))
+    cases = {
+        "random 5% of lines": edited(rng.sample(range(n), n // 20)),
+        "every 20th line": every_20th,
+        "gaps growing": edited([s for s in steps if s < n]),
+        "gaps shrinking": edited([n - 1 - s for s in steps if s < n]),
+        "every 20th + block": every_20th[: n // 2] + [f"new {i}" for i in range(500)] + every_20th[n // 2 :],
+    }
+    print(f"{n} lines")
+    for name, b in cases.items():
+        t = time.perf_counter()
+        opcodes = line_opcodes(a, b)
+        elapsed = time.perf_counter() - t
+        _check(a, b, opcodes)
+        print(f"  {name:<20} {elapsed:6.2f} s  {_equal_lines(opcodes)} equal lines")
+
+
+def _fuzz(n_cases: int):
+    """Compare the equal lines matched with difflib's on random small-vocabulary inputs."""
+    vocabularies = {
+        "3 symbols": ["<p></p>", "<hr>", "</ul>"],
+        "10 symbols": [f"line {i}" for i in range(10)],
+        "structural + text": ["<hr>"] * 5 + ["<p></p>"] * 5 + [f"text {i}" for i in range(300)],
+    }
+    print(f"fuzz: {n_cases} inputs of 300-2000 lines with 20 single-line edits")
+    for name, vocabulary in vocabularies.items():
+        rng = random.Random(1)
+        ours = reference = 0
+        ours_s = reference_s = 0.0
+        for _ in range(n_cases):
+            a = [rng.choice(vocabulary) for _ in range(rng.randint(300, 2000))]
+            b = list(a)
+            for _ in range(20):
+                k, op = rng.randrange(len(b)), rng.random()
+                if op < 1 / 3:
+                    b[k] = rng.choice(vocabulary)
+                elif op < 2 / 3:
+                    b.insert(k, rng.choice(vocabulary))
+                else:
+                    del b[k]
+            t = time.perf_counter()
+            opcodes = line_opcodes(a, b)
+            ours_s += time.perf_counter() - t
+            _check(a, b, opcodes)
+            ours += _equal_lines(opcodes)
+            t = time.perf_counter()
+            reference += _equal_lines(difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes())
+            reference_s += time.perf_counter() - t
+        print(f"  {name:<18} equal lines {ours:>7} (difflib {reference:>7})  {ours_s:5.2f} s (difflib {reference_s:5.2f} s)")
+
+
+def main():
+    """Run the timing cases and the fuzz check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50_000, help="journal length for the timing cases")
+    parser.add_argument("--cases", type=int, default=40, help="fuzz inputs per vocabulary")
+    args = parser.parse_args()
+    _timing(args.lines)
+    _fuzz(args.cases)
+
+
+if __name__ == "__main__":
+    main()